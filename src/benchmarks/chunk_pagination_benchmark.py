@@ -0,0 +1,97 @@
+# Compare reading every chunk of a project with the old skip/limit paging
+# against the _id keyset streaming of ChunkModel.iter_chunks_by_project_id.
+# Needs the MongoDB from .env, data goes to a separate "<db>_benchmark" db.
+# Run from the src folder:  python -m benchmarks.chunk_pagination_benchmark
+import argparse
+import asyncio
+import time
+from bson.objectid import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClient
+from helpers.config import get_settings
+from models.ChunkModel import ChunkModel
+
+PROJECT_ID = "benchmark"
+
+
+async def seed_chunks(chunk_model: ChunkModel, no_chunks: int):
+    await chunk_model.delete_chunks_by_project_id(project_id=PROJECT_ID)
+    asset_id = ObjectId()
+    for i in range(0, no_chunks, 10000):
+        await chunk_model.collection.insert_many(
+            [
+                {
+                    "chunk_text": f"chunk {n} " + "lorem ipsum " * 20,
+                    "chunk_metadata": {"doc_name": "benchmark.txt", "page": n},
+                    "chunk_order": n + 1,
+                    "chunk_project_id": PROJECT_ID,
+                    "chunk_asset_id": asset_id,
+                }
+                for n in range(i, min(i + 10000, no_chunks))
+            ]
+        )
+
+
+async def read_with_skip(chunk_model: ChunkModel, page_size: int) -> int:
+    total, page_no = 0, 1
+    while True:
+        page_chunks = await chunk_model.get_chunks_by_project_id(
+            project_id=PROJECT_ID, page_no=page_no, page_size=page_size
+        )
+        if not page_chunks:
+            return total
+        total += len(page_chunks)
+        page_no += 1
+
+
+async def read_with_keyset(
+    chunk_model: ChunkModel, page_size: int, projection: list = None
+) -> int:
+    total = 0
+    async for page_chunks in chunk_model.iter_chunks_by_project_id(
+        project_id=PROJECT_ID, page_size=page_size, projection=projection
+    ):
+        total += len(page_chunks)
+    return total
+
+
+async def run(no_chunks: int, page_size: int, skip_old: bool):
+    settings = get_settings()
+    mongodb_connection = AsyncIOMotorClient(settings.MONGODB_URI)
+    database_client = mongodb_connection[f"{settings.MONGODB_DB_NAME}_benchmark"]
+    chunk_model = await ChunkModel.create_instance(db_client=database_client)
+
+    print(f"seeding {no_chunks} chunks ...")
+    await seed_chunks(chunk_model, no_chunks)
+
+    cases = [
+        (
+            "keyset + projection",
+            read_with_keyset(chunk_model, page_size, ["chunk_text", "chunk_metadata"]),
+        ),
+        ("keyset", read_with_keyset(chunk_model, page_size)),
+    ]
+    if not skip_old:
+        cases.append(("skip/limit", read_with_skip(chunk_model, page_size)))
+
+    for name, reader in cases:
+        started = time.perf_counter()
+        total = await reader
+        elapsed = time.perf_counter() - started
+        print(
+            f"{name:>20}: {total} chunks in {elapsed:.2f}s "
+            f"-> {total / elapsed:.0f} chunks/s"
+        )
+
+    await chunk_model.delete_chunks_by_project_id(project_id=PROJECT_ID)
+    mongodb_connection.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chunks", type=int, default=1_000_000)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument(
+        "--skip-old", action="store_true", help="skip the slow skip/limit run"
+    )
+    args = parser.parse_args()
+    asyncio.run(run(args.chunks, args.page_size, args.skip_old))
@@ -0,0 +1,132 @@
+# Show that N parallel answer_rag_question calls (the /index/answer path)
+# finish in about the time of one now that providers use async clients.
+# A local OpenAI-compatible stub server adds a fixed latency to every call.
+# Run from the src folder:  python -m benchmarks.concurrency_benchmark
+import argparse
+import asyncio
+import base64
+import socket
+import struct
+import threading
+import time
+import uvicorn
+from fastapi import FastAPI, Request
+from controllers.NLPController import NLPController
+from models.db_schemas import Project
+from stores.llm.providers import OpenAIProvider
+from stores.llm.templates.template_parser import TemplateParser
+from benchmarks.stubs import StubVectorDBProvider
+
+EMBEDDING_SIZE = 8
+
+
+def create_stub_server(latency: float) -> FastAPI:
+    stub_app = FastAPI()
+
+    @stub_app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        await asyncio.sleep(latency)
+        return {
+            "id": "stub",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body["model"],
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": "stub answer"},
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+        }
+
+    @stub_app.post("/v1/embeddings")
+    async def embeddings(request: Request):
+        body = await request.json()
+        texts = body["input"] if isinstance(body["input"], list) else [body["input"]]
+        vector = [0.1] * EMBEDDING_SIZE
+        if body.get("encoding_format") == "base64":
+            vector = base64.b64encode(
+                struct.pack(f"<{EMBEDDING_SIZE}f", *vector)
+            ).decode()
+        return {
+            "object": "list",
+            "model": body["model"],
+            "data": [
+                {"object": "embedding", "index": i, "embedding": vector}
+                for i in range(len(texts))
+            ],
+            "usage": {"prompt_tokens": 0, "total_tokens": 0},
+        }
+
+    return stub_app
+
+
+def start_stub_server(latency: float) -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    server = uvicorn.Server(
+        uvicorn.Config(
+            create_stub_server(latency), host="127.0.0.1", port=port, log_level="error"
+        )
+    )
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return port
+
+
+async def timed_gather(coroutines: list) -> float:
+    started = time.perf_counter()
+    await asyncio.gather(*coroutines)
+    return time.perf_counter() - started
+
+
+async def run(no_requests: int, latency: float):
+    port = start_stub_server(latency)
+    provider = OpenAIProvider(api_key="stub", api_url=f"http://127.0.0.1:{port}/v1/")
+
+    vectordb_client = StubVectorDBProvider()
+    nlp_controller = NLPController(
+        generation_client=provider,
+        embedding_client=provider,
+        vectordb_client=vectordb_client,
+        template_parser=TemplateParser(language="en"),
+    )
+    project = Project(project_id="benchmark")
+    collection_name = nlp_controller.create_collection_name(project.project_id)
+    vectordb_client.create_collection(collection_name, embedding_size=EMBEDDING_SIZE)
+    vectordb_client.insert_many(
+        collection_name,
+        texts=["alphabet revenue grew in 2023"],
+        vectors=[[0.1] * EMBEDDING_SIZE],
+    )
+
+    def answer():
+        return nlp_controller.answer_rag_question(project=project, query="revenue?")
+
+    async def blocking_generate():
+        # What answer_rag did before: a sync SDK call inside a coroutine
+        return provider.generate_text(prompt="revenue?", chat_history=[])
+
+    await answer()  # warm up the connection pool
+    single = await timed_gather([answer()])
+    parallel = await timed_gather([answer() for _ in range(no_requests)])
+    blocking = await timed_gather([blocking_generate() for _ in range(no_requests)])
+
+    print(f"stub latency per call: {latency:.2f}s")
+    print(f"1 answer:                           {single:.2f}s")
+    print(f"{no_requests} parallel answers (async):     {parallel:.2f}s")
+    print(f"{no_requests} parallel generations (sync):  {blocking:.2f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.5)
+    args = parser.parse_args()
+    asyncio.run(run(no_requests=args.requests, latency=args.latency))
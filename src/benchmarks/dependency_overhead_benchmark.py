@@ -0,0 +1,92 @@
+# Per-request setup cost of the /nlp/index/answer route before and after the
+# AppContainer: previously every request parsed .env once per controller and
+# model (get_settings was not cached), built a new NLPController and called
+# list_collection_names() in each *Model.create_instance.
+# Needs the MongoDB from .env, a separate "<db>_benchmark" db is used.
+# Run from the src folder:  python -m benchmarks.dependency_overhead_benchmark
+import argparse
+import asyncio
+import contextlib
+import io
+import time
+from types import SimpleNamespace
+from motor.motor_asyncio import AsyncIOMotorClient
+from helpers.config import get_settings
+from helpers.container import AppContainer
+import controllers.BaseController as base_controller_module
+import models.BaseDataModel as base_data_model_module
+from controllers.NLPController import NLPController
+from models.ProjectModel import ProjectModel
+from stores.llm.templates.template_parser import TemplateParser
+from benchmarks.stubs import StubLLMProvider, StubVectorDBProvider
+
+
+async def setup_per_request(app):
+    # The previous route body, with the uncached get_settings
+    project_model = await ProjectModel.create_instance(db_client=app.database_client)
+    nlp_controller = NLPController(
+        vectordb_client=app.vectordb_client,
+        generation_client=app.generation_client,
+        embedding_client=app.embedding_client,
+        template_parser=app.template_parser,
+    )
+    return project_model, nlp_controller
+
+
+async def setup_from_container(app):
+    return app.container.project_model, app.container.nlp_controller
+
+
+async def run(no_requests: int):
+    settings = get_settings()
+    mongodb_connection = AsyncIOMotorClient(settings.MONGODB_URI)
+    provider = StubLLMProvider(call_latency=0.0)
+    app = SimpleNamespace(
+        database_client=mongodb_connection[f"{settings.MONGODB_DB_NAME}_benchmark"],
+        vectordb_client=StubVectorDBProvider(),
+        generation_client=provider,
+        embedding_client=provider,
+        template_parser=TemplateParser(language="en"),
+        embedding_cache=None,
+        lexical_index_store=None,
+        reranker=None,
+        job_tasks={},
+        process_pool=None,
+    )
+    app.container = await AppContainer.create_instance(app=app, settings=settings)
+
+    results = {}
+    for name, setup in [
+        ("per_request", setup_per_request),
+        ("container", setup_from_container),
+    ]:
+        # The uncached get_settings, which also printed two DEBUG lines
+        settings_getter = get_settings
+        if name == "per_request":
+            settings_getter = get_settings.__wrapped__
+        base_controller_module.get_settings = settings_getter
+        base_data_model_module.get_settings = settings_getter
+
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(no_requests):
+                await setup(app)
+        elapsed = time.perf_counter() - started
+        results[name] = elapsed
+        print(f"{name:>12}: {elapsed / no_requests * 1e6:.1f} us per request")
+
+    base_controller_module.get_settings = get_settings
+    base_data_model_module.get_settings = get_settings
+    print(
+        f"removed overhead: "
+        f"{(results['per_request'] - results['container']) / no_requests * 1e3:.2f}"
+        f" ms per request"
+    )
+    mongodb_connection.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(run(args.requests))
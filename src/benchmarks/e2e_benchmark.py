@@ -0,0 +1,379 @@
+# End-to-end offline benchmark of the ingestion and query paths through the
+# FastAPI app (in-process ASGI, no server): a synthetic corpus of .txt and
+# .pdf files goes through upload -> /data/process -> /nlp/index/push, then
+# /nlp/index/search and /nlp/index/answer run --concurrency at a time.
+# Providers are the offline LOCAL_HASH / ECHO backends (with --embed-latency-ms
+# and --generate-latency-ms to simulate a model server), Mongo is an in-memory
+# mongomock-motor stand-in unless --mongodb-uri is given, and the vector db,
+# caches and uploaded files go to benchmark-only paths removed at the end.
+# Reports throughput, per-stage latency percentiles (HTTP and the embed /
+# search / rerank / generate stages) and peak RSS, --output saves them as JSON
+# to compare runs over time.
+# Needs the stand-in (benchmark only):  pip install mongomock-motor
+# Run from the src folder:
+#   python -m benchmarks.e2e_benchmark --txt-files 20 --pdf-files 5 \
+#       --doc-words 2000 --queries 200 --concurrency 8 --output e2e.json
+import argparse
+import asyncio
+import json
+import os
+import random
+import resource
+import shutil
+import tempfile
+import time
+import fitz
+import httpx
+import numpy as np
+import main
+from helpers.config import get_settings
+from helpers.timing import start_stage_timings
+from controllers.BaseController import BaseController
+from controllers.ProjectController import ProjectController
+from models.enums.StageEnum import StageEnum
+from stores.llm.LLMEnums import LLMEnums
+from stores.vectordb.VectorDBEnums import DistanceMethodEnums, VectorDBEnums
+
+SYLLABLES = ["ka", "lo", "mi", "ne", "ru", "ta", "shi", "vo", "pe", "zu", "ar", "en"]
+WORDS_PER_PDF_PAGE = 350
+
+
+def make_word(rng: random.Random) -> str:
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+
+
+# Every document mixes a shared vocabulary with its own signature words, so
+# a query made of signature words has one right document
+def make_corpus(args):
+    rng = random.Random(args.seed)
+    vocabulary = [make_word(rng) for _ in range(2000)]
+    documents = []
+    for i in range(args.txt_files + args.pdf_files):
+        signature = [f"{make_word(rng)}{i}" for _ in range(30)]
+        words = [
+            rng.choice(signature) if rng.random() < 0.1 else rng.choice(vocabulary)
+            for _ in range(args.doc_words)
+        ]
+        extension = "txt" if i < args.txt_files else "pdf"
+        documents.append(
+            {"name": f"doc{i}.{extension}", "words": words, "signature": signature}
+        )
+    return documents
+
+
+def write_corpus(documents: list, corpus_dir: str) -> int:
+    total_bytes = 0
+    for document in documents:
+        path = os.path.join(corpus_dir, document["name"])
+        if path.endswith(".txt"):
+            with open(path, "w") as f:
+                f.write(" ".join(document["words"]))
+        else:
+            pdf = fitz.open()
+            words = document["words"]
+            for i in range(0, len(words), WORDS_PER_PDF_PAGE):
+                page = pdf.new_page()
+                page.insert_textbox(
+                    page.rect + (36, 36, -36, -36),
+                    " ".join(words[i : i + WORDS_PER_PDF_PAGE]),
+                    fontsize=8,
+                )
+            pdf.save(path)
+            pdf.close()
+        total_bytes += os.path.getsize(path)
+    return total_bytes
+
+
+def get_percentiles(values: list) -> dict:
+    if not values:
+        return {}
+    return {
+        f"p{p}": float(np.percentile(values, p)) * 1000 for p in [50, 95, 99]
+    }
+
+
+def get_peak_rss_mb() -> dict:
+    # ru_maxrss is in KB on Linux; children are the reaped process pool workers
+    return {
+        "main": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "children": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024,
+    }
+
+
+# Benchmark-only backends and paths, set before the app starts
+def configure_settings(args, run_id: str):
+    settings = get_settings()
+    settings.EMBEDDING_BACKEND = LLMEnums.LOCAL_HASH.value
+    settings.GENERATION_BACKEND = LLMEnums.ECHO.value
+    settings.LOCAL_HASH_LATENCY_MS = args.embed_latency_ms
+    settings.LOCAL_HASH_JITTER_MS = args.embed_latency_ms / 4
+    settings.ECHO_LATENCY_MS = args.generate_latency_ms
+    settings.ECHO_JITTER_MS = args.generate_latency_ms / 4
+    settings.VECTORDB_BACKEND = args.vectordb_backend
+    settings.VECTOR_DB_DISTANCE_METHOD = (
+        settings.VECTOR_DB_DISTANCE_METHOD or DistanceMethodEnums.COSINE.value
+    )
+    settings.VECTOR_DB_PATH = f"benchmark_{run_id}_vectordb"
+    settings.EMBEDDING_CACHE_DB_NAME = f"benchmark_{run_id}_embedding_cache"
+    settings.LEXICAL_INDEX_DB_NAME = f"benchmark_{run_id}_lexical"
+    settings.MONGODB_DB_NAME = f"benchmark_{run_id}"
+    if args.mongodb_uri:
+        settings.MONGODB_URI = args.mongodb_uri
+    else:
+        from mongomock_motor import AsyncMongoMockClient
+
+        main.AsyncIOMotorClient = AsyncMongoMockClient
+    return settings
+
+
+def cleanup(settings, project_id: str):
+    base_controller = BaseController()
+    for db_name in [
+        settings.VECTOR_DB_PATH,
+        settings.EMBEDDING_CACHE_DB_NAME,
+        settings.LEXICAL_INDEX_DB_NAME,
+    ]:
+        shutil.rmtree(base_controller.get_database_path(db_name), ignore_errors=True)
+    shutil.rmtree(
+        ProjectController().get_project_path(project_id=project_id),
+        ignore_errors=True,
+    )
+
+
+async def timed_post(client, url: str, latencies: list, **kwargs):
+    started_at = time.perf_counter()
+    response = await client.post(url, **kwargs)
+    latencies.append(time.perf_counter() - started_at)
+    if response.status_code != 200:
+        raise RuntimeError(f"{url} -> {response.status_code}: {response.text[:200]}")
+    return response.json()
+
+
+async def run_ingestion(client, args, project_id: str, corpus_dir: str, documents):
+    latencies = {"upload": [], "process": [], "push": []}
+
+    started_at = time.perf_counter()
+    for i in range(0, len(documents), args.upload_batch):
+        files = [
+            (
+                "files",
+                (
+                    document["name"],
+                    open(os.path.join(corpus_dir, document["name"]), "rb"),
+                ),
+            )
+            for document in documents[i : i + args.upload_batch]
+        ]
+        try:
+            await timed_post(
+                client,
+                f"/api/v1/data/upload/{project_id}",
+                latencies["upload"],
+                files=files,
+            )
+        finally:
+            for _, (_, f) in files:
+                f.close()
+    upload_seconds = time.perf_counter() - started_at
+
+    started_at = time.perf_counter()
+    processed = await timed_post(
+        client,
+        f"/api/v1/data/process/{project_id}",
+        latencies["process"],
+        json={
+            "chunk_size": args.chunk_size,
+            "overlap_size": args.overlap_size,
+            "do_reset": 1,
+        },
+    )
+    process_seconds = time.perf_counter() - started_at
+
+    started_at = time.perf_counter()
+    pushed = await timed_post(
+        client,
+        f"/api/v1/nlp/index/push/{project_id}",
+        latencies["push"],
+        json={"do_reset": 1},
+    )
+    push_seconds = time.perf_counter() - started_at
+
+    files_timings = processed["files_timings"]
+    chunks = processed["inserted_chunks"]
+    return {
+        "files": len(documents),
+        "chunks": chunks,
+        "upload_files_per_second": len(documents) / upload_seconds,
+        "process_files_per_second": processed["processed_files"] / process_seconds,
+        "process_chunks_per_second": chunks / process_seconds,
+        "push_chunks_per_second": pushed["inserted_items_count"] / push_seconds,
+        "total_seconds": upload_seconds + process_seconds + push_seconds,
+        "latency_ms": {
+            "upload_request": get_percentiles(latencies["upload"]),
+            "file_parse": get_percentiles([t["parse_seconds"] for t in files_timings]),
+            "file_chunk": get_percentiles([t["chunk_seconds"] for t in files_timings]),
+            "file_wall": get_percentiles([t["wall_seconds"] for t in files_timings]),
+        },
+        "process_seconds": process_seconds,
+        "push_seconds": push_seconds,
+    }
+
+
+async def run_queries(client, args, project_id: str, endpoint: str, queries: list):
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies = []
+    stage_latencies = {stage.value: [] for stage in StageEnum}
+    hits = 0
+
+    async def run_query(query: dict):
+        nonlocal hits
+        async with semaphore:
+            # The app runs in this task (ASGI transport), so its stage timings
+            # land in this dict
+            timings = start_stage_timings()
+            result = await timed_post(
+                client,
+                f"/api/v1/nlp/index/{endpoint}/{project_id}",
+                latencies,
+                json={"text": query["text"], "limit": args.top_k},
+            )
+        for stage, seconds in timings.items():
+            stage_latencies[stage].append(seconds)
+        # Signature words belong to one document: a hit is a chunk holding one
+        if endpoint == "search":
+            hits += any(
+                word in document["text"].split()
+                for document in result["results"] or []
+                for word in query["words"]
+            )
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*[run_query(query) for query in queries])
+    elapsed = time.perf_counter() - started_at
+
+    result = {
+        "requests": len(queries),
+        "requests_per_second": len(queries) / elapsed,
+        "latency_ms": {
+            "request": get_percentiles(latencies),
+            **{
+                stage: get_percentiles(values)
+                for stage, values in stage_latencies.items()
+                if values
+            },
+        },
+    }
+    if endpoint == "search":
+        result["hit_rate"] = hits / len(queries)
+    return result
+
+
+def make_queries(args, documents: list) -> list:
+    rng = random.Random(args.seed + 1)
+    queries = []
+    for _ in range(args.queries):
+        document = rng.choice(documents)
+        words = rng.sample(document["signature"], 4)
+        queries.append(
+            {"text": " ".join(words), "words": words}
+        )
+    return queries
+
+
+def print_stages(name: str, result: dict):
+    for stage, percentiles in result["latency_ms"].items():
+        print(
+            f"{name:>10} {stage:<15} "
+            + " / ".join(f"{k} {v:.1f}" for k, v in percentiles.items())
+            + " ms"
+        )
+
+
+async def run(args):
+    run_id = time.strftime("%Y%m%d%H%M%S")
+    project_id = f"benchmark{run_id}"
+    settings = configure_settings(args, run_id)
+
+    corpus_dir = tempfile.mkdtemp()
+    documents = make_corpus(args)
+    corpus_bytes = write_corpus(documents, corpus_dir)
+    print(
+        f"corpus: {args.txt_files} txt + {args.pdf_files} pdf files, "
+        f"{args.doc_words} words each, {corpus_bytes / 1024**2:.2f} MB"
+    )
+
+    results = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "config": vars(args),
+        "corpus_mb": corpus_bytes / 1024**2,
+    }
+    try:
+        async with main.lifespan(main.app):
+            transport = httpx.ASGITransport(app=main.app)
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://benchmark", timeout=None
+            ) as client:
+                ingestion = await run_ingestion(
+                    client, args, project_id, corpus_dir, documents
+                )
+                results["ingestion"] = ingestion
+                print(
+                    f"ingestion: {ingestion['files']} files -> "
+                    f"{ingestion['chunks']} chunks in "
+                    f"{ingestion['total_seconds']:.2f}s | process "
+                    f"{ingestion['process_chunks_per_second']:,.0f} chunks/s | push "
+                    f"{ingestion['push_chunks_per_second']:,.0f} chunks/s"
+                )
+                print_stages("ingestion", ingestion)
+
+                queries = make_queries(args, documents)
+                for endpoint in ["search", "answer"]:
+                    result = await run_queries(
+                        client, args, project_id, endpoint, queries
+                    )
+                    results[endpoint] = result
+                    summary = (
+                        f"{endpoint}: {result['requests_per_second']:,.1f} req/s "
+                        f"at concurrency {args.concurrency}"
+                    )
+                    if "hit_rate" in result:
+                        summary += f" | hit rate {result['hit_rate']:.2f}"
+                    print(summary)
+                    print_stages(endpoint, result)
+    finally:
+        cleanup(settings, project_id)
+        shutil.rmtree(corpus_dir, ignore_errors=True)
+
+    results["peak_rss_mb"] = get_peak_rss_mb()
+    print(
+        f"peak RSS: {results['peak_rss_mb']['main']:,.0f} MB main, "
+        f"{results['peak_rss_mb']['children']:,.0f} MB largest pool worker"
+    )
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"results written to {args.output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--txt-files", type=int, default=20)
+    parser.add_argument("--pdf-files", type=int, default=5)
+    parser.add_argument("--doc-words", type=int, default=2000)
+    parser.add_argument("--upload-batch", type=int, default=10)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--overlap-size", type=int, default=100)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--embed-latency-ms", type=float, default=0.0)
+    parser.add_argument("--generate-latency-ms", type=float, default=0.0)
+    parser.add_argument(
+        "--vectordb-backend",
+        default=VectorDBEnums.QDRANT.value,
+        choices=[VectorDBEnums.QDRANT.value, VectorDBEnums.NUMPY.value],
+    )
+    parser.add_argument("--mongodb-uri", default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None)
+    asyncio.run(run(parser.parse_args()))
@@ -0,0 +1,109 @@
+# Compare indexing throughput of the old per-chunk embedding loop against
+# NLPController.index_into_vector_db with batched embedding.
+# Run from the src folder:  python -m benchmarks.embedding_batch_benchmark
+import argparse
+import asyncio
+import time
+from types import SimpleNamespace
+from bson.objectid import ObjectId
+from controllers.NLPController import NLPController
+from models.db_schemas import Project
+from stores.llm.LLMEnums import DocumentTypeEnum
+from benchmarks.stubs import StubLLMProvider, StubVectorDBProvider
+
+
+def make_chunks(no_chunks: int):
+    return [
+        SimpleNamespace(
+            id=ObjectId(),
+            chunk_text=f"chunk number {i} talks about revenue, costs and risks",
+            chunk_metadata={"doc_name": "benchmark.txt"},
+        )
+        for i in range(no_chunks)
+    ]
+
+
+def index_per_chunk(nlp_controller: NLPController, project: Project, chunks: list):
+    # The previous implementation: one embedding call and a 100ms sleep per chunk
+    collection_name = nlp_controller.create_collection_name(project.project_id)
+    texts = [nlp_controller.sanitize_chunk(c.chunk_text) for c in chunks]
+    vectors = []
+    for text in texts:
+        vectors.append(
+            nlp_controller.embedding_client.embed_text(
+                text=text, document_type=DocumentTypeEnum.DOCUMENT.value
+            )
+        )
+        time.sleep(0.1)
+    nlp_controller.vectordb_client.create_collection(
+        collection_name=collection_name,
+        do_reset=True,
+        embedding_size=nlp_controller.embedding_client.embedding_size,
+    )
+    nlp_controller.vectordb_client.insert_many(
+        collection_name=collection_name,
+        texts=texts,
+        vectors=vectors,
+        metadata=[c.chunk_metadata for c in chunks],
+        record_ids=list(range(len(chunks))),
+    )
+
+
+def run(no_chunks: int, call_latency: float):
+    provider = StubLLMProvider(call_latency=call_latency)
+    nlp_controller = NLPController(
+        generation_client=provider,
+        embedding_client=provider,
+        vectordb_client=StubVectorDBProvider(),
+        template_parser=None,
+    )
+    project = Project(project_id="benchmark")
+    chunks = make_chunks(no_chunks)
+
+    results = {}
+    for name, index_fn in [
+        ("per_chunk", lambda: index_per_chunk(nlp_controller, project, chunks)),
+        (
+            "batched",
+            lambda: asyncio.run(
+                nlp_controller.index_into_vector_db(
+                    project=project, chunks=chunks, do_reset=True
+                )
+            ),
+        ),
+    ]:
+        provider.calls = 0
+        started = time.perf_counter()
+        index_fn()
+        elapsed = time.perf_counter() - started
+        results[name] = elapsed
+        print(
+            f"{name:>10}: {no_chunks} chunks in {elapsed:.2f}s "
+            f"-> {no_chunks / elapsed:.1f} chunks/s ({provider.calls} provider calls)"
+        )
+
+    print(f"speedup: x{results['per_chunk'] / results['batched']:.1f}")
+
+    # Incremental push: re-pushing the same chunks plus a few new ones only
+    # embeds the new ones, unchanged chunks are skipped by content hash
+    new_chunks = make_chunks(max(1, no_chunks // 10))
+    for chunk in new_chunks:
+        chunk.chunk_text = f"new {chunk.chunk_text}"
+    provider.calls = 0
+    started = time.perf_counter()
+    inserted_count = asyncio.run(
+        nlp_controller.index_into_vector_db(project=project, chunks=chunks + new_chunks)
+    )
+    elapsed = time.perf_counter() - started
+    print(
+        f"re-push: {len(chunks) + len(new_chunks)} chunks, {inserted_count} embedded "
+        f"in {elapsed:.2f}s ({provider.calls} provider calls)"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chunks", type=int, default=200)
+    parser.add_argument("--call-latency", type=float, default=0.02)
+    args = parser.parse_args()
+    run(no_chunks=args.chunks, call_latency=args.call_latency)
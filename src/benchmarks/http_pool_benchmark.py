@@ -0,0 +1,176 @@
+# Streamed answers that the consumer stops early (guardrail block, client
+# disconnect) must give their HTTPClientPool host slot back. With the host
+# capped at one request in flight, every aborted stream is followed by a new
+# one: a leaked slot makes the next stream wait until --timeout, and the run
+# exits with status 1. Covers the OpenAI and CoHere providers, async and sync
+# clients, against a local stub server that streams tokens slowly.
+# Run from the src folder:  python -m benchmarks.http_pool_benchmark
+import argparse
+import asyncio
+import json
+import os
+import socket
+import sys
+import threading
+import time
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from stores.llm.HTTPClientPool import HTTPClientPool
+from stores.llm.providers import CoHereProvider, OpenAIProvider
+
+
+def create_stub_server(no_tokens: int, token_latency: float) -> FastAPI:
+    stub_app = FastAPI()
+
+    # OpenAI: server-sent events, then [DONE]
+    @stub_app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+
+        async def events():
+            for i in range(no_tokens):
+                chunk = {
+                    "id": "stub",
+                    "object": "chat.completion.chunk",
+                    "created": int(time.time()),
+                    "model": body["model"],
+                    "choices": [
+                        {
+                            "index": 0,
+                            "delta": {"content": f"t{i} "},
+                            "finish_reason": None,
+                        }
+                    ],
+                }
+                yield f"data: {json.dumps(chunk)}\n\n"
+                await asyncio.sleep(token_latency)
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    # CoHere: one JSON event per line
+    @stub_app.post("/v1/chat")
+    async def chat(request: Request):
+        async def events():
+            yield json.dumps({"event_type": "stream-start", "generation_id": "stub"})
+            yield "\n"
+            for i in range(no_tokens):
+                yield json.dumps({"event_type": "text-generation", "text": f"t{i} "})
+                yield "\n"
+                await asyncio.sleep(token_latency)
+
+        return StreamingResponse(events(), media_type="application/stream+json")
+
+    return stub_app
+
+
+def start_stub_server(no_tokens: int, token_latency: float) -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    server = uvicorn.Server(
+        uvicorn.Config(
+            create_stub_server(no_tokens, token_latency),
+            host="127.0.0.1",
+            port=port,
+            log_level="error",
+        )
+    )
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return port
+
+
+# What answer_rag_question_stream does on a guardrail block: one token, then
+# close the token iterator
+async def abort_async_stream(provider):
+    tokens = await provider.agenerate_text(
+        prompt="question", chat_history=[], stream=True
+    )
+    try:
+        async for _ in tokens:
+            break
+    finally:
+        await tokens.aclose()
+
+
+def abort_sync_stream(provider):
+    tokens = provider.generate_text(prompt="question", chat_history=[], stream=True)
+    try:
+        for _ in tokens:
+            break
+    finally:
+        tokens.close()
+
+
+async def run(args):
+    port = start_stub_server(args.tokens, args.token_latency)
+    os.environ["CO_API_URL"] = f"http://127.0.0.1:{port}"
+    http_client_pool = HTTPClientPool(max_concurrency_per_host=1)
+    providers = {
+        "openai": OpenAIProvider(
+            api_key="stub",
+            api_url=f"http://127.0.0.1:{port}/v1/",
+            http_client_pool=http_client_pool,
+        ),
+        "cohere": CoHereProvider(api_key="stub", http_client_pool=http_client_pool),
+    }
+    for provider in providers.values():
+        provider.get_generation_model("stub")
+
+    full_stream_seconds = args.tokens * args.token_latency
+    print(
+        f"host capped at 1 request in flight, a full stream takes "
+        f"~{full_stream_seconds:.2f}s"
+    )
+
+    is_leaking = False
+    for name, provider in providers.items():
+        for mode in ["async", "sync"]:
+            started = time.perf_counter()
+            try:
+                for _ in range(args.streams):
+                    if mode == "async":
+                        await asyncio.wait_for(
+                            abort_async_stream(provider), timeout=args.timeout
+                        )
+                    else:
+                        await asyncio.wait_for(
+                            asyncio.to_thread(abort_sync_stream, provider),
+                            timeout=args.timeout,
+                        )
+                status = "ok"
+            except asyncio.TimeoutError:
+                status = "LEAKED (next stream waited for a slot)"
+            elapsed = time.perf_counter() - started
+
+            in_flight = sum(
+                host_stats["in_flight"]
+                for host_stats in http_client_pool.get_stats()["hosts"].values()
+            )
+            if status != "ok" or in_flight:
+                is_leaking = True
+            print(
+                f"{name:>6} {mode:>5}: {args.streams} aborted streams in "
+                f"{elapsed:.2f}s | in flight after: {in_flight} | {status}"
+            )
+
+    if is_leaking:
+        # Sync streams still wait for a slot in worker threads that would
+        # keep the interpreter alive
+        sys.stdout.flush()
+        os._exit(1)
+    await http_client_pool.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--streams", type=int, default=20)
+    parser.add_argument("--tokens", type=int, default=200)
+    parser.add_argument("--token-latency", type=float, default=0.01)
+    parser.add_argument("--timeout", type=float, default=5.0)
+    args = parser.parse_args()
+    asyncio.run(run(args))
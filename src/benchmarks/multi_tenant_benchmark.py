@@ -0,0 +1,139 @@
+# Per-project collections against one shared multi-tenant collection
+# (VECTOR_DB_MULTI_TENANT) with many small projects: build time, files on
+# disk, reopen (startup) time, RSS and open file handles after the reopen,
+# filtered search p50/p99, and a check that no result leaks across projects.
+# Each layout runs in its own process so RSS and file handles don't mix.
+# Run from the src folder:
+#   python -m benchmarks.multi_tenant_benchmark --projects 5000
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from stores.vectordb.providers import QdrantDBProvider, NumpyDBProvider
+from stores.vectordb.VectorDBEnums import DistanceMethodEnums, VectorDBEnums
+from benchmarks.qdrant_quantization_benchmark import make_vectors
+
+SHARED_COLLECTION = "shared_benchmark"
+
+
+def get_rss_mb() -> float:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def count_files(path: str) -> int:
+    return sum(len(files) for _, _, files in os.walk(path))
+
+
+def make_provider(backend: str, db_path: str):
+    if backend == VectorDBEnums.NUMPY.value:
+        return NumpyDBProvider(
+            db_path=db_path, distance_method=DistanceMethodEnums.COSINE.value
+        )
+    return QdrantDBProvider(
+        db_path=db_path, distance_method=DistanceMethodEnums.COSINE.value
+    )
+
+
+# Same (collection_name, tenant_id) split as NLPController.get_vector_db_target
+def get_target(layout: str, project_id: int) -> dict:
+    if layout == "shared":
+        return {"collection_name": SHARED_COLLECTION, "tenant_id": str(project_id)}
+    return {"collection_name": f"collection_{project_id}", "tenant_id": None}
+
+
+def run_layout(layout: str, args) -> dict:
+    db_path = tempfile.mkdtemp()
+    provider = make_provider(args.backend, db_path)
+    provider.connect()
+    vectors = make_vectors(args.projects * args.chunks, args.dim)
+
+    # 1. Build: one push of args.chunks records per project
+    started = time.perf_counter()
+    if layout == "shared":
+        provider.create_collection(
+            SHARED_COLLECTION, embedding_size=args.dim, is_multi_tenant=True
+        )
+    for project_id in range(args.projects):
+        target = get_target(layout, project_id)
+        if layout != "shared":
+            provider.create_collection(target["collection_name"], args.dim)
+        first = project_id * args.chunks
+        provider.insert_many(
+            **target,
+            texts=[str(project_id)] * args.chunks,
+            vectors=vectors[first : first + args.chunks].tolist(),
+            record_ids=list(range(first, first + args.chunks)),
+        )
+    build_seconds = time.perf_counter() - started
+
+    # 2. Startup: local mode opens every collection on connect
+    provider.disconnect()
+    started = time.perf_counter()
+    provider.connect()
+    reopen_seconds = time.perf_counter() - started
+    rss_mb = get_rss_mb()
+    open_files = len(os.listdir("/proc/self/fd"))
+
+    # 3. Search random projects, every hit must belong to the project
+    rng = np.random.default_rng(1)
+    project_ids = rng.integers(0, args.projects, args.queries)
+    queries = make_vectors(args.queries, args.dim, seed=2)
+    latencies, leaks = [], 0
+    for project_id, query in zip(project_ids, queries):
+        started = time.perf_counter()
+        results = provider.search_by_vector(
+            **get_target(layout, project_id), vector=query.tolist(), limit=5
+        )
+        latencies.append(time.perf_counter() - started)
+        leaks += sum(result.text != str(project_id) for result in results)
+
+    provider.disconnect()
+    return {
+        "build_seconds": build_seconds,
+        "files": count_files(db_path),
+        "reopen_seconds": reopen_seconds,
+        "rss_mb": rss_mb,
+        "open_files": open_files,
+        "p50_ms": np.percentile(latencies, 50) * 1000,
+        "p99_ms": np.percentile(latencies, 99) * 1000,
+        "leaks": leaks,
+    }
+
+
+def run(args):
+    print(
+        f"{args.projects} projects x {args.chunks} chunks, {args.dim}-d, "
+        f"{args.backend} backend"
+    )
+    for layout in ["per_project", "shared"]:
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            result = executor.submit(run_layout, layout, args).result()
+        print(
+            f"{layout:>11}: build {result['build_seconds']:.1f}s | "
+            f"{result['files']:,} files | "
+            f"reopen {result['reopen_seconds']:.2f}s | "
+            f"RSS {result['rss_mb']:,.0f} MB | "
+            f"{result['open_files']} open fds | "
+            f"p50 {result['p50_ms']:.2f} ms | p99 {result['p99_ms']:.2f} ms | "
+            f"leaked results {result['leaks']}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--projects", type=int, default=5000)
+    parser.add_argument("--chunks", type=int, default=20)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument(
+        "--backend",
+        default=VectorDBEnums.QDRANT.value,
+        choices=[VectorDBEnums.QDRANT.value, VectorDBEnums.NUMPY.value],
+    )
+    run(parser.parse_args())
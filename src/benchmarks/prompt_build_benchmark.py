@@ -0,0 +1,100 @@
+# Per-request prompt-build time of NLPController.build_rag_prompt with the
+# previous TemplateParser (os.path.exists + __import__ on every template
+# call, one call per document) against the precompiled template registry.
+# Run from the src folder:  python -m benchmarks.prompt_build_benchmark
+import argparse
+import asyncio
+import os
+import time
+from types import SimpleNamespace
+from bson.objectid import ObjectId
+from controllers.NLPController import NLPController
+from models.db_schemas import Project
+from stores.llm.templates.template_parser import TemplateParser
+from benchmarks.stubs import StubLLMProvider, StubVectorDBProvider
+
+
+# The previous lookup, done on every call
+class LegacyTemplateParser(TemplateParser):
+
+    def get_local_template(self, group: str, key: str, vars: dict = {}):
+        group_path = os.path.join(
+            self.current_path, "locales", self.language, f"{group}.py"
+        )
+        targeted_language = self.language
+        if not os.path.exists(group_path):
+            targeted_language = self.default_language
+
+        module = __import__(
+            f"stores.llm.templates.locales.{targeted_language}.{group}",
+            fromlist=[group],
+        )
+        key_attribute = getattr(module, key, None)
+        if hasattr(key_attribute, "substitute"):
+            return key_attribute.substitute(vars)
+        return key_attribute
+
+    def get_local_templates(
+        self, group: str, key: str, vars_list: list, separator: str = "\n"
+    ):
+        return separator.join(
+            self.get_local_template(group, key, vars) for vars in vars_list
+        )
+
+
+def run(no_requests: int, no_documents: int):
+    provider = StubLLMProvider(call_latency=0.0, per_text_latency=0.0)
+    vectordb_client = StubVectorDBProvider()
+    project = Project(project_id="benchmark")
+
+    nlp_controller = NLPController(
+        generation_client=provider,
+        embedding_client=provider,
+        vectordb_client=vectordb_client,
+        template_parser=TemplateParser(language="en"),
+    )
+    nlp_controller.reranker = None
+    chunks = [
+        SimpleNamespace(
+            id=ObjectId(),
+            chunk_text=f"chunk number {i} talks about revenue, costs and risks",
+            chunk_metadata={"doc_name": "benchmark.txt"},
+        )
+        for i in range(no_documents * 4)
+    ]
+    asyncio.run(
+        nlp_controller.index_into_vector_db(
+            project=project, chunks=chunks, do_reset=True
+        )
+    )
+
+    async def build_prompts():
+        for i in range(no_requests):
+            await nlp_controller.build_rag_prompt(
+                project=project, query=f"what about revenue {i}", limit=no_documents
+            )
+
+    results = {}
+    for name, template_parser in [
+        ("legacy", LegacyTemplateParser(language="en")),
+        ("cached", TemplateParser(language="en")),
+    ]:
+        nlp_controller.template_parser = template_parser
+        started = time.perf_counter()
+        asyncio.run(build_prompts())
+        elapsed = time.perf_counter() - started
+        results[name] = elapsed
+        print(
+            f"{name:>7}: {elapsed / no_requests * 1e6:.1f} us per prompt "
+            f"({no_documents} documents, {no_requests} requests)"
+        )
+
+    print(f"speedup: x{results['legacy'] / results['cached']:.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--documents", type=int, default=10)
+    args = parser.parse_args()
+    run(no_requests=args.requests, no_documents=args.documents)
@@ -0,0 +1,117 @@
+# Compare Qdrant collection modes (float32, int8 scalar and binary
+# quantization, with and without on-disk originals) on estimated RAM per
+# million vectors, recall@10 against exact search, and p50/p99 latency.
+# Local mode (no --url) searches exhaustively and ignores quantization, so
+# use a Qdrant server for meaningful numbers:
+#   docker run -p 6333:6333 qdrant/qdrant
+# Run from the src folder:
+#   python -m benchmarks.qdrant_quantization_benchmark --url http://localhost:6333
+import argparse
+import tempfile
+import time
+import numpy as np
+from qdrant_client import QdrantClient
+from stores.vectordb.providers import QdrantDBProvider
+from stores.vectordb.VectorDBEnums import DistanceMethodEnums, QuantizationEnums
+
+MODES = [
+    ("float32", QuantizationEnums.NONE.value, False),
+    ("int8", QuantizationEnums.SCALAR.value, False),
+    ("int8 + originals on disk", QuantizationEnums.SCALAR.value, True),
+    ("binary", QuantizationEnums.BINARY.value, False),
+    ("binary + originals on disk", QuantizationEnums.BINARY.value, True),
+]
+
+
+def make_vectors(no_vectors: int, dim: int, seed: int = 0):
+    # Clustered unit vectors, closer to real embeddings than uniform noise
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(64, dim)).astype(np.float32)
+    vectors = centers[rng.integers(0, 64, no_vectors)]
+    vectors += rng.normal(scale=0.6, size=(no_vectors, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+# RAM per million vectors, following Qdrant's sizing guide: vectors plus
+# ~50% for the HNSW graph and overhead, originals excluded when on disk
+def estimate_ram_mb(dim: int, quantization: str, on_disk: bool, hnsw_m: int):
+    originals = 0 if on_disk else dim * 4
+    quantized = {
+        QuantizationEnums.NONE.value: 0,
+        QuantizationEnums.SCALAR.value: dim,
+        QuantizationEnums.BINARY.value: dim / 8,
+    }[quantization]
+    graph = hnsw_m * 2 * 4
+    return 1_000_000 * ((originals + quantized) * 1.5 + graph) / 1024**2
+
+
+def run(args):
+    vectors = make_vectors(args.vectors, args.dim)
+    queries = make_vectors(args.queries, args.dim, seed=1)
+    exact_top = np.argsort(-(queries @ vectors.T), axis=1)[:, :10]
+
+    for name, quantization, on_disk in MODES:
+        provider = QdrantDBProvider(
+            db_path=tempfile.mkdtemp(),
+            distance_method=DistanceMethodEnums.COSINE.value,
+            quantization=quantization,
+            search_oversampling=args.oversampling,
+            search_rescore=True,
+            vectors_on_disk=on_disk,
+            hnsw_m=args.hnsw_m,
+            hnsw_ef_construct=args.hnsw_ef_construct,
+            hnsw_ef=args.hnsw_ef,
+        )
+        if args.url:
+            provider.client = QdrantClient(url=args.url, timeout=120)
+        else:
+            provider.connect()
+
+        collection_name = "quantization_benchmark"
+        provider.create_collection(
+            collection_name=collection_name, embedding_size=args.dim, do_reset=True
+        )
+        provider.insert_many(
+            collection_name=collection_name,
+            texts=[""] * args.vectors,
+            vectors=vectors.tolist(),
+            batch_size=1000,
+        )
+        # Let the server finish indexing and quantizing before timing
+        while args.url:
+            info = provider.get_collection_info(collection_name)
+            if info.status.value == "green":
+                break
+            time.sleep(1)
+
+        latencies, recalls = [], []
+        for query, exact in zip(queries, exact_top):
+            started = time.perf_counter()
+            results = provider.search_by_vector(
+                collection_name=collection_name, vector=query.tolist(), limit=10
+            )
+            latencies.append(time.perf_counter() - started)
+            found = {int(result.record_id) for result in results}
+            recalls.append(len(found & set(exact.tolist())) / 10)
+
+        provider.delete_collection(collection_name)
+        ram_mb = estimate_ram_mb(args.dim, quantization, on_disk, args.hnsw_m)
+        print(
+            f"{name:>27}: ~{ram_mb:,.0f} MB RAM per 1M vectors | "
+            f"recall@10 {np.mean(recalls):.3f} | "
+            f"p50 {np.percentile(latencies, 50) * 1000:.2f} ms | "
+            f"p99 {np.percentile(latencies, 99) * 1000:.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default=None)
+    parser.add_argument("--vectors", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--oversampling", type=float, default=2.0)
+    parser.add_argument("--hnsw-m", type=int, default=16)
+    parser.add_argument("--hnsw-ef-construct", type=int, default=100)
+    parser.add_argument("--hnsw-ef", type=int, default=128)
+    run(parser.parse_args())
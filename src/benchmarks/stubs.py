@@ -0,0 +1,302 @@
+import asyncio
+import hashlib
+import time
+from stores.llm.LLMInterface import LLMInterface
+from stores.llm.LLMEnums import OpenAIEnums
+from stores.vectordb.VectorDBInterface import VectorDBInterface
+from models.db_schemas import RetrievedDocument
+
+
+# Stub LLM provider: no network, a fixed cost per call plus a small cost per text
+class StubLLMProvider(LLMInterface):
+
+    def __init__(
+        self,
+        call_latency: float = 0.02,
+        per_text_latency: float = 0.0005,
+        embedding_size: int = 768,
+    ):
+        self.call_latency = call_latency
+        self.per_text_latency = per_text_latency
+
+        self.generation_model_id = None
+        self.embedding_model_id = None
+        self.embedding_size = embedding_size
+
+        self.client = True
+        self.enums = OpenAIEnums
+        self.calls = 0
+
+    def get_generation_model(self, model_id: str):
+        self.generation_model_id = model_id
+
+    def get_embedding_model(self, model_id: str, embedding_size: int):
+        self.embedding_model_id = model_id
+        self.embedding_size = embedding_size
+
+    def fake_vector(self, text: str):
+        digest = hashlib.sha256(text.encode("utf-8")).digest()
+        return [digest[i % len(digest)] / 255.0 for i in range(self.embedding_size)]
+
+    def generate_text(
+        self,
+        prompt: str,
+        chat_history: list = [],
+        max_output_tokens: int = None,
+        temperature: float = None,
+        stream: bool = False,
+    ):
+        self.calls += 1
+        time.sleep(self.call_latency)
+        answer = f"stub answer for: {prompt[:40]}"
+        return iter(f"{token} " for token in answer.split(" ")) if stream else answer
+
+    def embed_text(self, text: str, document_type: str = None):
+        self.calls += 1
+        time.sleep(self.call_latency + self.per_text_latency)
+        return self.fake_vector(text)
+
+    def embed_texts(
+        self, texts: list, document_type: str = None, batch_size: int = None
+    ):
+        batch_size = batch_size or 64
+        vectors = []
+        for i in range(0, len(texts), batch_size):
+            batch_texts = texts[i : i + batch_size]
+            self.calls += 1
+            time.sleep(self.call_latency + self.per_text_latency * len(batch_texts))
+            vectors.extend(self.fake_vector(text) for text in batch_texts)
+        return vectors
+
+    async def agenerate_text(
+        self,
+        prompt: str,
+        chat_history: list = [],
+        max_output_tokens: int = None,
+        temperature: float = None,
+        stream: bool = False,
+    ):
+        self.calls += 1
+        await asyncio.sleep(self.call_latency)
+        answer = f"stub answer for: {prompt[:40]}"
+        return self.astream_tokens(answer) if stream else answer
+
+    async def astream_tokens(self, answer: str):
+        for token in answer.split(" "):
+            yield f"{token} "
+
+    async def aembed_text(self, text: str, document_type: str = None):
+        self.calls += 1
+        await asyncio.sleep(self.call_latency + self.per_text_latency)
+        return self.fake_vector(text)
+
+    async def aembed_texts(
+        self, texts: list, document_type: str = None, batch_size: int = None
+    ):
+        batch_size = batch_size or 64
+        vectors = []
+        for i in range(0, len(texts), batch_size):
+            batch_texts = texts[i : i + batch_size]
+            self.calls += 1
+            await asyncio.sleep(
+                self.call_latency + self.per_text_latency * len(batch_texts)
+            )
+            vectors.extend(self.fake_vector(text) for text in batch_texts)
+        return vectors
+
+    def construct_prompt(self, prompt: str, role: str):
+        return {"role": role, "content": prompt}
+
+
+# Stub vector store: keeps records in a dict, search returns the first records
+# (of the tenant, when one is given)
+class StubVectorDBProvider(VectorDBInterface):
+
+    def __init__(self):
+        self.collections = {}
+        self.content_hashes = {}
+
+    def connect(self):
+        pass
+
+    def disconnect(self):
+        pass
+
+    def flush_collection(self, collection_name: str):
+        pass
+
+    def is_collection_existed(self, collection_name: str) -> bool:
+        return collection_name in self.collections
+
+    def list_all_collections(self):
+        return list(self.collections.keys())
+
+    def get_collection_info(self, collection_name: str) -> dict:
+        return {"points_count": len(self.collections.get(collection_name, {}))}
+
+    def delete_collection(self, collection_name: str):
+        self.content_hashes = {
+            key: value
+            for key, value in self.content_hashes.items()
+            if key[0] != collection_name
+        }
+        return self.collections.pop(collection_name, None)
+
+    def create_collection(
+        self,
+        collection_name: str,
+        embedding_size: int,
+        do_reset: bool = False,
+        is_multi_tenant: bool = False,
+    ):
+        if do_reset:
+            self.delete_collection(collection_name=collection_name)
+        if not self.is_collection_existed(collection_name):
+            self.collections[collection_name] = {}
+            return True
+        return False
+
+    def get_tenant_records(self, collection_name: str, tenant_id: str = None):
+        return {
+            record_id: record
+            for record_id, record in self.collections.get(collection_name, {}).items()
+            if tenant_id is None or record[3] == tenant_id
+        }
+
+    def delete_tenant(self, collection_name: str, tenant_id: str):
+        for record_id in self.get_tenant_records(collection_name, tenant_id):
+            self.collections[collection_name].pop(record_id)
+            self.content_hashes.pop((collection_name, record_id), None)
+        return True
+
+    def count_tenant_records(self, collection_name: str, tenant_id: str) -> int:
+        return len(self.get_tenant_records(collection_name, tenant_id))
+
+    def iterate_records(self, collection_name: str, batch_size: int = 256):
+        records = list(self.collections.get(collection_name, {}).items())
+        for i in range(0, len(records), batch_size):
+            yield [
+                {
+                    "record_id": record_id,
+                    "text": text,
+                    "metadata": metadata,
+                    "content_hash": self.content_hashes.get(
+                        (collection_name, record_id)
+                    ),
+                    "tenant_id": tenant_id,
+                    "vector": vector,
+                }
+                for record_id, (text, vector, metadata, tenant_id) in records[
+                    i : i + batch_size
+                ]
+            ]
+
+    def iterate_record_ids(
+        self, collection_name: str, tenant_id: str = None, batch_size: int = 1024
+    ):
+        record_ids = list(self.get_tenant_records(collection_name, tenant_id))
+        for i in range(0, len(record_ids), batch_size):
+            yield record_ids[i : i + batch_size]
+
+    def delete_records(
+        self, collection_name: str, record_ids: list, tenant_id: str = None
+    ):
+        tenant_records = self.get_tenant_records(collection_name, tenant_id)
+        for record_id in record_ids:
+            if record_id in tenant_records:
+                self.collections[collection_name].pop(record_id)
+                self.content_hashes.pop((collection_name, record_id), None)
+        return True
+
+    def insert_one(
+        self,
+        collection_name: str,
+        text: str,
+        vector: list,
+        metadata: dict = None,
+        record_id: str = None,
+        tenant_id: str = None,
+    ):
+        self.collections[collection_name][record_id] = (
+            text,
+            vector,
+            metadata,
+            tenant_id,
+        )
+        self.content_hashes[(collection_name, record_id)] = None
+        return True
+
+    def insert_many(
+        self,
+        collection_name: str,
+        texts: list,
+        vectors: list,
+        metadata: list = None,
+        record_ids: list = None,
+        batch_size: int = 50,
+        content_hashes: list = None,
+        tenant_id: str = None,
+    ):
+        metadata = metadata or [None] * len(texts)
+        record_ids = record_ids or list(range(len(texts)))
+        content_hashes = content_hashes or [None] * len(texts)
+        for record_id, text, vector, meta, content_hash in zip(
+            record_ids, texts, vectors, metadata, content_hashes
+        ):
+            self.collections[collection_name][record_id] = (
+                text,
+                vector,
+                meta,
+                tenant_id,
+            )
+            self.content_hashes[(collection_name, record_id)] = content_hash
+        return True
+
+    def get_content_hashes(
+        self, collection_name: str, record_ids: list, tenant_id: str = None
+    ) -> dict:
+        records = self.get_tenant_records(collection_name, tenant_id)
+        return {
+            record_id: self.content_hashes[(collection_name, record_id)]
+            for record_id in record_ids
+            if record_id in records
+        }
+
+    def search_by_vector(
+        self, collection_name: str, vector: list, limit: int = 5, tenant_id: str = None
+    ):
+        records = list(self.get_tenant_records(collection_name, tenant_id).items())
+        return [
+            RetrievedDocument(
+                text=text,
+                score=1.0 / (rank + 1),
+                record_id=str(record_id),
+                metadata=metadata,
+            )
+            for rank, (record_id, (text, _, metadata, _)) in enumerate(
+                records[:limit]
+            )
+        ]
+
+    def search_by_vectors(
+        self, collection_name: str, vectors: list, limit: int = 5, tenant_id: str = None
+    ):
+        return [
+            self.search_by_vector(collection_name, vector, limit, tenant_id)
+            for vector in vectors
+        ]
+
+    def get_records_by_ids(
+        self, collection_name: str, record_ids: list, tenant_id: str = None
+    ):
+        records = self.get_tenant_records(collection_name, tenant_id)
+        return [
+            RetrievedDocument(
+                text=records[record_id][0],
+                score=0.0,
+                record_id=str(record_id),
+                metadata=records[record_id][2],
+            )
+            for record_id in record_ids
+            if record_id in records
+        ]
@@ -0,0 +1,115 @@
+# Compare the NUMPY vector store (exact and IVF search) with Qdrant local
+# mode on insert time, recall@10 against exact search, single-query p50/p99
+# latency and batched query throughput.
+# Run from the src folder:  python -m benchmarks.vector_store_benchmark
+import argparse
+import tempfile
+import time
+import numpy as np
+from stores.vectordb.providers import QdrantDBProvider, NumpyDBProvider
+from stores.vectordb.VectorDBEnums import DistanceMethodEnums
+from benchmarks.qdrant_quantization_benchmark import make_vectors
+
+
+def make_providers(args):
+    distance_method = DistanceMethodEnums.COSINE.value
+    providers = [
+        (
+            "numpy exact",
+            NumpyDBProvider(
+                db_path=tempfile.mkdtemp(),
+                distance_method=distance_method,
+                ivf_min_vectors=0,
+            ),
+        ),
+        (
+            "numpy ivf",
+            NumpyDBProvider(
+                db_path=tempfile.mkdtemp(),
+                distance_method=distance_method,
+                ivf_min_vectors=1,
+                ivf_lists=args.ivf_lists,
+                ivf_probes=args.ivf_probes,
+            ),
+        ),
+    ]
+    if not args.skip_qdrant:
+        providers.append(
+            (
+                "qdrant local",
+                QdrantDBProvider(
+                    db_path=tempfile.mkdtemp(), distance_method=distance_method
+                ),
+            )
+        )
+    return providers
+
+
+def run(args):
+    vectors = make_vectors(args.vectors, args.dim)
+    queries = make_vectors(args.queries, args.dim, seed=1)
+    exact_top = np.argsort(-(queries @ vectors.T), axis=1)[:, :10]
+    collection_name = "vector_store_benchmark"
+
+    for name, provider in make_providers(args):
+        provider.connect()
+        provider.create_collection(
+            collection_name=collection_name, embedding_size=args.dim, do_reset=True
+        )
+
+        started = time.perf_counter()
+        for i in range(0, args.vectors, 500):
+            provider.insert_many(
+                collection_name=collection_name,
+                texts=[""] * len(vectors[i : i + 500]),
+                vectors=vectors[i : i + 500].tolist(),
+                record_ids=list(range(i, i + len(vectors[i : i + 500]))),
+                batch_size=500,
+            )
+        insert_seconds = time.perf_counter() - started
+
+        # The IVF is built in the background once the push is flushed, wait
+        # for it so the latencies are those of IVF search
+        provider.flush_collection(collection_name)
+        if hasattr(provider, "wait_for_ivf"):
+            provider.wait_for_ivf(collection_name)
+        provider.search_by_vector(collection_name, queries[0].tolist(), limit=10)
+
+        latencies, recalls = [], []
+        for query, exact in zip(queries, exact_top):
+            started = time.perf_counter()
+            results = provider.search_by_vector(
+                collection_name=collection_name, vector=query.tolist(), limit=10
+            )
+            latencies.append(time.perf_counter() - started)
+            found = {int(result.record_id) for result in results}
+            recalls.append(len(found & set(exact.tolist())) / 10)
+
+        batched = ""
+        if hasattr(provider, "search_by_vectors"):
+            started = time.perf_counter()
+            provider.search_by_vectors(
+                collection_name=collection_name, vectors=queries.tolist(), limit=10
+            )
+            batched_qps = len(queries) / (time.perf_counter() - started)
+            batched = f" | batched {batched_qps:,.0f} q/s"
+
+        provider.delete_collection(collection_name)
+        provider.disconnect()
+        print(
+            f"{name:>13}: insert {insert_seconds:.2f}s | "
+            f"recall@10 {np.mean(recalls):.3f} | "
+            f"p50 {np.percentile(latencies, 50) * 1000:.2f} ms | "
+            f"p99 {np.percentile(latencies, 99) * 1000:.2f} ms{batched}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--vectors", type=int, default=50_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--ivf-lists", type=int, default=None)
+    parser.add_argument("--ivf-probes", type=int, default=8)
+    parser.add_argument("--skip-qdrant", action="store_true")
+    run(parser.parse_args())
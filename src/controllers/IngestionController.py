@@ -0,0 +1,220 @@
+from .BaseController import BaseController
+from .ProcessController import ProcessController
+from .NLPController import NLPController
+from models.ChunkModel import ChunkModel
+from models.db_schemas import Project, DataChunk
+from models.enums.StageEnum import StageEnum
+from models.enums.PipelineEnum import PipelineEnum
+from helpers.timing import record_stage, time_stage
+from bson.objectid import ObjectId
+import asyncio
+import logging
+import time
+
+
+# Pipelined ingestion: parse -> chunk/sanitize -> embed -> (Qdrant upsert +
+# Mongo insert). Stages are connected by bounded queues, so memory stays flat
+# whatever the corpus size and embedding overlaps with PDF parsing.
+class IngestionController(BaseController):
+
+    def __init__(
+        self,
+        process_controller: ProcessController,
+        nlp_controller: NLPController,
+        chunk_model: ChunkModel,
+        process_pool=None,
+    ):
+        super().__init__()
+
+        self.process_controller = process_controller
+        self.nlp_controller = nlp_controller
+        self.chunk_model = chunk_model
+        self.process_pool = process_pool
+
+        self.queue_size = self.app_settings.INGESTION_QUEUE_SIZE
+        self.embedding_concurrency = self.app_settings.INGESTION_EMBEDDING_CONCURRENCY
+        self.batch_size = self.app_settings.EMBEDDING_DEFAULT_BATCH_SIZE
+        self.logger = logging.getLogger(__name__)
+
+    # Stage 1: load files page by page, the blocking loader runs off the loop.
+    # The load stage of a file excludes the time spent waiting on the queue
+    async def parse_files(
+        self,
+        project: Project,
+        project_files_ids: dict,
+        pages_queue: asyncio.Queue,
+        stats: dict,
+    ):
+        for asset_id, file_name in project_files_ids.items():
+            started_at = time.perf_counter()
+            pages = await asyncio.to_thread(
+                self.process_controller.iter_file_content, file_name
+            )
+            if pages is None:
+                continue
+
+            load_seconds = 0.0
+            while True:
+                page = await asyncio.to_thread(next, pages, None)
+                load_seconds += time.perf_counter() - started_at
+                if page is None:
+                    break
+                await pages_queue.put((asset_id, file_name, page))
+                started_at = time.perf_counter()
+
+            record_stage(
+                StageEnum.LOAD.value,
+                seconds=load_seconds,
+                pipeline=PipelineEnum.INGESTION.value,
+                project_id=project.project_id,
+            )
+            stats["processed_files"] += 1
+
+        await pages_queue.put(None)
+
+    # Stage 2: split pages into chunks (in the process pool, off the loop) and
+    # group them into embedding batches
+    async def chunk_pages(
+        self,
+        project: Project,
+        pages_queue: asyncio.Queue,
+        batches_queue: asyncio.Queue,
+        chunk_size: int,
+        overlap_size: int,
+    ):
+        chunk_orders = {}
+        batch = []
+        while True:
+            item = await pages_queue.get()
+            if item is None:
+                break
+
+            asset_id, file_name, page = item
+            with time_stage(
+                StageEnum.SPLIT.value,
+                pipeline=PipelineEnum.INGESTION.value,
+                project_id=project.project_id,
+            ):
+                file_chunks = await self.process_controller.aprocess_file_content(
+                    file_content=[page],
+                    file_id=file_name,
+                    chunk_size=chunk_size,
+                    overlap_size=overlap_size,
+                    executor=self.process_pool,
+                )
+            for chunk in file_chunks:
+                chunk_orders[asset_id] = chunk_orders.get(asset_id, 0) + 1
+                # The _id is set here so the vector point id is known before
+                # the chunk reaches Mongo
+                batch.append(
+                    DataChunk(
+                        id=ObjectId(),
+                        chunk_text=chunk.page_content,
+                        chunk_metadata=chunk.metadata,
+                        chunk_order=chunk_orders[asset_id],
+                        chunk_project_id=project.project_id,
+                        chunk_asset_id=ObjectId(asset_id),
+                    )
+                )
+                if len(batch) >= self.batch_size:
+                    await batches_queue.put(batch)
+                    batch = []
+
+        if batch:
+            await batches_queue.put(batch)
+        for _ in range(self.embedding_concurrency):
+            await batches_queue.put(None)
+
+    # Stage 3: sanitize and embed batches, several batches in flight at once
+    async def embed_batches(
+        self,
+        project: Project,
+        batches_queue: asyncio.Queue,
+        writes_queue: asyncio.Queue,
+    ):
+        while True:
+            batch = await batches_queue.get()
+            if batch is None:
+                break
+
+            records = self.nlp_controller.prepare_index_records(chunks=batch)
+            vectors = await self.nlp_controller.embed_index_records(
+                project=project, records=records
+            )
+            if vectors is None:
+                raise RuntimeError("Embedding failed during ingestion")
+
+            await writes_queue.put((batch, records, vectors))
+
+        await writes_queue.put(None)
+
+    # Stage 4: upsert vectors into the vector db and insert chunks into Mongo
+    async def write_batches(
+        self, project: Project, writes_queue: asyncio.Queue, stats: dict
+    ):
+        finished_embedders = 0
+        while finished_embedders < self.embedding_concurrency:
+            item = await writes_queue.get()
+            if item is None:
+                finished_embedders += 1
+                continue
+
+            batch, records, vectors = item
+            if not self.nlp_controller.upsert_index_records(
+                project=project, records=records, vectors=vectors
+            ):
+                raise RuntimeError("Vector db upsert failed during ingestion")
+            stats["indexed_chunks"] += len(records)
+            stats["inserted_chunks"] += await self.chunk_model.insert_many_chunks(
+                chunks=batch
+            )
+
+    # Returns the ingestion stats, or None if any stage failed
+    async def ingest_files(
+        self,
+        project: Project,
+        project_files_ids: dict,
+        chunk_size: int = 100,
+        overlap_size: int = 20,
+        do_reset: bool = False,
+    ):
+        stats = {"processed_files": 0, "inserted_chunks": 0, "indexed_chunks": 0}
+
+        _ = self.nlp_controller.create_vector_db_collection(
+            project=project, do_reset=do_reset
+        )
+
+        pages_queue = asyncio.Queue(maxsize=self.queue_size)
+        batches_queue = asyncio.Queue(maxsize=self.queue_size)
+        writes_queue = asyncio.Queue(maxsize=self.queue_size)
+
+        tasks = [
+            asyncio.create_task(
+                self.parse_files(project, project_files_ids, pages_queue, stats)
+            ),
+            asyncio.create_task(
+                self.chunk_pages(
+                    project, pages_queue, batches_queue, chunk_size, overlap_size
+                )
+            ),
+            *[
+                asyncio.create_task(
+                    self.embed_batches(project, batches_queue, writes_queue)
+                )
+                for _ in range(self.embedding_concurrency)
+            ],
+            asyncio.create_task(self.write_batches(project, writes_queue, stats)),
+        ]
+
+        try:
+            await asyncio.gather(*tasks)
+        except Exception as e:
+            self.logger.error(f"Ingestion pipeline failed: {e}")
+            return None
+        finally:
+            # Stop the remaining stages on failure or client disconnect
+            for task in tasks:
+                task.cancel()
+
+        self.nlp_controller.flush_indexes(project=project)
+        return stats
@@ -0,0 +1,255 @@
+from .BaseController import BaseController
+from .ProcessController import ProcessController
+from .NLPController import NLPController
+from models.JobModel import JobModel
+from models.ChunkModel import ChunkModel
+from models.ProjectModel import ProjectModel
+from models.db_schemas import Job, DataChunk
+from models.enums.JobEnum import JobTypeEnum, JobStatusEnum
+from bson.objectid import ObjectId
+from datetime import datetime, timedelta, timezone
+import asyncio
+import logging
+import time
+
+
+# Runs /data/process and /nlp/index/push as background asyncio tasks, with
+# their state and progress stored in the Mongo "jobs" collection
+class JobController(BaseController):
+
+    def __init__(
+        self,
+        job_model: JobModel,
+        chunk_model: ChunkModel,
+        project_model: ProjectModel,
+        nlp_controller: NLPController,
+        job_tasks: dict,
+        process_pool=None,
+        worker_id: str = None,
+    ):
+        super().__init__()
+
+        self.job_model = job_model
+        self.chunk_model = chunk_model
+        self.project_model = project_model
+        self.nlp_controller = nlp_controller
+        # {job_id: asyncio.Task} shared by the whole app (see main.lifespan)
+        self.job_tasks = job_tasks
+        self.process_pool = process_pool
+        # Owner of the jobs started here (see main.lifespan)
+        self.worker_id = worker_id
+        self.logger = logging.getLogger(__name__)
+
+    async def submit_job(self, project_id: str, job_type: str, job_config: dict):
+        job = await self.job_model.create_job(
+            Job(
+                job_project_id=project_id,
+                job_type=job_type,
+                job_config=job_config,
+                job_worker_id=self.worker_id,
+            )
+        )
+        self.start_job(job=job)
+        return job
+
+    def start_job(self, job: Job):
+        task = asyncio.create_task(self.run_job(job=job))
+        self.job_tasks[job.id] = task
+        task.add_done_callback(lambda _: self.job_tasks.pop(job.id, None))
+
+    async def cancel_job(self, job: Job):
+        job = await self.job_model.update_job(
+            job_id=job.id, fields={"job_cancel_requested": True}
+        )
+        task = self.job_tasks.get(job.id)
+        if task:
+            task.cancel()
+        elif job.job_status == JobStatusEnum.PENDING.value:
+            job = await self.job_model.update_job_status(
+                job_id=job.id, job_status=JobStatusEnum.CANCELLED.value
+            )
+        return job
+
+    # Resume re-runs the job, work that is already done is skipped
+    async def resume_job(self, job: Job):
+        job = await self.job_model.update_job(
+            job_id=job.id,
+            fields={
+                "job_status": JobStatusEnum.PENDING.value,
+                "job_cancel_requested": False,
+                "job_error": None,
+                "job_worker_id": self.worker_id,
+            },
+        )
+        self.start_job(job=job)
+        return job
+
+    # At startup (include_own_jobs=True) the jobs of this worker's previous
+    # run are interrupted too, later only the jobs of workers that stopped
+    # heartbeating
+    async def interrupt_orphaned_jobs(self, include_own_jobs: bool = False):
+        stale_before = datetime.now(timezone.utc) - timedelta(
+            seconds=self.app_settings.JOB_STALE_SECONDS
+        )
+        return await self.job_model.mark_unfinished_jobs_interrupted(
+            stale_before=stale_before,
+            worker_id=self.worker_id if include_own_jobs else None,
+        )
+
+    # Background loop: heartbeat of the jobs running here, then recovery of
+    # the jobs of dead workers. A database outage only skips a beat
+    async def run_heartbeat(self):
+        while True:
+            await asyncio.sleep(self.app_settings.JOB_HEARTBEAT_SECONDS)
+            try:
+                await self.job_model.touch_jobs(job_ids=list(self.job_tasks.keys()))
+                await self.interrupt_orphaned_jobs()
+            except Exception as e:
+                self.logger.error(f"Jobs heartbeat failed: {e}")
+
+    async def run_job(self, job: Job):
+        try:
+            await self.job_model.update_job_status(
+                job_id=job.id, job_status=JobStatusEnum.RUNNING.value
+            )
+            if job.job_type == JobTypeEnum.PROCESS.value:
+                await self.run_process_job(job=job)
+            elif job.job_type == JobTypeEnum.INDEX_PUSH.value:
+                await self.run_index_push_job(job=job)
+            else:
+                raise ValueError(f"Unsupported job type: {job.job_type}")
+
+        except asyncio.CancelledError:
+            # Cancelled by the user, or by the server shutting down
+            current_job = await self.job_model.get_job(job_id=job.id)
+            job_status = JobStatusEnum.INTERRUPTED.value
+            if current_job and current_job.job_cancel_requested:
+                job_status = JobStatusEnum.CANCELLED.value
+            await self.job_model.update_job_status(
+                job_id=job.id, job_status=job_status
+            )
+            raise
+
+        except Exception as e:
+            self.logger.error(f"Job {job.id} failed: {e}")
+            await self.job_model.update_job_status(
+                job_id=job.id, job_status=JobStatusEnum.FAILED.value, job_error=str(e)
+            )
+            return
+
+        await self.job_model.update_job_status(
+            job_id=job.id, job_status=JobStatusEnum.COMPLETED.value
+        )
+
+    async def update_progress(self, job: Job, progress: dict, started_at: float):
+        elapsed = time.perf_counter() - started_at
+        progress["elapsed_seconds"] = round(elapsed, 2)
+        progress["chunks_per_second"] = (
+            round(progress.get("chunks_done", 0) / elapsed, 2) if elapsed else 0.0
+        )
+        job = await self.job_model.update_job_progress(
+            job_id=job.id, progress=progress
+        )
+        # Cancel requests may come from another worker process
+        if job and job.job_cancel_requested:
+            raise asyncio.CancelledError()
+
+    async def run_process_job(self, job: Job):
+        config = job.job_config
+        progress = job.job_progress
+        project_id = job.job_project_id
+        process_controller = ProcessController(project_id=project_id)
+
+        # Reset only on the first run, not when the job is resumed
+        if config.get("do_reset") == 1 and not progress.get("reset_done"):
+            await self.chunk_model.delete_chunks_by_project_id(project_id=project_id)
+            progress["reset_done"] = True
+
+        project_files_ids = config["project_files_ids"]
+        processed_assets = progress.get("processed_assets", [])
+        progress["files_total"] = len(project_files_ids)
+        progress.setdefault("files_done", 0)
+        progress.setdefault("chunks_done", 0)
+        started_at = time.perf_counter()
+        await self.update_progress(job, progress, started_at)
+
+        for asset_id, file_name in project_files_ids.items():
+            if asset_id in processed_assets:
+                continue
+
+            # A file interrupted half way may have left some chunks behind
+            await self.chunk_model.delete_chunks_by_asset_id(asset_id=asset_id)
+
+            # Parsing and splitting run in the process pool, off the event loop
+            file_chunks, timings = await process_controller.process_file(
+                file_id=file_name,
+                chunk_size=config["chunk_size"],
+                overlap_size=config["overlap_size"],
+                executor=self.process_pool,
+            )
+            if file_chunks:
+                file_chunks_records = [
+                    DataChunk(
+                        chunk_text=chunk.page_content,
+                        chunk_metadata=chunk.metadata,
+                        chunk_order=i + 1,
+                        chunk_project_id=project_id,
+                        chunk_asset_id=ObjectId(asset_id),
+                    )
+                    for i, chunk in enumerate(file_chunks)
+                ]
+                progress["chunks_done"] += await self.chunk_model.insert_many_chunks(
+                    chunks=file_chunks_records
+                )
+                progress.setdefault("files_timings", []).append(timings)
+
+            processed_assets.append(asset_id)
+            progress["processed_assets"] = processed_assets
+            progress["files_done"] += 1
+            await self.update_progress(job, progress, started_at)
+
+    async def run_index_push_job(self, job: Job):
+        config = job.job_config
+        progress = job.job_progress
+        project = await self.project_model.get_project_or_create_one(
+            project_id=job.job_project_id
+        )
+
+        # Already indexed chunks are skipped by content hash, so a resumed
+        # job only embeds what is left. The reset runs before paging, so it
+        # also applies to a project without chunks
+        if config.get("do_reset") == 1 and not progress.get("reset_done"):
+            _ = self.nlp_controller.create_vector_db_collection(
+                project=project, do_reset=True
+            )
+            progress["reset_done"] = True
+        progress["chunks_done"] = 0
+        progress["embeddings_done"] = 0
+        progress["skipped_chunks"] = 0
+        pushed_record_ids = set()
+        started_at = time.perf_counter()
+
+        async for page_chunks in self.chunk_model.iter_chunks_by_project_id(
+            project_id=job.job_project_id,
+            projection=["chunk_text", "chunk_metadata"],
+        ):
+            inserted_count = await self.nlp_controller.index_into_vector_db(
+                project=project, chunks=page_chunks
+            )
+            if inserted_count is None:
+                raise RuntimeError("Error while inserting into the vector db")
+
+            pushed_record_ids.update(
+                self.nlp_controller.create_point_id(chunk_id=chunk.id)
+                for chunk in page_chunks
+            )
+            progress["chunks_done"] += len(page_chunks)
+            progress["embeddings_done"] += inserted_count
+            progress["skipped_chunks"] += len(page_chunks) - inserted_count
+            await self.update_progress(job, progress, started_at)
+
+        progress["deleted_records"] = self.nlp_controller.delete_stale_records(
+            project=project, keep_record_ids=pushed_record_ids
+        )
+        self.nlp_controller.flush_indexes(project=project)
+        await self.update_progress(job, progress, started_at)
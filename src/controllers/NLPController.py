@@ -1,16 +1,45 @@
 from pydoc import text
 from .BaseController import BaseController
-from models.db_schemas import Project, DataChunk
+from models.db_schemas import Project, DataChunk, RetrievedDocument
 from stores.llm.LLMEnums import DocumentTypeEnum
+from stores.llm.ContextPacker import ContextPacker
+from stores.vectordb.VectorDBEnums import SearchModeEnum
+from models.enums.StageEnum import StageEnum
+from models.enums.PipelineEnum import PipelineEnum
+from helpers.timing import time_stage, record_stage
+from helpers.metrics import track_in_flight
 from typing import List
+from bson.objectid import ObjectId
+import hashlib
+import logging
+import uuid
 import time
 import os
+import re
 
 
 class NLPController(BaseController):
 
+    guardrail_triggers = [
+        "ignore all previous",
+        "system prompt",
+        "developer mode",
+        "override instructions",
+        "as a language model, i am now",
+    ]
+    guardrail_refusal = (
+        "I'm sorry, but I cannot fulfill this request due to security policy violations."
+    )
+
     def __init__(
-        self, generation_client, embedding_client, vectordb_client, template_parser
+        self,
+        generation_client,
+        embedding_client,
+        vectordb_client,
+        template_parser,
+        embedding_cache=None,
+        lexical_index_store=None,
+        reranker=None,
     ):
         super().__init__()
 
@@ -18,6 +47,17 @@ class NLPController(BaseController):
         self.embedding_client = embedding_client
         self.vectordb_client = vectordb_client
         self.template_parser = template_parser
+        self.embedding_cache = embedding_cache
+        self.lexical_index_store = lexical_index_store
+        self.reranker = reranker
+        self.logger = logging.getLogger(__name__)
+        self.context_packer = ContextPacker(
+            context_window=self.app_settings.GENERATION_CONTEXT_WINDOW,
+            max_output_tokens=self.app_settings.GENERATION_DEFAULT_MAX_TOKENS,
+            chars_per_token=self.app_settings.CONTEXT_CHARS_PER_TOKEN,
+            safety_margin_tokens=self.app_settings.CONTEXT_SAFETY_MARGIN_TOKENS,
+            expected_chunk_tokens=self.app_settings.CONTEXT_EXPECTED_CHUNK_TOKENS,
+        )
 
         # 1. Get IDs from .env with fallbacks
         gen_model_id = os.getenv("GENERATION_MODEL_ID", "llama3.1:8b-instruct-q8_0")
@@ -35,17 +75,176 @@ class NLPController(BaseController):
     def create_collection_name(self, project_id: str) -> str:
         return f"collection_{project_id}".strip()
 
+    # Multi-tenant layout: one collection per embedding model
+    def create_shared_collection_name(self) -> str:
+        model_id = re.sub(
+            r"[^0-9a-zA-Z]+", "_", str(self.embedding_client.embedding_model_id)
+        ).strip("_")
+        return f"shared_{model_id}_{self.embedding_client.embedding_size}"
+
+    # Where the project's vectors live: its own collection (tenant_id None),
+    # or the shared collection partitioned by the project_id payload key.
+    # Lexical indexes stay per project (create_collection_name) in both layouts
+    def get_vector_db_target(self, project: Project) -> dict:
+        if self.app_settings.VECTOR_DB_MULTI_TENANT:
+            return {
+                "collection_name": self.create_shared_collection_name(),
+                "tenant_id": project.project_id,
+            }
+        return {
+            "collection_name": self.create_collection_name(
+                project_id=project.project_id
+            ),
+            "tenant_id": None,
+        }
+
     def reset_vector_db_collection(self, project: Project):
         collection_name = self.create_collection_name(project_id=project.project_id)
-        return self.vectordb_client.delete_collection(collection_name=collection_name)
+        if self.lexical_index_store:
+            self.lexical_index_store.delete_index(collection_name=collection_name)
+
+        vector_db_target = self.get_vector_db_target(project=project)
+        if vector_db_target["tenant_id"] is not None:
+            return self.vectordb_client.delete_tenant(**vector_db_target)
+        return self.vectordb_client.delete_collection(
+            collection_name=vector_db_target["collection_name"]
+        )
+
+    # Removes the project's records whose Mongo chunk is gone (e.g. chunks
+    # re-created by /data/process with do_reset, they get new _ids and so new
+    # point ids), keep_record_ids are the point ids of the current chunks.
+    # Returns how many records were removed
+    def delete_stale_records(self, project: Project, keep_record_ids: set) -> int:
+        vector_db_target = self.get_vector_db_target(project=project)
+        stale_record_ids = [
+            record_id
+            for batch_ids in self.vectordb_client.iterate_record_ids(
+                **vector_db_target
+            )
+            for record_id in batch_ids
+            if record_id not in keep_record_ids
+        ]
+        if not stale_record_ids:
+            return 0
+
+        _ = self.vectordb_client.delete_records(
+            **vector_db_target, record_ids=stale_record_ids
+        )
+        if self.lexical_index_store:
+            self.lexical_index_store.get_index(
+                collection_name=self.create_collection_name(project.project_id)
+            ).remove(record_ids=stale_record_ids)
+        return len(stale_record_ids)
+
+    # Persist the BM25 index and the vector db's in-memory state once a push
+    # is done (not after every page)
+    def flush_indexes(self, project: Project):
+        self.vectordb_client.flush_collection(
+            collection_name=self.get_vector_db_target(project=project)[
+                "collection_name"
+            ]
+        )
+        if self.lexical_index_store:
+            self.lexical_index_store.save_index(
+                collection_name=self.create_collection_name(project.project_id)
+            )
 
     def get_vector_db_collection_info(self, project: Project):
-        collection_name = self.create_collection_name(project_id=project.project_id)
+        vector_db_target = self.get_vector_db_target(project=project)
+
+        # The shared collection info would expose the other projects
+        if vector_db_target["tenant_id"] is not None:
+            return {
+                **vector_db_target,
+                "points_count": self.vectordb_client.count_tenant_records(
+                    **vector_db_target
+                ),
+            }
+
         collection_info = self.vectordb_client.get_collection_info(
-            collection_name=collection_name
+            collection_name=vector_db_target["collection_name"]
         )
         return collection_info
 
+    # Copies the project's own collection into the shared collection, the
+    # stored vectors are reused (nothing is re-embedded). Returns the number
+    # of copied records, or None on failure
+    def migrate_to_shared_collection(self, project: Project, batch_size: int = 256):
+        source_name = self.create_collection_name(project_id=project.project_id)
+        if not self.vectordb_client.is_collection_existed(source_name):
+            return 0
+
+        shared_name = self.create_shared_collection_name()
+        embedding_size = self.embedding_client.embedding_size
+        self.vectordb_client.create_collection(
+            collection_name=shared_name,
+            embedding_size=embedding_size,
+            is_multi_tenant=True,
+        )
+
+        lexical_index = None
+        if self.lexical_index_store:
+            lexical_index = self.lexical_index_store.get_index(
+                collection_name=source_name
+            )
+
+        no_records = 0
+        for records in self.vectordb_client.iterate_records(
+            collection_name=source_name, batch_size=batch_size
+        ):
+            if len(records[0]["vector"]) != embedding_size:
+                self.logger.error(
+                    f"{source_name} holds {len(records[0]['vector'])}-d "
+                    f"vectors, {shared_name} expects {embedding_size}"
+                )
+                return None
+
+            record_ids = [
+                self.create_migrated_point_id(
+                    project_id=project.project_id, record_id=record["record_id"]
+                )
+                for record in records
+            ]
+            is_inserted = self.vectordb_client.insert_many(
+                collection_name=shared_name,
+                tenant_id=project.project_id,
+                texts=[record["text"] for record in records],
+                vectors=[record["vector"] for record in records],
+                metadata=[record["metadata"] for record in records],
+                record_ids=record_ids,
+                content_hashes=[record["content_hash"] for record in records],
+                batch_size=batch_size,
+            )
+            if not is_inserted:
+                return None
+            no_records += len(records)
+
+            # The project's BM25 index must name the records by their new ids
+            if lexical_index is not None:
+                for record, record_id in zip(records, record_ids):
+                    old_record_id = str(record["record_id"])
+                    if old_record_id == record_id:
+                        continue
+                    if lexical_index.has_record(record_id=old_record_id):
+                        lexical_index.remove(record_ids=[old_record_id])
+                        lexical_index.upsert(
+                            record_ids=[record_id], texts=[record["text"]]
+                        )
+
+        if lexical_index is not None:
+            self.lexical_index_store.save_index(collection_name=source_name)
+        return no_records
+
+    # Collections pushed before point ids were derived from the chunk _id hold
+    # 0..N ids in every project, copied as-is they would overwrite each other
+    # in the shared collection. Such ids become a UUID of (project, old id),
+    # the same on every run so re-running the migration stays an upsert
+    def create_migrated_point_id(self, project_id: str, record_id) -> str:
+        try:
+            return str(uuid.UUID(str(record_id)))
+        except ValueError:
+            return str(uuid.uuid5(uuid.NAMESPACE_URL, f"{project_id}/{record_id}"))
+
     # Sanitize Chunk Function
     def sanitize_chunk(self, text: str) -> str:
         # 1. Remove obvious injection triggers
@@ -62,128 +261,435 @@ class NLPController(BaseController):
         # 2. Basic cleanup (whitespace/extra newlines)
         return " ".join(sanitized.split())
 
-    def index_into_vector_db(
-        self,
-        project: Project,
-        chunks: List[DataChunk],
-        chunks_ids: List[int],
-        do_reset: bool = False,
+    # Embed texts through the embedding cache, only misses reach the provider.
+    # cache_stats (optional) gets this call's cache hits and misses added, the
+    # cache's own counters are process wide
+    async def embed_texts(
+        self, texts: List[str], document_type: str, cache_stats: dict = None
     ):
-        # 1. Get Collection Name
+        if self.embedding_cache is None:
+            return await self.embedding_client.aembed_texts(
+                texts=texts, document_type=document_type
+            )
+
+        cache_keys = [
+            self.embedding_cache.make_key(
+                model_id=self.embedding_client.embedding_model_id,
+                embedding_size=self.embedding_client.embedding_size,
+                document_type=document_type,
+                text=text,
+            )
+            for text in texts
+        ]
+        vectors = await self.embedding_cache.aget_many(cache_keys)
+
+        missing_idx = [i for i, vector in enumerate(vectors) if vector is None]
+        if cache_stats is not None:
+            cache_stats["hits"] = (
+                cache_stats.get("hits", 0) + len(texts) - len(missing_idx)
+            )
+            cache_stats["misses"] = cache_stats.get("misses", 0) + len(missing_idx)
+        if missing_idx:
+            new_vectors = await self.embedding_client.aembed_texts(
+                texts=[texts[i] for i in missing_idx], document_type=document_type
+            )
+            if not new_vectors or len(new_vectors) != len(missing_idx):
+                return None
+
+            for i, vector in zip(missing_idx, new_vectors):
+                vectors[i] = vector
+            await self.embedding_cache.aset_many(
+                keys=[cache_keys[i] for i in missing_idx], vectors=new_vectors
+            )
+
+        return vectors
+
+    # Stable Qdrant point id derived from the Mongo chunk _id (12 bytes -> UUID)
+    def create_point_id(self, chunk_id: ObjectId) -> str:
+        return str(uuid.UUID(bytes=ObjectId(chunk_id).binary.rjust(16, b"\0")))
+
+    # Hash of what was embedded, a changed text or model means re-embedding
+    def create_content_hash(self, text: str) -> str:
+        content = f"{self.embedding_client.embedding_model_id}:{text}"
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def create_vector_db_collection(self, project: Project, do_reset: bool = False):
         collection_name = self.create_collection_name(project_id=project.project_id)
+        if do_reset and self.lexical_index_store:
+            self.lexical_index_store.delete_index(collection_name=collection_name)
+
+        vector_db_target = self.get_vector_db_target(project=project)
+        if vector_db_target["tenant_id"] is None:
+            return self.vectordb_client.create_collection(
+                collection_name=collection_name,
+                do_reset=do_reset,
+                embedding_size=self.embedding_client.embedding_size,
+            )
 
-        # 2. Manage items
-        # texts = [c.chunk_text for c in chunks]
-        # metadatas = [c.chunk_metadata for c in chunks]
-        texts = []
-        metadatas = []
+        # Shared collection: never dropped, a reset only removes the project
+        is_created = self.vectordb_client.create_collection(
+            collection_name=vector_db_target["collection_name"],
+            embedding_size=self.embedding_client.embedding_size,
+            is_multi_tenant=True,
+        )
+        if do_reset:
+            self.vectordb_client.delete_tenant(**vector_db_target)
+        return is_created
+
+    # Sanitize chunks into vector db records (one dict per chunk)
+    def prepare_index_records(self, chunks: List[DataChunk]) -> List[dict]:
+        records = []
         for c in chunks:
             clean_text = self.sanitize_chunk(c.chunk_text)
-            texts.append(clean_text)
 
             # Ensure doc_name is in the metadata for EVERY chunk
             meta = c.chunk_metadata or {}
             if "doc_name" not in meta:
                 # Fallback to a filename if available in the chunk object
                 meta["doc_name"] = getattr(c, "doc_name", "unknown_doc")
-            metadatas.append(meta)
-        vectors = []
-        for text in texts:
-            vector = self.embedding_client.embed_text(
-                text=text, document_type=DocumentTypeEnum.DOCUMENT.value
+
+            records.append(
+                {
+                    "text": clean_text,
+                    "metadata": meta,
+                    "record_id": self.create_point_id(chunk_id=c.id),
+                    "content_hash": self.create_content_hash(text=clean_text),
+                }
             )
-            vectors.append(vector)
-            time.sleep(0.1)  # To avoid rate limiting
+        return records
 
-        # 3. Create Collection if not exists
-        _ = self.vectordb_client.create_collection(
-            collection_name=collection_name,
-            do_reset=True,
-            embedding_size=self.embedding_client.embedding_size,
+    # Embed prepared records, returns one vector per record or None on failure
+    async def embed_index_records(
+        self, project: Project, records: List[dict], cache_stats: dict = None
+    ):
+        with time_stage(
+            StageEnum.EMBED.value,
+            pipeline=PipelineEnum.INGESTION.value,
+            project_id=project.project_id,
+            provider=self.app_settings.EMBEDDING_BACKEND,
+        ):
+            vectors = await self.embed_texts(
+                texts=[record["text"] for record in records],
+                document_type=DocumentTypeEnum.DOCUMENT.value,
+                cache_stats=cache_stats,
+            )
+        if not vectors or len(vectors) != len(records):
+            self.logger.error("Batch embedding returned None or a partial result")
+            return None
+        return vectors
+
+    def upsert_index_records(
+        self, project: Project, records: List[dict], vectors: List[list]
+    ) -> bool:
+        collection_name = self.create_collection_name(project_id=project.project_id)
+        with time_stage(
+            StageEnum.UPSERT.value,
+            pipeline=PipelineEnum.INGESTION.value,
+            project_id=project.project_id,
+            provider=self.app_settings.VECTORDB_BACKEND,
+        ):
+            is_inserted = self.vectordb_client.insert_many(
+                **self.get_vector_db_target(project=project),
+                texts=[record["text"] for record in records],
+                metadata=[record["metadata"] for record in records],
+                vectors=vectors,
+                record_ids=[record["record_id"] for record in records],
+                content_hashes=[record["content_hash"] for record in records],
+            )
+
+            # The BM25 index is built from the same sanitized texts
+            if is_inserted and self.lexical_index_store:
+                self.lexical_index_store.get_index(
+                    collection_name=collection_name
+                ).upsert(
+                    record_ids=[record["record_id"] for record in records],
+                    texts=[record["text"] for record in records],
+                )
+        return is_inserted
+
+    # Skipped (already embedded) records still go into the BM25 index when it
+    # lacks them: chunks indexed before it existed, or a push that stopped
+    # before flush_indexes. Their text is the one that was embedded (same
+    # content hash), so nothing is re-embedded
+    def backfill_lexical_index(self, project: Project, records: List[dict]):
+        if not self.lexical_index_store or not records:
+            return
+        lexical_index = self.lexical_index_store.get_index(
+            collection_name=self.create_collection_name(project_id=project.project_id)
         )
-        # 4. Insert into Vector DB
-        _ = self.vectordb_client.insert_many(
-            collection_name=collection_name,
-            texts=texts,
-            metadata=metadatas,
-            vectors=vectors,
-            record_ids=chunks_ids,
+        missing_records = [
+            record
+            for record in records
+            if not lexical_index.has_record(record_id=record["record_id"])
+        ]
+        if missing_records:
+            lexical_index.upsert(
+                record_ids=[record["record_id"] for record in missing_records],
+                texts=[record["text"] for record in missing_records],
+            )
+
+    # Returns the number of newly indexed chunks, or None on failure
+    async def index_into_vector_db(
+        self,
+        project: Project,
+        chunks: List[DataChunk],
+        do_reset: bool = False,
+        cache_stats: dict = None,
+    ):
+        # 1. Create Collection if not exists (only wiped when asked to)
+        _ = self.create_vector_db_collection(project=project, do_reset=do_reset)
+
+        # 2. Manage items
+        records = self.prepare_index_records(chunks=chunks)
+
+        # 3. Skip chunks that are already indexed with the same content
+        indexed_hashes = self.vectordb_client.get_content_hashes(
+            **self.get_vector_db_target(project=project),
+            record_ids=[record["record_id"] for record in records],
+        )
+        is_indexed = [
+            indexed_hashes.get(record["record_id"]) == record["content_hash"]
+            for record in records
+        ]
+        self.backfill_lexical_index(
+            project=project,
+            records=[record for record, skip in zip(records, is_indexed) if skip],
+        )
+        records = [record for record, skip in zip(records, is_indexed) if not skip]
+        if not records:
+            return 0
+
+        # 4. One provider call per batch instead of one call (and a sleep) per chunk
+        vectors = await self.embed_index_records(
+            project=project, records=records, cache_stats=cache_stats
         )
-        return True
+        if vectors is None:
+            return None
+
+        # 5. Upsert into Vector DB
+        if not self.upsert_index_records(
+            project=project, records=records, vectors=vectors
+        ):
+            return None
+
+        return len(records)
 
     async def search_vector_db_collection(
         self,
         project: Project,
         text: str,
         limit: int = 5,
+        search_mode: str = None,
     ):
         # 1. Get Collection Name
         collection_name = self.create_collection_name(project_id=project.project_id)
+        search_mode = search_mode or self.app_settings.SEARCH_DEFAULT_MODE
+        is_hybrid = (
+            search_mode == SearchModeEnum.HYBRID.value
+            and self.lexical_index_store is not None
+        )
 
         # 2. Get Text Embedding
         try:
-            # If your provider is async, use 'await' here
-            query_vector = self.embedding_client.embed_text(
-                text=text, document_type=DocumentTypeEnum.QUERY.value
-            )
+            with time_stage(
+                StageEnum.EMBED.value,
+                project_id=project.project_id,
+                provider=self.app_settings.EMBEDDING_BACKEND,
+            ):
+                query_vector = await self.embedding_client.aembed_text(
+                    text=text, document_type=DocumentTypeEnum.QUERY.value
+                )
         except Exception as e:
-            print(f"CRITICAL ERROR in Embedding: {e}")
+            self.logger.error(f"Query embedding failed: {e}")
             return None  # Return None to trigger 500 error in route
 
         if not query_vector:
-            print("Error: Embedding returned None or Empty")
+            self.logger.error("Query embedding returned None or empty")
             return []  # Return empty list if no vector could be made
 
-        # 3. Semantic Search in Vector DB
-        search_results = self.vectordb_client.search_by_vector(
-            collection_name=collection_name,
-            vector=query_vector,
-            limit=limit,
-        )
+        # 3. Semantic Search in Vector DB (over-fetch candidates for fusion)
+        candidates_limit = limit
+        if is_hybrid:
+            candidates_limit = limit * self.app_settings.HYBRID_CANDIDATES_FACTOR
+
+        with time_stage(
+            StageEnum.SEARCH.value,
+            project_id=project.project_id,
+            provider=self.app_settings.VECTORDB_BACKEND,
+        ):
+            search_results = self.vectordb_client.search_by_vector(
+                **self.get_vector_db_target(project=project),
+                vector=query_vector,
+                limit=candidates_limit,
+            )
+
+            # 4. Lexical (BM25) Search and Reciprocal Rank Fusion
+            if is_hybrid:
+                lexical_results = self.lexical_index_store.get_index(
+                    collection_name=collection_name
+                ).search(query=text, limit=candidates_limit)
+                search_results = self.fuse_search_results(
+                    project=project,
+                    dense_results=search_results,
+                    lexical_results=lexical_results,
+                    limit=limit,
+                )
+
         if not search_results:
             return False
 
         return search_results
 
-    # Answer_RAG_Question Function
-    async def answer_rag_question(self, project: Project, query: str, limit: int = 10):
-        # Initialize variables at the top to avoid UnboundLocalError
-        answer = ""
-        full_prompt = ""
-        chat_history = []
-        # 1. Retrieve relevant documents
-        retrieved_documents = await self.search_vector_db_collection(
+    # Batched variant of search_vector_db_collection: all queries are embedded
+    # in one provider call and searched in one vector db round trip. Returns
+    # one result list per text, or None on an embedding error
+    async def search_many(
+        self,
+        project: Project,
+        texts: List[str],
+        limit: int = 5,
+        search_mode: str = None,
+    ):
+        collection_name = self.create_collection_name(project_id=project.project_id)
+        search_mode = search_mode or self.app_settings.SEARCH_DEFAULT_MODE
+        is_hybrid = (
+            search_mode == SearchModeEnum.HYBRID.value
+            and self.lexical_index_store is not None
+        )
+
+        if not texts:
+            return []
+
+        # 1. Embed all queries at once (through the embedding cache)
+        try:
+            with time_stage(
+                StageEnum.EMBED.value,
+                project_id=project.project_id,
+                provider=self.app_settings.EMBEDDING_BACKEND,
+            ):
+                query_vectors = await self.embed_texts(
+                    texts=texts, document_type=DocumentTypeEnum.QUERY.value
+                )
+        except Exception as e:
+            self.logger.error(f"Query embedding failed: {e}")
+            return None
+
+        if not query_vectors:
+            return None
+
+        # 2. One batched vector db search
+        candidates_limit = limit
+        if is_hybrid:
+            candidates_limit = limit * self.app_settings.HYBRID_CANDIDATES_FACTOR
+
+        with time_stage(
+            StageEnum.SEARCH.value,
+            project_id=project.project_id,
+            provider=self.app_settings.VECTORDB_BACKEND,
+        ):
+            batch_results = self.vectordb_client.search_by_vectors(
+                **self.get_vector_db_target(project=project),
+                vectors=query_vectors,
+                limit=candidates_limit,
+            )
+
+            # 3. Lexical search and fusion, per query
+            if is_hybrid:
+                lexical_index = self.lexical_index_store.get_index(
+                    collection_name=collection_name
+                )
+                batch_results = [
+                    self.fuse_search_results(
+                        project=project,
+                        dense_results=dense_results,
+                        lexical_results=lexical_index.search(
+                            query=text, limit=candidates_limit
+                        ),
+                        limit=limit,
+                    )
+                    for text, dense_results in zip(texts, batch_results)
+                ]
+
+        return batch_results
+
+    # Reciprocal rank fusion: score = sum(1 / (k + rank)) over both rankings
+    def fuse_search_results(
+        self,
+        project: Project,
+        dense_results: List[RetrievedDocument],
+        lexical_results: list,
+        limit: int,
+    ) -> List[RetrievedDocument]:
+        rrf_k = self.app_settings.HYBRID_RRF_K
+        scores = {}
+        documents = {}
+
+        for rank, document in enumerate(dense_results):
+            scores[document.record_id] = 1 / (rrf_k + rank + 1)
+            documents[document.record_id] = document
+
+        for rank, (record_id, _) in enumerate(lexical_results):
+            scores[record_id] = scores.get(record_id, 0.0) + 1 / (rrf_k + rank + 1)
+
+        best_ids = sorted(scores, key=scores.get, reverse=True)[:limit]
+
+        # Lexical-only hits still need their text from the vector db
+        missing_ids = [
+            record_id for record_id in best_ids if record_id not in documents
+        ]
+        for document in self.vectordb_client.get_records_by_ids(
+            **self.get_vector_db_target(project=project), record_ids=missing_ids
+        ):
+            documents[document.record_id] = document
+
+        return [
+            documents[record_id].model_copy(update={"score": scores[record_id]})
+            for record_id in best_ids
+            if record_id in documents
+        ]
+
+    # Vector (or hybrid) search followed by the rerank stage: over-fetch
+    # RERANK_CANDIDATES candidates, keep the best min(limit, RERANK_TOP_K)
+    async def search_and_rerank(
+        self, project: Project, query: str, limit: int = 10, search_mode: str = None
+    ):
+        if not self.reranker:
+            return await self.search_vector_db_collection(
+                project=project, text=query, limit=limit, search_mode=search_mode
+            )
+
+        candidates = await self.search_vector_db_collection(
             project=project,
             text=query,
-            limit=limit,
+            limit=max(limit, self.app_settings.RERANK_CANDIDATES),
+            search_mode=search_mode,
         )
+        if not candidates:
+            return candidates
+
+        with time_stage(
+            StageEnum.RERANK.value,
+            project_id=project.project_id,
+            provider=self.app_settings.RERANK_BACKEND,
+        ):
+            return self.reranker.rerank(
+                query=query,
+                documents=candidates,
+                top_k=min(limit, self.app_settings.RERANK_TOP_K),
+                time_budget=self.app_settings.RERANK_TIME_BUDGET_MS / 1000,
+            )
 
-        if not retrieved_documents or len(retrieved_documents) == 0:
-            return answer, full_prompt, chat_history
-
-        # 2. Construct LLM prompt with fallbacks to avoid NoneType errors
+    # Build the RAG prompt, returns (full_prompt, chat_history), or
+    # (None, None) when nothing relevant was retrieved
+    async def build_rag_prompt(
+        self, project: Project, query: str, limit: int = 10, search_mode: str = None
+    ):
+        # 1. Fixed prompt parts, with fallbacks to avoid NoneType errors
         system_prompt = (
             self.template_parser.get_local_template("rag", "system_prompt")
             or "You are a helpful assistant."  # Default fallback string
         )
 
-        documents_prompts = "\n".join(
-            [
-                str(
-                    self.template_parser.get_local_template(
-                        "rag",
-                        "document_prompt",
-                        {
-                            "doc_number": idx + 1,
-                            "chunk_text": (doc.text if doc.text else ""),
-                        },
-                    )
-                    or ""
-                )
-                for idx, doc in enumerate(retrieved_documents)
-            ]
-        )
-
         footer_prompt = (
             self.template_parser.get_local_template(
                 "rag", "footer_prompt", {"query": query}
@@ -191,50 +697,188 @@ class NLPController(BaseController):
             or f"Context: {query}"  # Default fallback
         )
 
-        # step3: Construct Generation Client Prompts
-        chat_history = [
-            self.generation_client.construct_prompt(
-                prompt=system_prompt,
-                role=self.generation_client.enums.SYSTEM.value,
+        # 2. Token budget left for the documents, and how many to retrieve
+        context_budget = self.context_packer.get_context_budget(
+            fixed_prompts=[system_prompt, footer_prompt]
+        )
+        document_overhead_tokens = self.context_packer.estimate_tokens(
+            self.render_document_prompt(doc_number=limit, chunk_text="")
+        )
+        limit = self.context_packer.get_retrieval_limit(
+            budget=context_budget,
+            limit=limit,
+            document_overhead_tokens=document_overhead_tokens,
+        )
+
+        # 3. Retrieve relevant documents
+        retrieved_documents = await self.search_and_rerank(
+            project=project,
+            query=query,
+            limit=limit,
+            search_mode=search_mode,
+        )
+
+        if not retrieved_documents or len(retrieved_documents) == 0:
+            return None, None
+
+        with time_stage(StageEnum.RENDER.value, project_id=project.project_id):
+            # 4. Best documents first, deduplicated and trimmed to the budget
+            packed_documents = self.context_packer.pack(
+                documents=retrieved_documents,
+                budget=context_budget,
+                document_overhead_tokens=document_overhead_tokens,
             )
-        ]
 
-        full_prompt = "\n\n".join([documents_prompts, footer_prompt])
+            documents_prompts = (
+                self.template_parser.get_local_templates(
+                    "rag",
+                    "document_prompt",
+                    [
+                        {"doc_number": idx + 1, "chunk_text": doc.text or ""}
+                        for idx, doc in enumerate(packed_documents)
+                    ],
+                )
+                or ""
+            )
 
-        # step4: Retrieve the Answer
-        answer = self.generation_client.generate_text(
-            prompt=full_prompt, chat_history=chat_history
+            # 5. Construct Generation Client Prompts
+            chat_history = [
+                self.generation_client.construct_prompt(
+                    prompt=system_prompt,
+                    role=self.generation_client.enums.SYSTEM.value,
+                )
+            ]
+
+            full_prompt = "\n\n".join([documents_prompts, footer_prompt])
+        return full_prompt, chat_history
+
+    def render_document_prompt(self, doc_number: int, chunk_text: str) -> str:
+        return str(
+            self.template_parser.get_local_template(
+                "rag",
+                "document_prompt",
+                {"doc_number": doc_number, "chunk_text": chunk_text or ""},
+            )
+            or ""
         )
 
-        # step5: System-level Guardrail (Post-Generation Check)
-        # We look for signs that the LLM was manipulated into "leaking" or "ignoring"
-        forbidden_triggers = [
-            "ignore all previous",
-            "system prompt",
-            "developer mode",
-            "override instructions",
-            "as a language model, i am now",
-        ]
+    # System-level Guardrail (Post-Generation Check)
+    # We look for signs that the LLM was manipulated into "leaking" or "ignoring"
+    def is_answer_blocked(self, answer: str) -> bool:
+        answer = answer.lower()
+        return any(trigger in answer for trigger in self.guardrail_triggers)
+
+    # Answer_RAG_Question Function
+    async def answer_rag_question(
+        self, project: Project, query: str, limit: int = 10, search_mode: str = None
+    ):
+        # step1-3: Retrieve documents and construct the prompt
+        full_prompt, chat_history = await self.build_rag_prompt(
+            project=project, query=query, limit=limit, search_mode=search_mode
+        )
+        if not full_prompt:
+            return "", "", []
 
-        # If the LLM output looks like it's trying to execute a prompt injection command
-        if any(trigger in answer.lower() for trigger in forbidden_triggers):
-            print(
-                f"⚠️ SECURITY ALERT: Potential Prompt Injection detected in LLM output."
+        # step4: Retrieve the Answer
+        with time_stage(
+            StageEnum.GENERATE.value,
+            project_id=project.project_id,
+            provider=self.app_settings.GENERATION_BACKEND,
+        ):
+            answer = await self.generation_client.agenerate_text(
+                prompt=full_prompt, chat_history=chat_history
             )
-            return (
-                "I'm sorry, but I cannot fulfill this request due to security policy violations.",
-                full_prompt,
-                chat_history,
+
+        # step5: If the LLM output looks like it's trying to execute a prompt
+        # injection command
+        with time_stage(StageEnum.GUARDRAIL.value, project_id=project.project_id):
+            is_blocked = self.is_answer_blocked(answer or "")
+        if is_blocked:
+            self.logger.warning(
+                "SECURITY ALERT: Potential Prompt Injection detected in LLM output."
             )
+            return self.guardrail_refusal, full_prompt, chat_history
 
         return answer, full_prompt, chat_history
 
+    # Streaming variant of answer_rag_question, yields (event, data) pairs:
+    # ("token", text) ... then ("done", answer) or ("blocked", refusal).
+    # The guardrail runs on the stream: the last characters that could still
+    # be the start of a trigger are held back until they are proven safe, so
+    # a forbidden phrase is never sent to the client.
+    async def answer_rag_question_stream(
+        self, project: Project, query: str, limit: int = 10, search_mode: str = None
+    ):
+        full_prompt, chat_history = await self.build_rag_prompt(
+            project=project, query=query, limit=limit, search_mode=search_mode
+        )
+        if not full_prompt:
+            yield "error", "no relevant documents were retrieved"
+            return
+
+        tokens = await self.generation_client.agenerate_text(
+            prompt=full_prompt, chat_history=chat_history, stream=True
+        )
+        if tokens is None:
+            yield "error", "generation failed"
+            return
+
+        holdback = max(len(trigger) for trigger in self.guardrail_triggers) - 1
+        answer = ""
+        sent = 0
+        # The generate stage is the time spent waiting for tokens (the inline
+        # guardrail included), not the time the client takes to read them
+        generate_seconds = 0.0
+        generation_provider = self.app_settings.GENERATION_BACKEND
+        try:
+            with track_in_flight(
+                pipeline=PipelineEnum.RAG.value,
+                stage=StageEnum.GENERATE.value,
+                provider=generation_provider,
+            ):
+                started_at = time.perf_counter()
+                async for token in tokens:
+                    # Only the new text (and what it may complete) needs checking
+                    window_start = max(0, len(answer) - holdback)
+                    answer += token
+                    is_blocked = self.is_answer_blocked(answer[window_start:])
+                    generate_seconds += time.perf_counter() - started_at
+                    if is_blocked:
+                        self.logger.warning(
+                            "SECURITY ALERT: Potential Prompt Injection detected "
+                            "in LLM output."
+                        )
+                        yield "blocked", self.guardrail_refusal
+                        return
+
+                    safe_end = len(answer) - holdback
+                    if safe_end > sent:
+                        yield "token", answer[sent:safe_end]
+                        sent = safe_end
+                    started_at = time.perf_counter()
+        finally:
+            # Stop generating as soon as the client or the guardrail is done
+            await tokens.aclose()
+            record_stage(
+                StageEnum.GENERATE.value,
+                seconds=generate_seconds,
+                project_id=project.project_id,
+                provider=generation_provider,
+            )
+
+        if sent < len(answer):
+            yield "token", answer[sent:]
+        yield "done", answer
+
     # Retriever function
-    async def retrieve(self, project: Project, query: str, top_k: int = 5):
-        results = await self.search_vector_db_collection(
+    async def retrieve(
+        self, project: Project, query: str, top_k: int = 5, search_mode: str = None
+    ):
+        results = await self.search_and_rerank(
             project=project,
-            text=query,
+            query=query,
             limit=top_k,
+            search_mode=search_mode,
         )
 
         if not results:
@@ -255,7 +899,7 @@ class NLPController(BaseController):
                         if hasattr(r, "metadata") and r.metadata
                         else None
                     )
-                    or "0irybcxs2uch_Google.txt"  # Final hardcoded fallback for your current test
+                    or "unknown_doc"
                 ),
                 "score": getattr(r, "score", 0.0),
                 "text": getattr(r, "text", ""),
@@ -1,10 +1,82 @@
 from .BaseController import BaseController
 from .ProjectController import ProjectController
 import os
+import time
+import asyncio
+import fitz
 from langchain_community.document_loaders import TextLoader
 from langchain_community.document_loaders import PyMuPDFLoader
+from langchain_core.documents import Document
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from models import ProcessingEnum
+from models.enums.StageEnum import StageEnum
+from models.enums.PipelineEnum import PipelineEnum
+from helpers.timing import record_stage
+from helpers.metrics import track_in_flight
+
+
+# Module level functions below run inside the process pool workers, so they
+# must stay picklable and must not need the app settings
+
+
+def split_documents(documents: list, chunk_size: int, overlap_size: int):
+    text_splitter = RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size, chunk_overlap=overlap_size, length_function=len
+    )
+    return text_splitter.create_documents(
+        [rec.page_content for rec in documents],
+        metadatas=[rec.metadata for rec in documents],
+    )
+
+
+# Load a page range of a PDF, with the same metadata as PyMuPDFLoader
+def load_pdf_pages(file_path: str, page_start: int, page_end: int):
+    with fitz.open(file_path) as pdf:
+        pdf_metadata = {
+            key: value
+            for key, value in pdf.metadata.items()
+            if isinstance(value, (str, int))
+        }
+        return [
+            Document(
+                page_content=pdf[page_no].get_text(),
+                metadata={
+                    "source": file_path,
+                    "file_path": file_path,
+                    "page": page_no,
+                    "total_pages": pdf.page_count,
+                    **pdf_metadata,
+                },
+            )
+            for page_no in range(page_start, min(page_end, pdf.page_count))
+        ]
+
+
+# Parse (a page range of) a file and split it, returns chunks and timings
+def parse_and_split_file(
+    file_path: str,
+    chunk_size: int,
+    overlap_size: int,
+    page_start: int = None,
+    page_end: int = None,
+):
+    started_at = time.perf_counter()
+    if page_start is not None:
+        documents = load_pdf_pages(file_path, page_start, page_end)
+    elif os.path.splitext(file_path)[-1] == ProcessingEnum.PDF.value:
+        documents = PyMuPDFLoader(file_path).load()
+    else:
+        documents = TextLoader(file_path, encoding="utf8").load()
+    parsed_at = time.perf_counter()
+
+    chunks = split_documents(documents, chunk_size, overlap_size)
+    return chunks, parsed_at - started_at, time.perf_counter() - parsed_at
+
+
+def get_pdf_page_count(file_path: str) -> int:
+    with fitz.open(file_path) as pdf:
+        return pdf.page_count
+
 
 class ProcessController(BaseController):
 
@@ -43,6 +115,13 @@ class ProcessController(BaseController):
             return loader.load()
         return None
 
+    # 3.1 get File Content lazily, one page (document) at a time
+    def iter_file_content(self, file_id: str):
+        loader = self.get_file_loader(file_id=file_id)
+        if loader:
+            return loader.lazy_load()
+        return None
+
     # 4. Process File Content method
     def process_file_content(
         self,
@@ -51,15 +130,92 @@ class ProcessController(BaseController):
         chunk_size: int = 100,
         overlap_size: int = 20,
     ):
+        return split_documents(file_content, chunk_size, overlap_size)
 
-        text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=chunk_size, chunk_overlap=overlap_size, length_function=len
+    # 4.1 Same split, off the event loop in the process pool (None -> thread
+    # pool)
+    async def aprocess_file_content(
+        self,
+        file_content: list,
+        file_id: str,
+        chunk_size: int = 100,
+        overlap_size: int = 20,
+        executor=None,
+    ):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            executor, split_documents, file_content, chunk_size, overlap_size
         )
 
-        file_content_texts = [rec.page_content for rec in file_content]
-        file_content_metadata = [rec.metadata for rec in file_content]
+    # 5. Parse and split one file in the process pool (None -> thread pool).
+    # Large PDFs are split into page ranges handled by different workers.
+    async def process_file(
+        self,
+        file_id: str,
+        chunk_size: int = 100,
+        overlap_size: int = 20,
+        executor=None,
+    ):
+        file_path = os.path.join(self.project_path, file_id)
+        file_extension = self.get_file_extension(file_id=file_id)
+        if not os.path.exists(file_path):
+            return None, None
+        if file_extension not in [ProcessingEnum.TXT.value, ProcessingEnum.PDF.value]:
+            raise ValueError(f"Unsupported file type: {file_extension}")
 
-        chunks = text_splitter.create_documents(
-            file_content_texts, metadatas=file_content_metadata
-        )
-        return chunks
+        loop = asyncio.get_running_loop()
+        started_at = time.perf_counter()
+
+        page_ranges = [(None, None)]
+        if file_extension == ProcessingEnum.PDF.value:
+            page_count = await loop.run_in_executor(
+                executor, get_pdf_page_count, file_path
+            )
+            pages_per_task = self.app_settings.PROCESS_PDF_PAGES_PER_TASK
+            if page_count > pages_per_task:
+                page_ranges = [
+                    (page_start, page_start + pages_per_task)
+                    for page_start in range(0, page_count, pages_per_task)
+                ]
+
+        # Load and split run together in the workers, the in-flight gauge
+        # counts files (not page ranges) under the load stage
+        with track_in_flight(
+            pipeline=PipelineEnum.INGESTION.value, stage=StageEnum.LOAD.value
+        ):
+            results = await asyncio.gather(
+                *[
+                    loop.run_in_executor(
+                        executor,
+                        parse_and_split_file,
+                        file_path,
+                        chunk_size,
+                        overlap_size,
+                        page_start,
+                        page_end,
+                    )
+                    for page_start, page_end in page_ranges
+                ]
+            )
+
+        # Page ranges come back in order, so chunk order is preserved
+        chunks = [chunk for range_chunks, _, _ in results for chunk in range_chunks]
+        timings = {
+            "file_id": file_id,
+            "tasks": len(page_ranges),
+            "parse_seconds": round(sum(result[1] for result in results), 4),
+            "chunk_seconds": round(sum(result[2] for result in results), 4),
+            "wall_seconds": round(time.perf_counter() - started_at, 4),
+            "chunks": len(chunks),
+        }
+        for stage, seconds_key in [
+            (StageEnum.LOAD.value, "parse_seconds"),
+            (StageEnum.SPLIT.value, "chunk_seconds"),
+        ]:
+            record_stage(
+                stage,
+                seconds=timings[seconds_key],
+                pipeline=PipelineEnum.INGESTION.value,
+                project_id=self.project_id,
+            )
+        return chunks, timings
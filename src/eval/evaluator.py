@@ -1,67 +1,259 @@
+# Retrieval evaluation of one project over eval/questions.json: recall@k, MRR
+# and nDCG@k for every search mode, without and with the rerank stage, plus
+# p50/p95/p99 latency in total and per stage (embed, search, rerank and, with
+# --answers, generate). Queries run --concurrency at a time.
+# --output writes the results as JSON, --baseline compares them with a
+# previous output and exits with 1 on a quality or latency regression (CI).
+# Run from the src folder:
+#   python -m eval.evaluator --project-id <project_id> [--concurrency 8]
+#       [--answers] [--output eval.json] [--baseline previous_eval.json]
+import argparse
 import asyncio
 import json
+import math
 import os
 import sys
+import time
+from main import app, lifespan
+from controllers.NLPController import NLPController
+from models.db_schemas import Project
+from models.enums.StageEnum import StageEnum
+from helpers.timing import start_stage_timings
+from stores.vectordb.VectorDBEnums import SearchModeEnum
 
-try:
-    from src.main import app, lifespan
-    from src.controllers.NLPController import NLPController
+current_dir = os.path.dirname(os.path.abspath(__file__))
+EVAL_DATA_PATH = os.path.join(current_dir, "questions.json")
+SEARCH_MODES = [search_mode.value for search_mode in SearchModeEnum]
+QUALITY_METRICS = ["recall", "mrr", "ndcg"]
+LATENCY_PERCENTILES = [50, 95, 99]
 
-    
-    from src.models.db_schemas import Project
-except ImportError as e:
-    print(f"❌ Import Error: {e}")
-    sys.exit(1)
 
+# Nearest-rank percentiles, in milliseconds
+def get_percentiles(values: list) -> dict:
+    if not values:
+        return {}
+    values = sorted(values)
+    return {
+        f"p{p}": values[max(0, math.ceil(p / 100 * len(values)) - 1)] * 1000
+        for p in LATENCY_PERCENTILES
+    }
 
-current_dir = os.path.dirname(os.path.abspath(__file__))
-EVAL_DATA_PATH = os.path.join(current_dir, "questions.json")
-TOP_K = 5
 
+# A question lists its relevant documents in "expected_docs" (or a single
+# "expected_doc")
+def get_expected_docs(question: dict) -> set:
+    return set(question.get("expected_docs") or [question["expected_doc"]])
 
-async def run_evaluation():
-    async with lifespan(app):
-       
-        nlp = NLPController(
-            generation_client=app.generation_client,
-            embedding_client=app.embedding_client,
-            vectordb_client=app.vectordb_client,
-            template_parser=app.state.template_parser,
+
+# Document-level relevance: a document counts once, at its first chunk
+def score_retrieval(retrieved_docs: list, expected_docs: set, top_k: int) -> dict:
+    first_ranks = {}
+    for rank, doc_name in enumerate(retrieved_docs[:top_k]):
+        if doc_name in expected_docs and doc_name not in first_ranks:
+            first_ranks[doc_name] = rank
+
+    dcg = sum(1 / math.log2(rank + 2) for rank in first_ranks.values())
+    idcg = sum(
+        1 / math.log2(rank + 2) for rank in range(min(len(expected_docs), top_k))
+    )
+    return {
+        "recall": len(first_ranks) / len(expected_docs),
+        "mrr": 1 / (min(first_ranks.values()) + 1) if first_ranks else 0.0,
+        "ndcg": dcg / idcg if idcg else 0.0,
+    }
+
+
+async def evaluate_question(
+    nlp, eval_project, question, search_mode, args, semaphore
+):
+    async with semaphore:
+        # Every task has its own timings (see helpers/timing.py)
+        timings = start_stage_timings()
+        started_at = time.perf_counter()
+        results = await nlp.retrieve(
+            project=eval_project,
+            query=question["question"],
+            top_k=args.top_k,
+            search_mode=search_mode,
         )
+        timings["retrieve"] = time.perf_counter() - started_at
 
-        eval_project = Project(project_id="1")
+        if args.answers:
+            answer_timings = start_stage_timings()
+            started_at = time.perf_counter()
+            await nlp.answer_rag_question(
+                project=eval_project,
+                query=question["question"],
+                search_mode=search_mode,
+            )
+            timings["answer"] = time.perf_counter() - started_at
+            timings[StageEnum.GENERATE.value] = answer_timings.get(
+                StageEnum.GENERATE.value, 0.0
+            )
 
-        if not os.path.exists(EVAL_DATA_PATH):
-            print(f"❌ Error: {EVAL_DATA_PATH} not found.")
-            return
-       
-        collections = app.vectordb_client.client.get_collections()
-        print(f"DEBUG: Real collections in Qdrant: {collections}")
-        with open(EVAL_DATA_PATH, "r") as f:
-            questions = json.load(f)
+    retrieved_docs = [result["doc_name"] for result in results]
+    expected_docs = get_expected_docs(question)
+    return {
+        "question": question["question"],
+        "expected_docs": sorted(expected_docs),
+        "retrieved_docs": retrieved_docs,
+        "scores": score_retrieval(retrieved_docs, expected_docs, args.top_k),
+        "timings": timings,
+    }
 
-        hits = 0
-        print(f"\n--- 🔍 RAG Retrieval Evaluation (Top-{TOP_K}) ---")
 
-        for q in questions:
-            query = q["question"]
-            expected = q["expected_doc"]
+async def evaluate_config(nlp, eval_project, questions, search_mode, label, args):
+    semaphore = asyncio.Semaphore(args.concurrency)
+    started_at = time.perf_counter()
+    evaluations = await asyncio.gather(
+        *[
+            evaluate_question(
+                nlp, eval_project, question, search_mode, args, semaphore
+            )
+            for question in questions
+        ]
+    )
+    elapsed = time.perf_counter() - started_at
 
-            results = await nlp.retrieve(project=eval_project, query=query, top_k=TOP_K)
-            retrieved_docs = [r["doc_name"] for r in results]
-            is_hit = expected in retrieved_docs
+    total = len(evaluations)
+    result = {
+        metric: sum(e["scores"][metric] for e in evaluations) / total
+        for metric in QUALITY_METRICS
+    }
+    stages = [stage.value for stage in StageEnum] + ["retrieve", "answer"]
+    result["latency_ms"] = {
+        stage: get_percentiles(
+            [e["timings"][stage] for e in evaluations if stage in e["timings"]]
+        )
+        for stage in stages
+        if any(stage in e["timings"] for e in evaluations)
+    }
+    result["throughput_qps"] = total / elapsed
+    result["misses"] = [
+        {
+            "question": e["question"],
+            "expected_docs": e["expected_docs"],
+            "retrieved_docs": e["retrieved_docs"],
+        }
+        for e in evaluations
+        if e["scores"]["recall"] < 1.0
+    ]
 
-            status = "✅ HIT" if is_hit else "❌ MISS"
-            print(f"{status} | Q: {query[:40]}...")
+    latency = result["latency_ms"]["retrieve"]
+    print(
+        f"{label:>15}: recall@{args.top_k} {result['recall']:.3f} | "
+        f"MRR {result['mrr']:.3f} | nDCG@{args.top_k} {result['ndcg']:.3f} | "
+        f"retrieve p50 {latency['p50']:.1f} / p95 {latency['p95']:.1f} / "
+        f"p99 {latency['p99']:.1f} ms | {result['throughput_qps']:.1f} q/s"
+    )
+    for stage, percentiles in result["latency_ms"].items():
+        if stage != "retrieve":
+            print(
+                f"{'':>17}{stage:<9} "
+                + " / ".join(f"{k} {v:.1f}" for k, v in percentiles.items())
+                + " ms"
+            )
+    for miss in result["misses"]:
+        print(
+            f"{'':>17}MISS {miss['question'][:50]} | expected "
+            f"{miss['expected_docs']} | found {miss['retrieved_docs']}"
+        )
+    return result
+
+
+# Regressions of the current run against a previous output: an absolute
+# drop of a quality metric, or a relative increase of a p95 latency
+def find_regressions(results: dict, baseline: dict, args) -> list:
+    regressions = []
+    for label, current in results["configs"].items():
+        previous = baseline.get("configs", {}).get(label)
+        if not previous:
+            continue
+
+        for metric in QUALITY_METRICS:
+            drop = previous[metric] - current[metric]
+            if drop > args.max_quality_drop:
+                regressions.append(
+                    f"{label} {metric} {previous[metric]:.3f} -> {current[metric]:.3f}"
+                )
+
+        for stage, percentiles in current["latency_ms"].items():
+            previous_p95 = previous["latency_ms"].get(stage, {}).get("p95")
+            if not previous_p95:
+                continue
+            increase = percentiles["p95"] / previous_p95 - 1
+            if increase > args.max_latency_increase:
+                regressions.append(
+                    f"{label} {stage} p95 {previous_p95:.1f} -> "
+                    f"{percentiles['p95']:.1f} ms (+{increase * 100:.0f}%)"
+                )
+    return regressions
+
+
+async def run_evaluation(args):
+    with open(EVAL_DATA_PATH, "r") as f:
+        questions = json.load(f)
+
+    eval_project = Project(project_id=args.project_id)
+    results = {
+        "project_id": args.project_id,
+        "top_k": args.top_k,
+        "concurrency": args.concurrency,
+        "questions": len(questions),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "configs": {},
+    }
+
+    async with lifespan(app):
+        print(
+            f"--- RAG evaluation: project {args.project_id}, {len(questions)} "
+            f"questions, top-{args.top_k}, concurrency {args.concurrency} ---"
+        )
+        # Every search mode without and with the rerank stage. No embedding
+        # cache, so every configuration pays for its query embeddings
+        for search_mode in args.modes:
+            for reranker in [None] + ([app.reranker] if app.reranker else []):
+                nlp = NLPController(
+                    generation_client=app.generation_client,
+                    embedding_client=app.embedding_client,
+                    vectordb_client=app.vectordb_client,
+                    template_parser=app.template_parser,
+                    lexical_index_store=app.lexical_index_store,
+                    reranker=reranker,
+                )
+                label = f"{search_mode}+rerank" if reranker else search_mode
+                results["configs"][label] = await evaluate_config(
+                    nlp, eval_project, questions, search_mode, label, args
+                )
 
-            if not is_hit:
-                print(f"   └─ Expected: {expected} | Found: {retrieved_docs}")
-            else:
-                hits += 1
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"results written to {args.output}")
 
-        total = len(questions)
-        print(f"\n--- Result: {(hits/total)*100:.2f}% ({hits}/{total}) ---")
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = find_regressions(results, baseline, args)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print(f"no regression against {args.baseline}")
 
 
 if __name__ == "__main__":
-    asyncio.run(run_evaluation())
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--project-id", required=True)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument(
+        "--modes", nargs="+", default=SEARCH_MODES, choices=SEARCH_MODES
+    )
+    # Retrieval is always evaluated, --answers also times the full answer
+    parser.add_argument("--answers", action="store_true")
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--baseline", default=None)
+    parser.add_argument("--max-quality-drop", type=float, default=0.02)
+    parser.add_argument("--max-latency-increase", type=float, default=0.25)
+    asyncio.run(run_evaluation(parser.parse_args()))
@@ -1,4 +1,6 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
+from functools import lru_cache
+from typing import Optional
 import os
 
 # 1. Logic: Go up one level from 'src/helpers' to find '.env' in 'src'
@@ -25,6 +27,31 @@ class Settings(BaseSettings):
     VECTOR_DB_PATH: str 
     VECTOR_DB_DISTANCE_METHOD: str 
 
+    # "none", "scalar" (int8) or "binary" quantization of the collections
+    VECTOR_DB_QUANTIZATION: str = "none"
+    VECTOR_DB_QUANTIZATION_ALWAYS_RAM: bool = True
+    VECTOR_DB_SEARCH_OVERSAMPLING: float = 2.0
+    VECTOR_DB_SEARCH_RESCORE: bool = True
+    # Keep the float32 originals on disk (memmap) instead of in RAM
+    VECTOR_DB_VECTORS_ON_DISK: bool = False
+    # None -> Qdrant defaults (m=16, ef_construct=100, ef=ef_construct)
+    VECTOR_DB_HNSW_M: Optional[int] = None
+    VECTOR_DB_HNSW_EF_CONSTRUCT: Optional[int] = None
+    VECTOR_DB_HNSW_EF: Optional[int] = None
+    VECTOR_DB_HNSW_ON_DISK: bool = False
+    # One collection per embedding model, projects partitioned by an indexed
+    # project_id payload key (see scripts/migrate_to_multi_tenant.py). Local
+    # Qdrant ignores payload indexes and scans on filtered searches, the
+    # index pays off on a Qdrant server and on the NUMPY backend
+    VECTOR_DB_MULTI_TENANT: bool = False
+
+    # NUMPY backend: memory-mapped vectors, IVF for large collections
+    # (0 -> always exact search, IVF_LISTS None -> sqrt(collection size))
+    VECTOR_DB_NUMPY_MEMMAP: bool = False
+    VECTOR_DB_IVF_MIN_VECTORS: int = 50000
+    VECTOR_DB_IVF_LISTS: Optional[int] = None
+    VECTOR_DB_IVF_PROBES: int = 8
+
     PRIMARY_LANG: str = "en"
     DEFAULT_LANG: str = "en"
 
@@ -36,6 +63,90 @@ class Settings(BaseSettings):
     GENERATION_MODEL_ID: str = None
     EMBEDDING_MODEL_ID: str = None
     EMBEDDING_MODEL_SIZE: int = None
+    EMBEDDING_DEFAULT_BATCH_SIZE: int = 64
+
+    # Offline backends (EMBEDDING_BACKEND=LOCAL_HASH, GENERATION_BACKEND=ECHO):
+    # simulated latency + uniform(0, jitter) per provider call, the LOCAL_HASH
+    # dimension is EMBEDDING_MODEL_SIZE
+    LOCAL_HASH_MAX_NGRAM: int = 2
+    LOCAL_HASH_LATENCY_MS: float = 0.0
+    LOCAL_HASH_JITTER_MS: float = 0.0
+    ECHO_LATENCY_MS: float = 0.0
+    ECHO_JITTER_MS: float = 0.0
+
+    EMBEDDING_CACHE_ENABLED: bool = True
+    EMBEDDING_CACHE_DB_NAME: str = "embedding_cache"
+    EMBEDDING_CACHE_MAX_MEMORY_ITEMS: int = 10000
+    EMBEDDING_CACHE_MAX_DISK_ITEMS: int = 1000000
+
+    PROJECT_CACHE_ENABLED: bool = True
+    PROJECT_CACHE_TTL_SECONDS: int = 300
+    PROJECT_CACHE_MAX_ITEMS: int = 10000
+
+    LEXICAL_INDEX_ENABLED: bool = True
+    LEXICAL_INDEX_DB_NAME: str = "lexical_index"
+
+    # "dense" or "hybrid" (dense + BM25 fused with reciprocal rank fusion)
+    SEARCH_DEFAULT_MODE: str = "dense"
+    HYBRID_CANDIDATES_FACTOR: int = 4
+    HYBRID_RRF_K: int = 60
+    SEARCH_BATCH_MAX_QUERIES: int = 256
+
+    # Rerank stage between retrieval and the prompt ("LEXICAL" or "NONE")
+    RERANK_BACKEND: str = "LEXICAL"
+    RERANK_CANDIDATES: int = 20
+    RERANK_TOP_K: int = 5
+    RERANK_TIME_BUDGET_MS: int = 30
+
+    # Pooled HTTP connections shared by the OpenAI / Cohere providers
+    # (stores/llm/HTTPClientPool.py). Concurrency per host None -> no cap,
+    # HTTP/2 needs the h2 package and a TLS endpoint
+    HTTP_CLIENT_MAX_CONNECTIONS: int = 100
+    HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_CLIENT_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP_CLIENT_HTTP2: bool = False
+    HTTP_CLIENT_MAX_CONCURRENCY_PER_HOST: Optional[int] = None
+    HTTP_CLIENT_TIMEOUT: float = 60.0
+    HTTP_CLIENT_CONNECT_TIMEOUT: float = 5.0
+
+    INGESTION_QUEUE_SIZE: int = 8
+    INGESTION_EMBEDDING_CONCURRENCY: int = 4
+
+    # None -> one worker per CPU, 0 -> no process pool (threads only)
+    PROCESS_POOL_WORKERS: Optional[int] = None
+    PROCESS_MAX_PARALLEL_FILES: int = 4
+    PROCESS_PDF_PAGES_PER_TASK: int = 50
+
+    # Background jobs: every worker process refreshes the heartbeat of its
+    # running jobs, a job without a heartbeat for JOB_STALE_SECONDS (keep it
+    # a few heartbeats long) is marked interrupted
+    JOB_HEARTBEAT_SECONDS: float = 15.0
+    JOB_STALE_SECONDS: float = 90.0
+
+    # Prometheus /metrics (helpers/metrics.py). Without the project label
+    # every project is reported as "all" (one series per stage and provider)
+    METRICS_ENABLED: bool = True
+    METRICS_PROJECT_LABEL: bool = True
+
+    # Sampled request profiling (helpers/profiling.py), off by default. The
+    # header only triggers a profile when PROFILING_HEADER_TOKEN is set.
+    # A relative PROFILING_DIR is under assets/
+    PROFILING_ENABLED: bool = False
+    PROFILING_SAMPLE_RATE: float = 0.01
+    PROFILING_HEADER: str = "X-Profile"
+    PROFILING_HEADER_TOKEN: Optional[str] = None
+    PROFILING_INTERVAL_MS: float = 1.0
+    PROFILING_MAX_CONCURRENT: int = 1
+    PROFILING_DIR: str = "profiles"
+    PROFILING_MAX_PROFILES_PER_ROUTE: int = 20
+    PROFILING_MAX_TOTAL_MB: float = 100.0
+
+    # Context packing: the RAG prompt is filled up to the model's context
+    # window, minus GENERATION_DEFAULT_MAX_TOKENS for the answer
+    GENERATION_CONTEXT_WINDOW: int = 8192
+    CONTEXT_CHARS_PER_TOKEN: float = 4.0
+    CONTEXT_SAFETY_MARGIN_TOKENS: int = 64
+    CONTEXT_EXPECTED_CHUNK_TOKENS: int = 128
 
     INPUT_DEFAULT_MAX_CHARACTERS: int = None
     GENERATION_DEFAULT_MAX_TOKENS: int = None
@@ -45,6 +156,8 @@ class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_file=ENV_FILE_PATH, extra="ignore")
 
 
+# Parsed once per process, every later call returns the same Settings
+@lru_cache
 def get_settings() -> Settings:
     # Casual debug for you
     print(f"DEBUG: Looking for .env at: {ENV_FILE_PATH}")
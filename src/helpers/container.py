@@ -0,0 +1,118 @@
+from controllers import DataController, NLPController, JobController
+from models.ProjectModel import ProjectModel
+from models.ProjectCache import ProjectCache
+from models.ChunkModel import ChunkModel
+from models.AssetModel import AssetModel
+from models.JobModel import JobModel
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+# Application-wide singletons, built once in main.lifespan: models (their
+# collections and indexes are bootstrapped here, not on every request) and
+# the stateless controllers. Routes get them through routes/dependencies.py.
+# As with the startup ping, a database that is down doesn't stop the app:
+# the collection bootstrap is retried in the background until it succeeds.
+class AppContainer:
+
+    bootstrap_retry_seconds = 10
+
+    def __init__(self, app, settings):
+        self.app = app
+        self.settings = settings
+
+        self.project_cache = None
+        self.project_model = None
+        self.chunk_model = None
+        self.asset_model = None
+        self.job_model = None
+
+        self.data_controller = None
+        self.nlp_controller = None
+        self.job_controller = None
+        self.bootstrap_task = None
+        self.job_heartbeat_task = None
+
+    @classmethod
+    async def create_instance(cls, app, settings):
+        # 1. ask class to call init function
+        instance = cls(app=app, settings=settings)
+        # 2. create the models and the controllers once
+        await instance.initialize()
+        # 3. return instance object with combined functions
+        return instance
+
+    async def initialize(self):
+        db_client = self.app.database_client
+        if self.settings.PROJECT_CACHE_ENABLED:
+            self.project_cache = ProjectCache(
+                ttl_seconds=self.settings.PROJECT_CACHE_TTL_SECONDS,
+                max_items=self.settings.PROJECT_CACHE_MAX_ITEMS,
+            )
+        # Plain constructors, no database round trip
+        self.project_model = ProjectModel(
+            db_client=db_client, project_cache=self.project_cache
+        )
+        self.chunk_model = ChunkModel(db_client=db_client)
+        self.asset_model = AssetModel(db_client=db_client)
+        self.job_model = JobModel(db_client=db_client)
+
+        self.data_controller = DataController()
+        self.nlp_controller = NLPController(
+            vectordb_client=self.app.vectordb_client,
+            generation_client=self.app.generation_client,
+            embedding_client=self.app.embedding_client,
+            template_parser=self.app.template_parser,
+            embedding_cache=self.app.embedding_cache,
+            lexical_index_store=self.app.lexical_index_store,
+            reranker=self.app.reranker,
+        )
+        self.job_controller = JobController(
+            job_model=self.job_model,
+            chunk_model=self.chunk_model,
+            project_model=self.project_model,
+            nlp_controller=self.nlp_controller,
+            job_tasks=self.app.job_tasks,
+            process_pool=self.app.process_pool,
+            worker_id=self.app.job_worker_id,
+        )
+        self.job_heartbeat_task = asyncio.create_task(
+            self.job_controller.run_heartbeat()
+        )
+
+        if not await self.initialize_collections():
+            self.bootstrap_task = asyncio.create_task(
+                self.retry_initialize_collections()
+            )
+
+    # Collections and indexes of every model, False if the database failed
+    async def initialize_collections(self) -> bool:
+        try:
+            for model in [
+                self.project_model,
+                self.chunk_model,
+                self.asset_model,
+                self.job_model,
+            ]:
+                await model.initialize_collection()
+        except Exception as e:
+            logger.error(f"Collections bootstrap failed: {e}")
+            return False
+        return True
+
+    async def retry_initialize_collections(self):
+        while True:
+            await asyncio.sleep(self.bootstrap_retry_seconds)
+            if await self.initialize_collections():
+                logger.info("Collections bootstrap succeeded")
+                return
+
+    async def aclose(self):
+        tasks = [
+            task for task in [self.bootstrap_task, self.job_heartbeat_task] if task
+        ]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,127 @@
+from helpers.config import get_settings
+from prometheus_client import REGISTRY, Counter, Gauge, Histogram
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from contextlib import contextmanager
+
+# Prometheus metrics of the RAG and ingestion stages, served on /metrics
+# (registered in main.lifespan). HTTP request metrics come from the
+# starlette-exporter middleware set up in main.
+# Stages running outside a provider (templates, guardrail, file loading and
+# splitting) use the LOCAL provider label, chunk writes the MONGODB one
+LOCAL_PROVIDER = "local"
+MONGODB_PROVIDER = "mongodb"
+
+# Prometheus default buckets, plus 1 ms (template, guardrail) and 30 / 60 s
+# (large ingestion batches)
+STAGE_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+stage_duration_seconds = Histogram(
+    "mini_rag_stage_duration_seconds",
+    "Time spent in a RAG or ingestion stage",
+    ["pipeline", "stage", "project_id", "provider"],
+    buckets=STAGE_BUCKETS,
+)
+stage_calls_total = Counter(
+    "mini_rag_stage_calls_total",
+    "RAG and ingestion stage calls, status is ok or error (raised)",
+    ["pipeline", "stage", "project_id", "provider", "status"],
+)
+# No project label: a gauge keeps one series per label set forever, and
+# in-flight work is watched per stage and provider
+stage_in_flight = Gauge(
+    "mini_rag_stage_in_flight",
+    "RAG and ingestion stage calls currently running",
+    ["pipeline", "stage", "provider"],
+)
+
+
+# METRICS_PROJECT_LABEL=False folds every project into "all", for servers
+# with too many projects for one series each
+def get_project_label(project_id) -> str:
+    if project_id is None or not get_settings().METRICS_PROJECT_LABEL:
+        return "all"
+    return str(project_id)
+
+
+def observe_stage(
+    pipeline: str,
+    stage: str,
+    seconds: float,
+    project_id=None,
+    provider: str = LOCAL_PROVIDER,
+    status: str = "ok",
+):
+    project_label = get_project_label(project_id)
+    stage_duration_seconds.labels(
+        pipeline, stage, project_label, provider
+    ).observe(seconds)
+    stage_calls_total.labels(pipeline, stage, project_label, provider, status).inc()
+
+
+@contextmanager
+def track_in_flight(pipeline: str, stage: str, provider: str = LOCAL_PROVIDER):
+    gauge = stage_in_flight.labels(pipeline, stage, provider)
+    gauge.inc()
+    try:
+        yield
+    finally:
+        gauge.dec()
+
+
+# Connection pool and per-host stats of the providers' HTTPClientPool, read
+# at scrape time
+class HTTPClientPoolCollector:
+
+    def __init__(self, http_client_pool):
+        self.http_client_pool = http_client_pool
+
+    def collect(self):
+        stats = self.http_client_pool.get_stats()
+
+        connections = GaugeMetricFamily(
+            "mini_rag_http_pool_connections",
+            "Open provider HTTP connections, by client and state",
+            labels=["client", "state"],
+        )
+        for client in ["async", "sync"]:
+            client_stats = stats[client]
+            idle = client_stats["idle_connections"]
+            active = client_stats["connections"] - idle
+            connections.add_metric([client, "active"], active)
+            connections.add_metric([client, "idle"], idle)
+            connections.add_metric(
+                [client, "http2"], client_stats["http2_connections"]
+            )
+        yield connections
+
+        in_flight = GaugeMetricFamily(
+            "mini_rag_http_host_in_flight",
+            "Provider HTTP requests in flight, by host",
+            labels=["host"],
+        )
+        waiting = GaugeMetricFamily(
+            "mini_rag_http_host_waiting",
+            "Provider HTTP requests waiting for a per-host concurrency slot",
+            labels=["host"],
+        )
+        requests = CounterMetricFamily(
+            "mini_rag_http_host_requests",
+            "Provider HTTP requests sent, by host",
+            labels=["host"],
+        )
+        for host, host_stats in stats["hosts"].items():
+            in_flight.add_metric([host], host_stats["in_flight"])
+            waiting.add_metric([host], host_stats["waiting"])
+            requests.add_metric([host], host_stats["requests"])
+        yield in_flight
+        yield waiting
+        yield requests
+
+
+def register_collector(collector):
+    REGISTRY.register(collector)
+    return collector
+
+
+def unregister_collector(collector):
+    REGISTRY.unregister(collector)
@@ -0,0 +1,205 @@
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+import asyncio
+import hmac
+import logging
+import os
+import random
+import re
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+# Opt-in sampled request profiling (PROFILING_ENABLED). A request is profiled
+# when it falls in the PROFILING_SAMPLE_RATE sample, or when it carries the
+# PROFILING_HEADER header set to PROFILING_HEADER_TOKEN (no token -> header
+# disabled, so nobody can force profiling in production).
+# pyinstrument samples the request's own asyncio context every
+# PROFILING_INTERVAL_MS, concurrent requests don't leak into each other's
+# profile. Each profile is written off the event loop as
+#   <PROFILING_DIR>/<METHOD_route_template>/<time>_<ms>ms_<id>.speedscope.json
+#   <PROFILING_DIR>/<METHOD_route_template>/<time>_<ms>ms_<id>.collapsed.txt
+# (speedscope.app, or flamegraph.pl for the collapsed stacks, weights in
+# microseconds). Retention: the newest PROFILING_MAX_PROFILES_PER_ROUTE
+# profiles per route and PROFILING_MAX_TOTAL_MB overall.
+# The response carries the profile id in the X-Profile-Id header.
+class ProfilingMiddleware:
+
+    skip_paths = ["/metrics", "/health"]
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        profiles_dir: str,
+        sample_rate: float = 0.0,
+        header_name: str = "X-Profile",
+        header_token: str = None,
+        interval_ms: float = 1.0,
+        max_concurrent: int = 1,
+        max_profiles_per_route: int = 20,
+        max_total_mb: float = 100.0,
+    ):
+        # Only imported when profiling is turned on
+        from pyinstrument import Profiler
+        from pyinstrument.renderers import SpeedscopeRenderer
+
+        self.app = app
+        self.profiler_class = Profiler
+        self.speedscope_renderer = SpeedscopeRenderer()
+        self.profiles_dir = profiles_dir
+        self.sample_rate = sample_rate
+        self.header_name = header_name.lower().encode("latin-1")
+        self.header_token = header_token
+        self.interval = interval_ms / 1000
+        # Profiling slows the request down, at most max_concurrent at a time
+        self.max_concurrent = max_concurrent
+        self.max_profiles_per_route = max_profiles_per_route
+        self.max_total_bytes = max_total_mb * 1024 * 1024
+        self.running = 0
+        # Profiles are saved in worker threads, one retention pass at a time
+        self.retention_lock = threading.Lock()
+
+    def is_requested(self, scope: Scope) -> bool:
+        if not self.header_token:
+            return False
+        for name, value in scope["headers"]:
+            if name == self.header_name:
+                return hmac.compare_digest(
+                    value.decode("latin-1"), self.header_token
+                )
+        return False
+
+    def should_profile(self, scope: Scope) -> bool:
+        if scope["type"] != "http" or scope["path"] in self.skip_paths:
+            return False
+        if self.running >= self.max_concurrent:
+            return False
+        return self.is_requested(scope) or random.random() < self.sample_rate
+
+    # "POST /api/v1/nlp/index/answer/{project_id}" -> one folder per route
+    # template, not per project
+    def get_route_name(self, scope: Scope) -> str:
+        path = scope["path"]
+        for route in scope["app"].routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                path = route.path
+                break
+        return re.sub(r"[^0-9a-zA-Z]+", "_", f"{scope['method']} {path}").strip("_")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if not self.should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = os.urandom(4).hex()
+
+        async def send_with_profile_id(message: Message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-profile-id", profile_id.encode("latin-1"))
+                ]
+            await send(message)
+
+        self.running += 1
+        profiler = self.profiler_class(interval=self.interval, async_mode="enabled")
+        started_at = time.perf_counter()
+        profiler.start()
+        try:
+            # Streaming responses are profiled until their last chunk is sent
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            session = profiler.stop()
+            duration_ms = (time.perf_counter() - started_at) * 1000
+            self.running -= 1
+            try:
+                await asyncio.to_thread(
+                    self.save_profile,
+                    session,
+                    self.get_route_name(scope),
+                    profile_id,
+                    duration_ms,
+                )
+            except Exception as e:
+                logger.error(f"Saving profile {profile_id} failed: {e}")
+
+    def save_profile(self, session, route_name: str, profile_id: str, duration_ms):
+        route_dir = os.path.join(self.profiles_dir, route_name)
+        os.makedirs(route_dir, exist_ok=True)
+        file_prefix = os.path.join(
+            route_dir,
+            f"{time.strftime('%Y%m%dT%H%M%S')}_{duration_ms:.0f}ms_{profile_id}",
+        )
+
+        with open(f"{file_prefix}.speedscope.json", "w") as f:
+            f.write(self.speedscope_renderer.render(session))
+        with open(f"{file_prefix}.collapsed.txt", "w") as f:
+            f.write(self.render_collapsed(session))
+
+        with self.retention_lock:
+            self.apply_retention(route_dir)
+
+    # One "root;caller;callee <self time in us>" line per call stack
+    def render_collapsed(self, session) -> str:
+        lines = []
+
+        def walk(frame, stack):
+            name = f"{frame.function} ({frame.file_path_short}:{frame.line_no})"
+            stack = stack + [name.replace(";", ":")]
+            self_time = frame.time - sum(child.time for child in frame.children)
+            if self_time > 0:
+                lines.append(f"{';'.join(stack)} {round(self_time * 1e6)}")
+            for child in frame.children:
+                walk(child, stack)
+
+        root_frame = session.root_frame()
+        if root_frame is not None:
+            walk(root_frame, [])
+        return "\n".join(lines) + "\n"
+
+    # Oldest profiles go first: beyond the per route count, then beyond the
+    # total size of the profiles directory
+    def apply_retention(self, route_dir: str):
+        route_profiles = self.list_profiles(route_dir)
+        for profile_files in route_profiles[: -self.max_profiles_per_route]:
+            self.delete_profile(profile_files)
+
+        all_profiles = sorted(
+            [
+                profile_files
+                for route_name in os.listdir(self.profiles_dir)
+                for profile_files in self.list_profiles(
+                    os.path.join(self.profiles_dir, route_name)
+                )
+            ],
+            key=lambda profile_files: os.path.getmtime(profile_files[0]),
+        )
+        total_bytes = sum(
+            os.path.getsize(path) for files in all_profiles for path in files
+        )
+        for profile_files in all_profiles[:-1]:
+            if total_bytes <= self.max_total_bytes:
+                break
+            total_bytes -= sum(os.path.getsize(path) for path in profile_files)
+            self.delete_profile(profile_files)
+
+    # The files of each profile in the directory, oldest first
+    def list_profiles(self, route_dir: str) -> list:
+        if not os.path.isdir(route_dir):
+            return []
+        profiles = {}
+        for file_name in os.listdir(route_dir):
+            profile_name = file_name.split(".", 1)[0]
+            profiles.setdefault(profile_name, []).append(
+                os.path.join(route_dir, file_name)
+            )
+        return sorted(profiles.values(), key=lambda files: os.path.getmtime(files[0]))
+
+    def delete_profile(self, profile_files: list):
+        for path in profile_files:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
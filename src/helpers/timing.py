@@ -0,0 +1,68 @@
+from helpers.metrics import LOCAL_PROVIDER, observe_stage, track_in_flight
+from models.enums.PipelineEnum import PipelineEnum
+from contextlib import contextmanager
+from contextvars import ContextVar
+import time
+
+# Seconds spent per stage by the current request. Each asyncio task gets its
+# own copy of the context, so concurrent requests never mix their timings
+stage_timings: ContextVar = ContextVar("stage_timings", default=None)
+
+
+# Start collecting stage timings for the current task, returns the dict the
+# stages are added to
+def start_stage_timings() -> dict:
+    timings = {}
+    stage_timings.set(timings)
+    return timings
+
+
+# Adds a stage duration to the current timings (if somebody started them)
+# and to the Prometheus stage metrics. For durations measured elsewhere,
+# e.g. in the process pool workers
+def record_stage(
+    stage: str,
+    seconds: float,
+    pipeline: str = PipelineEnum.RAG.value,
+    project_id=None,
+    provider: str = LOCAL_PROVIDER,
+    status: str = "ok",
+):
+    timings = stage_timings.get()
+    if timings is not None:
+        timings[stage] = timings.get(stage, 0.0) + seconds
+    observe_stage(
+        pipeline=pipeline,
+        stage=stage,
+        seconds=seconds,
+        project_id=project_id,
+        provider=provider,
+        status=status,
+    )
+
+
+# Times the block as one call of the stage, counted as an error if it raises
+@contextmanager
+def time_stage(
+    stage: str,
+    pipeline: str = PipelineEnum.RAG.value,
+    project_id=None,
+    provider: str = LOCAL_PROVIDER,
+):
+    status = "ok"
+    started_at = time.perf_counter()
+    try:
+        with track_in_flight(pipeline=pipeline, stage=stage, provider=provider):
+            yield
+    except Exception:
+        status = "error"
+        raise
+    finally:
+        record_stage(
+            stage=stage,
+            seconds=time.perf_counter() - started_at,
+            pipeline=pipeline,
+            project_id=project_id,
+            provider=provider,
+            status=status,
+        )
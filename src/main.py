@@ -1,11 +1,28 @@
 from fastapi import FastAPI
-from routes import base, data, nlp
+from routes import base, data, nlp, jobs
 from motor.motor_asyncio import AsyncIOMotorClient
 from helpers.config import get_settings
 from contextlib import asynccontextmanager
 from stores.llm.LLMProviderFactory import LLMProviderFactory
 from stores.vectordb.VectorDBProviderFactory import VectorDBProviderFactory
+from stores.rerank.RerankerFactory import RerankerFactory
 from stores.llm.templates.template_parser import TemplateParser
+from stores.llm.EmbeddingCache import EmbeddingCache
+from stores.llm.HTTPClientPool import HTTPClientPool
+from stores.lexical.BM25IndexStore import BM25IndexStore
+from controllers.BaseController import BaseController
+from helpers.container import AppContainer
+from concurrent.futures import ProcessPoolExecutor
+from starlette_exporter import PrometheusMiddleware, handle_metrics
+from helpers.profiling import ProfilingMiddleware
+from helpers.metrics import (
+    HTTPClientPoolCollector,
+    register_collector,
+    unregister_collector,
+)
+import asyncio
+import socket
+import os
 
 
 @asynccontextmanager
@@ -22,7 +39,20 @@ async def lifespan(app: FastAPI):
         print("✅ MongoDB Connected Successfully")
     except Exception as e:
         print(f"❌ MongoDB Connection Failed: {e}")
-    llm_factory = LLMProviderFactory(settings)
+    # One pooled HTTP transport shared by the generation and embedding
+    # providers (keep-alive connections, per-host concurrency cap)
+    app.http_client_pool = HTTPClientPool(
+        max_connections=settings.HTTP_CLIENT_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.HTTP_CLIENT_KEEPALIVE_EXPIRY,
+        http2=settings.HTTP_CLIENT_HTTP2,
+        max_concurrency_per_host=settings.HTTP_CLIENT_MAX_CONCURRENCY_PER_HOST,
+        timeout=settings.HTTP_CLIENT_TIMEOUT,
+        connect_timeout=settings.HTTP_CLIENT_CONNECT_TIMEOUT,
+    )
+    llm_factory = LLMProviderFactory(
+        settings, http_client_pool=app.http_client_pool
+    )
     vectordb_factory = VectorDBProviderFactory(settings)
 
     app.generation_client = llm_factory.create(provider=settings.GENERATION_BACKEND)
@@ -31,6 +61,28 @@ async def lifespan(app: FastAPI):
     app.vectordb_client = vectordb_factory.create(provider=settings.VECTORDB_BACKEND)
     app.vectordb_client.connect()
 
+    app.reranker = RerankerFactory(settings).create(provider=settings.RERANK_BACKEND)
+
+    # Embedding cache lives next to the vector db under assets/database
+    app.embedding_cache = None
+    if settings.EMBEDDING_CACHE_ENABLED:
+        app.embedding_cache = EmbeddingCache(
+            db_path=BaseController().get_database_path(
+                db_name=settings.EMBEDDING_CACHE_DB_NAME
+            ),
+            max_memory_items=settings.EMBEDDING_CACHE_MAX_MEMORY_ITEMS,
+            max_disk_items=settings.EMBEDDING_CACHE_MAX_DISK_ITEMS,
+        )
+
+    # BM25 indexes for hybrid search, one file per collection
+    app.lexical_index_store = None
+    if settings.LEXICAL_INDEX_ENABLED:
+        app.lexical_index_store = BM25IndexStore(
+            db_path=BaseController().get_database_path(
+                db_name=settings.LEXICAL_INDEX_DB_NAME
+            )
+        )
+
    
     app.state.template_parser = TemplateParser(
         language=settings.PRIMARY_LANG,
@@ -40,15 +92,91 @@ async def lifespan(app: FastAPI):
     
     app.template_parser = app.state.template_parser
 
+    # Process pool for document parsing and splitting (multi-core, off-loop)
+    app.process_pool = None
+    if settings.PROCESS_POOL_WORKERS != 0:
+        app.process_pool = ProcessPoolExecutor(
+            max_workers=settings.PROCESS_POOL_WORKERS
+        )
+
+    # Background jobs: tasks of this process, plus recovery of jobs that were
+    # still running when their worker stopped. Workers are told apart by
+    # hostname:pid, a restarted container usually gets its pid back, so its
+    # own previous jobs are recovered without waiting for them to go stale
+    app.job_tasks = {}
+    app.job_worker_id = f"{socket.gethostname()}:{os.getpid()}"
+
+    # Models, controllers and collection indexes are set up once here
+    app.container = await AppContainer.create_instance(app=app, settings=settings)
+    try:
+        await app.container.job_controller.interrupt_orphaned_jobs(
+            include_own_jobs=True
+        )
+    except Exception as e:
+        print(f"❌ Jobs recovery Failed: {e}")
+
+    # Prometheus: HTTP metrics (middleware below) and the RAG / ingestion
+    # stage metrics of helpers/metrics.py, from the default registry
+    app.http_client_pool_collector = None
+    if settings.METRICS_ENABLED:
+        app.add_route("/metrics", handle_metrics)
+        app.http_client_pool_collector = register_collector(
+            HTTPClientPoolCollector(app.http_client_pool)
+        )
+
     yield
 
     # --- SHUTDOWN ---
+    # Running jobs are marked interrupted so they can be resumed
+    for task in list(app.job_tasks.values()):
+        task.cancel()
+    await asyncio.gather(*app.job_tasks.values(), return_exceptions=True)
+
+    await app.container.aclose()
     app.mongodb_connection.close()
+    if app.http_client_pool_collector:
+        unregister_collector(app.http_client_pool_collector)
+    await app.http_client_pool.aclose()
     app.vectordb_client.disconnect()
+    if app.process_pool:
+        app.process_pool.shutdown(cancel_futures=True)
+    if app.embedding_cache:
+        app.embedding_cache.close()
+    if app.lexical_index_store:
+        app.lexical_index_store.save_all()
 
 
 # Initialize App
 app = FastAPI(lifespan=lifespan)
+settings = get_settings()
+
+# Sampled request profiling, inside the metrics middleware so the request
+# metrics include its overhead
+if settings.PROFILING_ENABLED:
+    app.add_middleware(
+        ProfilingMiddleware,
+        profiles_dir=os.path.join(
+            BaseController().base_dir, "assets", settings.PROFILING_DIR
+        ),
+        sample_rate=settings.PROFILING_SAMPLE_RATE,
+        header_name=settings.PROFILING_HEADER,
+        header_token=settings.PROFILING_HEADER_TOKEN,
+        interval_ms=settings.PROFILING_INTERVAL_MS,
+        max_concurrent=settings.PROFILING_MAX_CONCURRENT,
+        max_profiles_per_route=settings.PROFILING_MAX_PROFILES_PER_ROUTE,
+        max_total_mb=settings.PROFILING_MAX_TOTAL_MB,
+    )
+
+# Middleware can't be added once the app has started, so unlike the /metrics
+# route it is set up here. Paths are grouped by route template (one series
+# for /index/search/{project_id}, not one per project)
+if settings.METRICS_ENABLED:
+    app.add_middleware(
+        PrometheusMiddleware,
+        app_name="mini_rag",
+        group_paths=True,
+        skip_paths=["/metrics", "/health"],
+    )
 
 
 @app.get("/health")
@@ -80,3 +208,4 @@ async def health_check():
 app.include_router(base.base_router)
 app.include_router(data.data_router)
 app.include_router(nlp.nlp_router)
+app.include_router(jobs.jobs_router)
@@ -1,7 +1,10 @@
-from unittest import result
 from .BaseDataModel import BaseDataModel
 from .db_schemas import DataChunk
 from .enums.DataBaseEnum import DataBaseEnum
+from .enums.StageEnum import StageEnum
+from .enums.PipelineEnum import PipelineEnum
+from helpers.timing import time_stage
+from helpers.metrics import MONGODB_PROVIDER
 from bson.objectid import ObjectId
 from pymongo import InsertOne
 
@@ -21,15 +24,15 @@ class ChunkModel(BaseDataModel):
         # 3. return instance object with combined functions
         return instance
 
+    # create_index is a no-op for an existing index, so it runs on every
+    # startup: existing deployments also get indexes added later, like the
+    # (chunk_project_id, _id) one of the keyset pagination
     async def initialize_collection(self):
-        all_collections = await self.db_client.list_collection_names()
-        if DataBaseEnum.COLLECTION_CHUNK_NAME.value not in all_collections:
-            self.collection = self.db_client[DataBaseEnum.COLLECTION_CHUNK_NAME.value]
-            indexes = DataChunk.get_indexes()
-            for index in indexes:
-                await self.collection.create_index(
-                    index["key"], name=index["name"], unique=index["unique"]
-                )
+        indexes = DataChunk.get_indexes()
+        for index in indexes:
+            await self.collection.create_index(
+                index["key"], name=index["name"], unique=index["unique"]
+            )
 
     # Create a new chunk
     async def create_chunk(self, chunk: DataChunk) -> DataChunk:
@@ -57,7 +60,13 @@ class ChunkModel(BaseDataModel):
                 InsertOne(chunk.model_dump(by_alias=True, exclude_unset=True))
                 for chunk in batch
             ]
-            await self.collection.bulk_write(operations)
+            with time_stage(
+                StageEnum.WRITE.value,
+                pipeline=PipelineEnum.INGESTION.value,
+                project_id=batch[0].chunk_project_id,
+                provider=MONGODB_PROVIDER,
+            ):
+                await self.collection.bulk_write(operations)
         return len(chunks)
 
     # Delete chunks by project_id
@@ -65,6 +74,13 @@ class ChunkModel(BaseDataModel):
         result = await self.collection.delete_many({"chunk_project_id": project_id})
         return result.deleted_count
 
+    # Delete chunks by asset_id (used to clean up a partially processed file)
+    async def delete_chunks_by_asset_id(self, asset_id: str):
+        result = await self.collection.delete_many(
+            {"chunk_asset_id": ObjectId(asset_id)}
+        )
+        return result.deleted_count
+
     # Get Project Chunks by project_id
     async def get_chunks_by_project_id(
         self, project_id: str, page_no: int = 1, page_size: int = 50
@@ -76,3 +92,37 @@ class ChunkModel(BaseDataModel):
             .to_list(length=None)
         )
         return [DataChunk(**record) for record in records]
+
+    # Stream Project Chunks page by page using _id keyset pagination
+    # (no .skip(), every page is a range scan on the project/_id index)
+    async def iter_chunks_by_project_id(
+        self, project_id: str, page_size: int = 500, projection: list = None
+    ):
+        last_id = None
+        fields = None
+        if projection:
+            fields = {field: 1 for field in projection}
+
+        while True:
+            query = {"chunk_project_id": project_id}
+            if last_id is not None:
+                query["_id"] = {"$gt": last_id}
+
+            records = (
+                await self.collection.find(query, fields)
+                .sort("_id", 1)
+                .limit(page_size)
+                .to_list(length=page_size)
+            )
+            if not records:
+                break
+
+            last_id = records[-1]["_id"]
+
+            if fields:
+                # Partial records skip pydantic validation on purpose
+                for record in records:
+                    record["id"] = record.pop("_id")
+                yield [DataChunk.model_construct(**record) for record in records]
+            else:
+                yield [DataChunk(**record) for record in records]
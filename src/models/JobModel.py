@@ -0,0 +1,124 @@
+from .BaseDataModel import BaseDataModel
+from .db_schemas import Job
+from .enums.DataBaseEnum import DataBaseEnum
+from .enums.JobEnum import JobStatusEnum
+from bson.objectid import ObjectId
+from datetime import datetime, timezone
+from pymongo import ReturnDocument
+
+
+class JobModel(BaseDataModel):
+
+    def __init__(self, db_client: object):
+        super().__init__(db_client=db_client)
+        self.collection = self.db_client[DataBaseEnum.COLLECTION_JOB_NAME.value]
+
+    @classmethod
+    async def create_instance(cls, db_client: object):
+        # 1. ask class to call init function
+        instance = cls(db_client)
+        # 2. ask class to call initialize_collection function
+        await instance.initialize_collection()
+        # 3. return instance object with combined functions
+        return instance
+
+    # create_index is a no-op for existing indexes, so indexes added later
+    # (the heartbeat one) also reach existing databases
+    async def initialize_collection(self):
+        indexes = Job.get_indexes()
+        for index in indexes:
+            await self.collection.create_index(
+                index["key"], name=index["name"], unique=index["unique"]
+            )
+
+    # Create a new job
+    async def create_job(self, job: Job) -> Job:
+        job_dict = job.model_dump(by_alias=True, exclude_unset=False)
+        if job_dict.get("_id") is None:
+            job_dict.pop("_id", None)
+
+        result = await self.collection.insert_one(job_dict)
+        job.id = str(result.inserted_id)
+        return job
+
+    # Get Job by id
+    async def get_job(self, job_id: str):
+        if not ObjectId.is_valid(job_id):
+            return None
+
+        record = await self.collection.find_one({"_id": ObjectId(job_id)})
+        if record is None:
+            return None
+
+        return Job(**record)
+
+    # Set fields of a job and return the updated Job
+    async def update_job(self, job_id: str, fields: dict):
+        fields["job_updated_at"] = datetime.now(timezone.utc)
+        record = await self.collection.find_one_and_update(
+            {"_id": ObjectId(job_id)},
+            {"$set": fields},
+            return_document=ReturnDocument.AFTER,
+        )
+        if record is None:
+            return None
+
+        return Job(**record)
+
+    async def update_job_status(self, job_id: str, job_status: str, job_error=None):
+        return await self.update_job(
+            job_id=job_id, fields={"job_status": job_status, "job_error": job_error}
+        )
+
+    # Merge progress counters into job_progress (e.g. {"chunks_done": 10})
+    async def update_job_progress(self, job_id: str, progress: dict):
+        return await self.update_job(
+            job_id=job_id,
+            fields={f"job_progress.{key}": value for key, value in progress.items()},
+        )
+
+    # Refresh the heartbeat (job_updated_at) of the jobs a worker is running
+    async def touch_jobs(self, job_ids: list):
+        if not job_ids:
+            return 0
+        result = await self.collection.update_many(
+            {"_id": {"$in": [ObjectId(job_id) for job_id in job_ids]}},
+            {"$set": {"job_updated_at": datetime.now(timezone.utc)}},
+        )
+        return result.modified_count
+
+    # Unfinished jobs whose worker is gone can be resumed later: the jobs of
+    # worker_id (a previous run of this worker) and the jobs whose heartbeat
+    # is older than stale_before. Live jobs of other workers are left alone
+    async def mark_unfinished_jobs_interrupted(
+        self, stale_before: datetime, worker_id: str = None
+    ):
+        orphaned_filters = [{"job_updated_at": {"$lt": stale_before}}]
+        if worker_id:
+            orphaned_filters.append({"job_worker_id": worker_id})
+
+        result = await self.collection.update_many(
+            {
+                "job_status": {
+                    "$in": [JobStatusEnum.PENDING.value, JobStatusEnum.RUNNING.value]
+                },
+                "$or": orphaned_filters,
+            },
+            {
+                "$set": {
+                    "job_status": JobStatusEnum.INTERRUPTED.value,
+                    "job_updated_at": datetime.now(timezone.utc),
+                }
+            },
+        )
+        return result.modified_count
+
+    # Get Project Jobs, newest first
+    async def get_project_jobs(self, project_id: str, limit: int = 20):
+        records = (
+            await self.collection.find({"job_project_id": project_id})
+            .sort("job_created_at", -1)
+            .limit(limit)
+            .to_list(length=limit)
+        )
+        return [Job(**record) for record in records]
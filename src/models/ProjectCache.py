@@ -0,0 +1,45 @@
+from collections import OrderedDict
+import time
+
+
+# In-process read-through cache of Project records: entries expire after
+# ttl_seconds and the least recently used ones are evicted past max_items
+class ProjectCache:
+
+    def __init__(self, ttl_seconds: float = 300, max_items: int = 10000):
+        self.ttl_seconds = ttl_seconds
+        self.max_items = max_items
+        self.projects = OrderedDict()  # project_id -> (expires_at, Project)
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, project_id: str):
+        entry = self.projects.get(project_id)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self.projects[project_id]
+            self.misses += 1
+            return None
+
+        self.projects.move_to_end(project_id)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, project_id: str, project):
+        self.projects[project_id] = (time.monotonic() + self.ttl_seconds, project)
+        self.projects.move_to_end(project_id)
+        while len(self.projects) > self.max_items:
+            self.projects.popitem(last=False)
+            self.evictions += 1
+
+    def get_stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": (self.hits / lookups) if lookups else 0.0,
+            "items": len(self.projects),
+        }
@@ -1,18 +1,26 @@
 from .BaseDataModel import BaseDataModel
 from .db_schemas import Project
 from .enums.DataBaseEnum import DataBaseEnum
+from .ProjectCache import ProjectCache
+from pymongo import ReturnDocument
+import asyncio
 
 
 class ProjectModel(BaseDataModel):
 
-    def __init__(self, db_client: object):
+    def __init__(self, db_client: object, project_cache: ProjectCache = None):
         super().__init__(db_client=db_client)
         self.collection = self.db_client[DataBaseEnum.COLLECTION_PROJECT_NAME.value]
+        self.project_cache = project_cache
+        # {project_id: asyncio.Task} of the Mongo lookups in flight
+        self.pending_lookups = {}
 
     @classmethod
-    async def create_instance(cls, db_client: object):
+    async def create_instance(
+        cls, db_client: object, project_cache: ProjectCache = None
+    ):
         # 1. ask class to call init function
-        instance = cls(db_client)
+        instance = cls(db_client, project_cache=project_cache)
         # 2. ask class to call initialize_collection function
         await instance.initialize_collection()
         # 3. return instance object with combined functions
@@ -37,14 +45,40 @@ class ProjectModel(BaseDataModel):
 
     # Get Project or Create new project
     async def get_project_or_create_one(self, project_id: str):
-        record = await self.collection.find_one({"project_id": project_id})
+        if self.project_cache:
+            project = self.project_cache.get(project_id)
+            if project is not None:
+                return project
 
-        if record is None:
-            project = Project(project_id=project_id)
-            inserted_id = await self.create_project(project=project)
-            record = await self.collection.find_one({"_id": inserted_id})
+        # Single-flight: concurrent misses for the same project share one
+        # lookup, so a burst of requests for a new project inserts it once
+        lookup = self.pending_lookups.get(project_id)
+        if lookup is None:
+            lookup = asyncio.ensure_future(self.find_or_create_project(project_id))
+            self.pending_lookups[project_id] = lookup
+            lookup.add_done_callback(
+                lambda _: self.pending_lookups.pop(project_id, None)
+            )
 
-        return Project(**record)
+        # A cancelled request must not cancel the lookup of the others
+        return await asyncio.shield(lookup)
+
+    async def find_or_create_project(self, project_id: str) -> Project:
+        # Validates project_id before anything is written
+        project = Project(project_id=project_id)
+
+        # One round trip, and safe against other workers creating it too
+        record = await self.collection.find_one_and_update(
+            {"project_id": project_id},
+            {"$setOnInsert": project.model_dump(by_alias=True, exclude_unset=True)},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        project = Project(**record)
+
+        if self.project_cache:
+            self.project_cache.set(project_id, project)
+        return project
 
     # Get All Projects "don't forget to use pagination with any get all method"
     async def get_all_projects(self, page: int = 1, page_size: int = 10):
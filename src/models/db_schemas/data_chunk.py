@@ -23,9 +23,16 @@ class DataChunk(BaseModel):
                 "key": [("chunk_project_id", 1)],
                 "name": "chunk_project_id_index_1",
                 "unique": False,
-            }
+            },
+            {
+                "key": [("chunk_project_id", 1), ("_id", 1)],
+                "name": "chunk_project_id_id_index_1",
+                "unique": False,
+            },
         ]
 
 class RetrievedDocument(BaseModel):
     text: str
-    score: float
\ No newline at end of file
+    score: float
+    record_id: Optional[str] = None
+    metadata: Optional[dict] = None
\ No newline at end of file
@@ -0,0 +1,49 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+from datetime import datetime, timezone
+from .asset import PyObjectId
+from ..enums.JobEnum import JobStatusEnum
+
+
+class Job(BaseModel):
+    id: Optional[PyObjectId] = Field(None, alias="_id")
+    job_project_id: str
+    job_type: str
+    job_status: str = JobStatusEnum.PENDING.value
+    job_config: dict = Field(default_factory=dict)
+    job_progress: dict = Field(default_factory=dict)
+    job_cancel_requested: bool = False
+    job_error: Optional[str] = None
+    # Worker process running the job (hostname:pid), job_updated_at is its
+    # heartbeat
+    job_worker_id: Optional[str] = None
+    job_created_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc)
+    )
+    job_updated_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc)
+    )
+
+    class Config:
+        populate_by_name = True
+        arbitrary_types_allowed = True
+
+    @classmethod
+    def get_indexes(cls):
+        return [
+            {
+                "key": [("job_project_id", 1)],
+                "name": "job_project_id_index_1",
+                "unique": False,
+            },
+            {
+                "key": [("job_status", 1)],
+                "name": "job_status_index_1",
+                "unique": False,
+            },
+            {
+                "key": [("job_status", 1), ("job_updated_at", 1)],
+                "name": "job_status_updated_at_index_1",
+                "unique": False,
+            },
+        ]
@@ -0,0 +1,16 @@
+from enum import Enum
+
+
+class JobTypeEnum(str, Enum):
+    PROCESS = "process"
+    INDEX_PUSH = "index_push"
+
+
+class JobStatusEnum(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+    # The server stopped while the job was running, it can be resumed
+    INTERRUPTED = "interrupted"
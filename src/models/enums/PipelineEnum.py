@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+# The pipeline label of the stage metrics (see helpers/metrics.py)
+class PipelineEnum(str, Enum):
+    RAG = "rag"
+    INGESTION = "ingestion"
@@ -25,4 +25,18 @@ class ResponseSignal(Enum):
     VECTOR_SEARCH_SUCCESS = "vector_search_success"
     
     RAG_ANSWER_ERROR = "rag_answer_error"
-    RAG_ANSWER_SUCCESS = "rag_answer_success"
\ No newline at end of file
+    RAG_ANSWER_SUCCESS = "rag_answer_success"
+    RAG_ANSWER_BLOCKED = "rag_answer_blocked"
+
+    EMBEDDING_CACHE_DISABLED = "embedding_cache_disabled"
+    EMBEDDING_CACHE_STATS_SUCCESS = "embedding_cache_stats_success"
+    SEARCH_BATCH_TOO_LARGE = "search_batch_too_large"
+    PROJECT_CACHE_DISABLED = "project_cache_disabled"
+    PROJECT_CACHE_STATS_SUCCESS = "project_cache_stats_success"
+
+    JOB_SUBMITTED_SUCCESS = "job_submitted_success"
+    JOB_STATUS_SUCCESS = "job_status_success"
+    JOB_CANCEL_REQUESTED_SUCCESS = "job_cancel_requested_success"
+    JOB_NOT_FOUND_ERROR = "job_not_found_error"
+    JOB_NOT_CANCELLABLE_ERROR = "job_not_cancellable_error"
+    JOB_NOT_RESUMABLE_ERROR = "job_not_resumable_error"
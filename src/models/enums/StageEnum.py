@@ -0,0 +1,18 @@
+from enum import Enum
+
+
+# Timed stages of a RAG request and of the ingestion pipeline (see
+# helpers/timing.py). EMBED is shared: query embedding on the RAG side,
+# chunk embedding on the ingestion side (told apart by PipelineEnum)
+class StageEnum(str, Enum):
+    EMBED = "embed"
+    SEARCH = "search"
+    RERANK = "rerank"
+    RENDER = "render"
+    GENERATE = "generate"
+    GUARDRAIL = "guardrail"
+
+    LOAD = "load"
+    SPLIT = "split"
+    WRITE = "write"
+    UPSERT = "upsert"
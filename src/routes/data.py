@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, UploadFile, status, Request
 from fastapi.responses import JSONResponse
 import os
+import asyncio
 import logging
 import aiofiles
 from typing import List
@@ -8,7 +9,13 @@ from bson import ObjectId
 
 # Internal Imports
 from helpers.config import get_settings, Settings
-from controllers import DataController, ProjectController, ProcessController
+from controllers import (
+    DataController,
+    ProjectController,
+    ProcessController,
+    NLPController,
+    IngestionController,
+)
 from models import ResponseSignal
 from routes.schemes.data import ProcessRequest
 from models.ProjectModel import ProjectModel
@@ -16,6 +23,13 @@ from models.db_schemas import DataChunk, Asset
 from models.ChunkModel import ChunkModel
 from models.AssetModel import AssetModel
 from models.enums.AssetTypeEnum import AssetTypeEnum
+from routes.dependencies import (
+    get_project_model,
+    get_chunk_model,
+    get_asset_model,
+    get_data_controller,
+    get_nlp_controller,
+)
 
 logger = logging.getLogger("uvicorn.error")
 
@@ -35,17 +49,13 @@ async def upload_data(
     project_id: str,
     files: List[UploadFile],  # Expecting a list of files from Postman key 'files'
     app_settings: Settings = Depends(get_settings),
+    project_model: ProjectModel = Depends(get_project_model),
+    asset_model: AssetModel = Depends(get_asset_model),
+    data_controller: DataController = Depends(get_data_controller),
 ):
     # Ensure the project exists in the DB before uploading
-    project_model = await ProjectModel.create_instance(
-        db_client=request.app.database_client
-    )
     await project_model.get_project_or_create_one(project_id=project_id)
 
-    data_controller = DataController()
-    asset_model = await AssetModel.create_instance(
-        db_client=request.app.database_client
-    )
     uploaded_records = []
 
     for file in files:
@@ -88,6 +98,27 @@ async def upload_data(
     )
 
 
+# Files to process as {asset_id: file_name}, None if file_id does not exist
+async def get_project_files_ids(
+    asset_model: AssetModel, project_id: str, file_id: str
+):
+    if file_id:
+        # Targeted processing: Get record for a specific file_id
+        asset_record = await asset_model.get_asset_record(
+            asset_project_id=project_id, asset_name=file_id
+        )
+        if not asset_record:
+            return None
+        return {str(asset_record.id): asset_record.asset_name}
+
+    # Bulk processing: Get all files belonging to this project
+    project_files = await asset_model.get_all_project_assets(
+        asset_project_id=project_id,
+        asset_type=AssetTypeEnum.TYPE_FILE.value,
+    )
+    return {str(record.id): record.asset_name for record in project_files}
+
+
 # ==========================================
 # 2. PROCESS ENDPOINT
 # Chunks text from files and stores in Vector DB
@@ -97,39 +128,24 @@ async def process_endpoint(
     project_id: str,
     request: Request,
     process_request: ProcessRequest,
+    app_settings: Settings = Depends(get_settings),
+    chunk_model: ChunkModel = Depends(get_chunk_model),
+    asset_model: AssetModel = Depends(get_asset_model),
 ):
     file_id = process_request.file_id  # Single file target (optional)
     chunk_size = process_request.chunk_size
     overlap_size = process_request.overlap_size
     do_reset = process_request.do_reset
 
-    asset_model = await AssetModel.create_instance(
-        db_client=request.app.database_client
-    )
-    project_files_ids = {}
-
     # --- STEP 1: Determine scope (Single file vs All files) ---
-    if file_id:
-        # Targeted processing: Get record for a specific file_id
-        asset_record = await asset_model.get_asset_record(
-            asset_project_id=project_id, asset_name=file_id
-        )
-        if asset_record:
-            project_files_ids = {str(asset_record.id): asset_record.asset_name}
-        else:
-            return JSONResponse(
-                status_code=status.HTTP_404_NOT_FOUND,
-                content={"detail": f"File {file_id} not found."},
-            )
-    else:
-        # Bulk processing: Get all files belonging to this project
-        project_files = await asset_model.get_all_project_assets(
-            asset_project_id=project_id,
-            asset_type=AssetTypeEnum.TYPE_FILE.value,
+    project_files_ids = await get_project_files_ids(
+        asset_model=asset_model, project_id=project_id, file_id=file_id
+    )
+    if project_files_ids is None:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={"detail": f"File {file_id} not found."},
         )
-        project_files_ids = {
-            str(record.id): record.asset_name for record in project_files
-        }
 
     if not project_files_ids:
         return JSONResponse(
@@ -139,9 +155,6 @@ async def process_endpoint(
 
     # --- STEP 2: Setup Controllers and Models ---
     process_controller = ProcessController(project_id=project_id)
-    chunk_model = await ChunkModel.create_instance(
-        db_client=request.app.database_client
-    )
 
     # Delete existing chunks if a reset is requested
     if do_reset == 1:
@@ -149,40 +162,68 @@ async def process_endpoint(
 
     no_records = 0
     no_files = 0
+    files_timings = []
+    failed_files = []
 
     # --- STEP 3: The Processing Loop ---
-    for asset_id, file_name in project_files_ids.items():
-        # Get raw content from storage
-        file_content = process_controller.get_file_content(file_id=file_name)
-        if file_content is None:
-            continue
+    # Files are parsed and split in parallel in the process pool, a bounded
+    # number at a time, and written to Mongo as soon as each one is ready.
+    # A file that fails is skipped and reported (like a failed upload), the
+    # other files are still processed
+    files_semaphore = asyncio.Semaphore(app_settings.PROCESS_MAX_PARALLEL_FILES)
 
-        # Split content into smaller chunks
-        file_chunks = process_controller.process_file_content(
-            file_content=file_content,
-            file_id=file_name,
-            chunk_size=chunk_size,
-            overlap_size=overlap_size,
-        )
+    async def process_one_file(asset_id: str, file_name: str):
+        async with files_semaphore:
+            try:
+                file_chunks, timings = await process_controller.process_file(
+                    file_id=file_name,
+                    chunk_size=chunk_size,
+                    overlap_size=overlap_size,
+                    executor=request.app.process_pool,
+                )
+            except Exception as e:
+                logger.error(f"Processing failed for {file_name}: {e}")
+                return asset_id, file_name, None, None
+            return asset_id, file_name, file_chunks, timings
 
-        if not file_chunks:
-            continue
+    file_tasks = [
+        asyncio.create_task(process_one_file(asset_id, file_name))
+        for asset_id, file_name in project_files_ids.items()
+    ]
+    try:
+        for file_task in asyncio.as_completed(file_tasks):
+            asset_id, file_name, file_chunks, timings = await file_task
+            if timings is None:
+                failed_files.append(file_name)
+                continue
+            if not file_chunks:
+                continue
 
-        # Prepare DataChunk objects for MongoDB
-        file_chunks_records = [
-            DataChunk(
-                chunk_text=chunk.page_content,
-                chunk_metadata=chunk.metadata,
-                chunk_order=i + 1,
-                chunk_project_id=project_id,
-                chunk_asset_id=ObjectId(asset_id),  # Link chunk back to Asset
-            )
-            for i, chunk in enumerate(file_chunks)
-        ]
+            # Prepare DataChunk objects for MongoDB
+            file_chunks_records = [
+                DataChunk(
+                    chunk_text=chunk.page_content,
+                    chunk_metadata=chunk.metadata,
+                    chunk_order=i + 1,
+                    chunk_project_id=project_id,
+                    chunk_asset_id=ObjectId(asset_id),  # Link chunk back to Asset
+                )
+                for i, chunk in enumerate(file_chunks)
+            ]
 
-        # Batch insert chunks into DB
-        no_records += await chunk_model.insert_many_chunks(chunks=file_chunks_records)
-        no_files += 1
+            # Batch insert chunks into DB
+            no_records += await chunk_model.insert_many_chunks(
+                chunks=file_chunks_records
+            )
+            no_files += 1
+            files_timings.append(timings)
+            logger.info(f"Processed file timings: {timings}")
+    finally:
+        # Client disconnect or Mongo error: stop the files still in flight
+        # (their queued pool work is cancelled too)
+        for file_task in file_tasks:
+            file_task.cancel()
+        await asyncio.gather(*file_tasks, return_exceptions=True)
 
     # --- STEP 4: Final Response (Outside the loop) ---
     return JSONResponse(
@@ -190,5 +231,89 @@ async def process_endpoint(
             "signal": ResponseSignal.FILE_PROCESSED_SUCCESS.value,
             "inserted_chunks": no_records,
             "processed_files": no_files,
+            "failed_files": failed_files,
+            "files_timings": files_timings,
+        },
+    )
+
+
+# ==========================================
+# 3. INGEST ENDPOINT
+# Pipelined process + index: parse, chunk, embed and write in one pass
+# ==========================================
+@data_router.post("/ingest/{project_id}")
+async def ingest_endpoint(
+    project_id: str,
+    request: Request,
+    process_request: ProcessRequest,
+    project_model: ProjectModel = Depends(get_project_model),
+    chunk_model: ChunkModel = Depends(get_chunk_model),
+    asset_model: AssetModel = Depends(get_asset_model),
+    nlp_controller: NLPController = Depends(get_nlp_controller),
+):
+    project = await project_model.get_project_or_create_one(project_id=project_id)
+
+    project_files_ids = await get_project_files_ids(
+        asset_model=asset_model, project_id=project_id, file_id=process_request.file_id
+    )
+    if project_files_ids is None:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={"detail": f"File {process_request.file_id} not found."},
+        )
+
+    if not project_files_ids:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"signal": ResponseSignal.NO_FILES_FOUND_FOR_PROCESSING.value},
+        )
+
+    if process_request.do_reset == 1:
+        await chunk_model.delete_chunks_by_project_id(project_id=project_id)
+
+    ingestion_controller = IngestionController(
+        process_controller=ProcessController(project_id=project_id),
+        nlp_controller=nlp_controller,
+        chunk_model=chunk_model,
+        process_pool=request.app.process_pool,
+    )
+
+    stats = await ingestion_controller.ingest_files(
+        project=project,
+        project_files_ids=project_files_ids,
+        chunk_size=process_request.chunk_size,
+        overlap_size=process_request.overlap_size,
+        do_reset=process_request.do_reset == 1,
+    )
+    if stats is None:
+        return JSONResponse(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            content={"signal": ResponseSignal.FILE_PROCESSING_FAILED.value},
+        )
+
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.FILE_PROCESSED_SUCCESS.value,
+            **stats,
+        },
+    )
+
+
+@data_router.get("/projects/cache/stats")
+async def get_project_cache_stats(
+    project_model: ProjectModel = Depends(get_project_model),
+):
+    project_cache = project_model.project_cache
+    if not project_cache:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"signal": ResponseSignal.PROJECT_CACHE_DISABLED.value},
+        )
+
+    return JSONResponse(
+        status_code=status.HTTP_200_OK,
+        content={
+            "signal": ResponseSignal.PROJECT_CACHE_STATS_SUCCESS.value,
+            "stats": project_cache.get_stats(),
         },
     )
@@ -0,0 +1,41 @@
+from fastapi import Request
+from helpers.container import AppContainer
+from controllers import DataController, NLPController, JobController
+from models.ProjectModel import ProjectModel
+from models.ChunkModel import ChunkModel
+from models.AssetModel import AssetModel
+from models.JobModel import JobModel
+
+
+# FastAPI dependencies: every request reuses the singletons of the
+# AppContainer built in main.lifespan
+def get_container(request: Request) -> AppContainer:
+    return request.app.container
+
+
+def get_project_model(request: Request) -> ProjectModel:
+    return request.app.container.project_model
+
+
+def get_chunk_model(request: Request) -> ChunkModel:
+    return request.app.container.chunk_model
+
+
+def get_asset_model(request: Request) -> AssetModel:
+    return request.app.container.asset_model
+
+
+def get_job_model(request: Request) -> JobModel:
+    return request.app.container.job_model
+
+
+def get_data_controller(request: Request) -> DataController:
+    return request.app.container.data_controller
+
+
+def get_nlp_controller(request: Request) -> NLPController:
+    return request.app.container.nlp_controller
+
+
+def get_job_controller(request: Request) -> JobController:
+    return request.app.container.job_controller
@@ -0,0 +1,163 @@
+from fastapi import APIRouter, Depends, status, Request
+from fastapi.responses import JSONResponse
+from fastapi.encoders import jsonable_encoder
+from routes.schemes.data import ProcessRequest
+from routes.schemes.nlp import PushRequest
+from routes.data import get_project_files_ids
+from controllers import JobController
+from models import ResponseSignal
+from models.ProjectModel import ProjectModel
+from models.AssetModel import AssetModel
+from models.JobModel import JobModel
+from models.enums.JobEnum import JobTypeEnum, JobStatusEnum
+from routes.dependencies import (
+    get_project_model,
+    get_asset_model,
+    get_job_model,
+    get_job_controller,
+)
+import logging
+
+logger = logging.getLogger("uvicorn.error")
+
+jobs_router = APIRouter(
+    prefix="/api/v1/jobs",
+    tags=["api_v1", "jobs"],
+)
+
+
+def job_response(signal: ResponseSignal, job, status_code: int = status.HTTP_200_OK):
+    return JSONResponse(
+        status_code=status_code,
+        content={"signal": signal.value, "job": jsonable_encoder(job)},
+    )
+
+
+@jobs_router.post("/process/{project_id}")
+async def submit_process_job(
+    request: Request,
+    project_id: str,
+    process_request: ProcessRequest,
+    project_model: ProjectModel = Depends(get_project_model),
+    asset_model: AssetModel = Depends(get_asset_model),
+    job_controller: JobController = Depends(get_job_controller),
+):
+    await project_model.get_project_or_create_one(project_id=project_id)
+
+    project_files_ids = await get_project_files_ids(
+        asset_model=asset_model, project_id=project_id, file_id=process_request.file_id
+    )
+    if project_files_ids is None:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={"detail": f"File {process_request.file_id} not found."},
+        )
+
+    if not project_files_ids:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"signal": ResponseSignal.NO_FILES_FOUND_FOR_PROCESSING.value},
+        )
+
+    job = await job_controller.submit_job(
+        project_id=project_id,
+        job_type=JobTypeEnum.PROCESS.value,
+        job_config={
+            "project_files_ids": project_files_ids,
+            "chunk_size": process_request.chunk_size,
+            "overlap_size": process_request.overlap_size,
+            "do_reset": process_request.do_reset,
+        },
+    )
+    return job_response(
+        ResponseSignal.JOB_SUBMITTED_SUCCESS, job, status.HTTP_202_ACCEPTED
+    )
+
+
+@jobs_router.post("/index/push/{project_id}")
+async def submit_index_push_job(
+    request: Request,
+    project_id: str,
+    push_request: PushRequest,
+    project_model: ProjectModel = Depends(get_project_model),
+    job_controller: JobController = Depends(get_job_controller),
+):
+    await project_model.get_project_or_create_one(project_id=project_id)
+
+    job = await job_controller.submit_job(
+        project_id=project_id,
+        job_type=JobTypeEnum.INDEX_PUSH.value,
+        job_config={"do_reset": push_request.do_reset},
+    )
+    return job_response(
+        ResponseSignal.JOB_SUBMITTED_SUCCESS, job, status.HTTP_202_ACCEPTED
+    )
+
+
+@jobs_router.get("/{job_id}")
+async def get_job_status(
+    request: Request,
+    job_id: str,
+    job_model: JobModel = Depends(get_job_model),
+):
+    job = await job_model.get_job(job_id=job_id)
+    if not job:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={"signal": ResponseSignal.JOB_NOT_FOUND_ERROR.value},
+        )
+
+    return job_response(ResponseSignal.JOB_STATUS_SUCCESS, job)
+
+
+@jobs_router.post("/{job_id}/cancel")
+async def cancel_job(
+    request: Request,
+    job_id: str,
+    job_controller: JobController = Depends(get_job_controller),
+):
+    job = await job_controller.job_model.get_job(job_id=job_id)
+    if not job:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={"signal": ResponseSignal.JOB_NOT_FOUND_ERROR.value},
+        )
+
+    if job.job_status not in [
+        JobStatusEnum.PENDING.value,
+        JobStatusEnum.RUNNING.value,
+    ]:
+        return job_response(
+            ResponseSignal.JOB_NOT_CANCELLABLE_ERROR, job, status.HTTP_400_BAD_REQUEST
+        )
+
+    job = await job_controller.cancel_job(job=job)
+    return job_response(ResponseSignal.JOB_CANCEL_REQUESTED_SUCCESS, job)
+
+
+@jobs_router.post("/{job_id}/resume")
+async def resume_job(
+    request: Request,
+    job_id: str,
+    job_controller: JobController = Depends(get_job_controller),
+):
+    job = await job_controller.job_model.get_job(job_id=job_id)
+    if not job:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={"signal": ResponseSignal.JOB_NOT_FOUND_ERROR.value},
+        )
+
+    if job.job_status not in [
+        JobStatusEnum.FAILED.value,
+        JobStatusEnum.CANCELLED.value,
+        JobStatusEnum.INTERRUPTED.value,
+    ]:
+        return job_response(
+            ResponseSignal.JOB_NOT_RESUMABLE_ERROR, job, status.HTTP_400_BAD_REQUEST
+        )
+
+    job = await job_controller.resume_job(job=job)
+    return job_response(
+        ResponseSignal.JOB_SUBMITTED_SUCCESS, job, status.HTTP_202_ACCEPTED
+    )
@@ -1,12 +1,19 @@
 from fastapi import APIRouter, Depends, UploadFile, status, Request
-from fastapi.responses import JSONResponse
-from routes.schemes.nlp import PushRequest, SearchRequest
+from fastapi.responses import JSONResponse, StreamingResponse
+from routes.schemes.nlp import PushRequest, SearchRequest, BatchSearchRequest
 from models.ProjectModel import ProjectModel
 from controllers.NLPController import NLPController
 from models.ChunkModel import ChunkModel
 from models import ResponseSignal
+from helpers.config import get_settings, Settings
 from fastapi.encoders import jsonable_encoder
+from routes.dependencies import (
+    get_project_model,
+    get_chunk_model,
+    get_nlp_controller,
+)
 import logging
+import json
 
 logger = logging.getLogger("uvicorn.error")
 
@@ -21,13 +28,10 @@ async def index_project(
     request: Request,
     project_id: str,
     push_request: PushRequest,
+    project_model: ProjectModel = Depends(get_project_model),
+    chunk_model: ChunkModel = Depends(get_chunk_model),
+    nlp_controller: NLPController = Depends(get_nlp_controller),
 ):
-    project_model = await ProjectModel.create_instance(
-        db_client=request.app.database_client,
-    )
-    chunk_model = await ChunkModel.create_instance(
-        db_client=request.app.database_client,
-    )
     project = await project_model.get_project_or_create_one(project_id=project_id)
 
     if not project:
@@ -35,57 +39,71 @@ async def index_project(
             status_code=status.HTTP_400_BAD_REQUEST,
             content={"signal": ResponseSignal.PROJECT_NOT_FOUND_ERROR.value},
         )
-    nlp_controller = NLPController(
-        vectordb_client=request.app.vectordb_client,
-        generation_client=request.app.generation_client,
-        embedding_client=request.app.embedding_client,
-        template_parser=request.app.template_parser,
-    )
-    has_records = True
-    page_no = 1
     inserted_items_count = 0
-    idx = 0
-
-    while has_records:
+    skipped_items_count = 0
+    cache_stats = {"hits": 0, "misses": 0}
+    pushed_record_ids = set()
 
-        page_chunks = await chunk_model.get_chunks_by_project_id(
-            project_id=project_id,
-            page_no=page_no,
-        )
+    # Reset before paging, so it also applies to a project without chunks
+    if push_request.do_reset:
+        _ = nlp_controller.create_vector_db_collection(project=project, do_reset=True)
 
-        # Logic check: if no chunks returned, stop the loop
-        if not page_chunks or len(page_chunks) == 0:
-            has_records = False
-            break
-
-        # If we have chunks, move to next page for the next iteration
-        page_no += 1
-
-        chunks_ids = list(range(idx, idx + len(page_chunks)))
-        idx += len(page_chunks)
-
-        # Check if this controller method is async too!
-        # If it is
-        is_inserted = nlp_controller.index_into_vector_db(
+    async for page_chunks in chunk_model.iter_chunks_by_project_id(
+        project_id=project_id,
+        projection=["chunk_text", "chunk_metadata"],
+    ):
+        # Point ids come from the chunk _id, so pushing again only upserts
+        inserted_count = await nlp_controller.index_into_vector_db(
             project=project,
             chunks=page_chunks,
-            chunks_ids=chunks_ids,
-            do_reset=push_request.do_reset if page_no == 2 else False,
+            cache_stats=cache_stats,
         )
 
-        if not is_inserted:
+        if inserted_count is None:
             return JSONResponse(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 content={"signal": ResponseSignal.INSERT_INTO_VECTOR_DB_ERROR.value},
             )
 
-        inserted_items_count += len(page_chunks)
+        inserted_items_count += inserted_count
+        skipped_items_count += len(page_chunks) - inserted_count
+        pushed_record_ids.update(
+            nlp_controller.create_point_id(chunk_id=chunk.id) for chunk in page_chunks
+        )
+
+    # Upserts never remove anything: drop the vectors of deleted chunks
+    deleted_items_count = nlp_controller.delete_stale_records(
+        project=project, keep_record_ids=pushed_record_ids
+    )
+    nlp_controller.flush_indexes(project=project)
+
+    content = {
+        "signal": ResponseSignal.INSERT_INTO_VECTOR_DB_SUCCESS.value,
+        "inserted_items_count": inserted_items_count,
+        "skipped_items_count": skipped_items_count,
+        "deleted_items_count": deleted_items_count,
+    }
+    # How many provider embedding calls this push skipped thanks to the cache
+    if request.app.embedding_cache:
+        content["embedding_cache"] = cache_stats
+
+    return JSONResponse(status_code=status.HTTP_200_OK, content=content)
+
+
+@nlp_router.get("/index/cache/stats")
+async def get_embedding_cache_stats(request: Request):
+    embedding_cache = request.app.embedding_cache
+    if not embedding_cache:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"signal": ResponseSignal.EMBEDDING_CACHE_DISABLED.value},
+        )
 
     return JSONResponse(
         status_code=status.HTTP_200_OK,
         content={
-            "signal": ResponseSignal.INSERT_INTO_VECTOR_DB_SUCCESS.value,
-            "inserted_items_count": inserted_items_count,
+            "signal": ResponseSignal.EMBEDDING_CACHE_STATS_SUCCESS.value,
+            "stats": embedding_cache.get_stats(),
         },
     )
 
@@ -94,10 +112,9 @@ async def index_project(
 async def get_project_index_info(
     request: Request,
     project_id: str,
+    project_model: ProjectModel = Depends(get_project_model),
+    nlp_controller: NLPController = Depends(get_nlp_controller),
 ):
-    project_model = await ProjectModel.create_instance(
-        db_client=request.app.database_client,
-    )
     project = await project_model.get_project_or_create_one(project_id=project_id)
 
     if not project:
@@ -105,12 +122,6 @@ async def get_project_index_info(
             status_code=status.HTTP_400_BAD_REQUEST,
             content={"signal": ResponseSignal.PROJECT_NOT_FOUND_ERROR.value},
         )
-    nlp_controller = NLPController(
-        vectordb_client=request.app.vectordb_client,
-        generation_client=request.app.generation_client,
-        embedding_client=request.app.embedding_client,
-        template_parser=request.app.template_parser,
-    )
     collection_info = nlp_controller.get_vector_db_collection_info(project=project)
 
     return JSONResponse(
@@ -127,10 +138,9 @@ async def search_project_index(
     request: Request,
     project_id: str,
     search_request: SearchRequest,
+    project_model: ProjectModel = Depends(get_project_model),
+    nlp_controller: NLPController = Depends(get_nlp_controller),
 ):
-    project_model = await ProjectModel.create_instance(
-        db_client=request.app.database_client
-    )
     project = await project_model.get_project_or_create_one(project_id=project_id)
 
     if not project:
@@ -139,16 +149,12 @@ async def search_project_index(
             content={"signal": ResponseSignal.PROJECT_NOT_FOUND_ERROR.value},
         )
 
-    nlp_controller = NLPController(
-        vectordb_client=request.app.vectordb_client,
-        generation_client=request.app.generation_client,
-        embedding_client=request.app.embedding_client,
-        template_parser=request.app.template_parser,
-    )
-
     # Perform search
     results = await nlp_controller.search_vector_db_collection(
-        project=project, text=search_request.text, limit=search_request.limit
+        project=project,
+        text=search_request.text,
+        limit=search_request.limit,
+        search_mode=search_request.mode,
     )
 
     # If the controller returned None, it's a code/provider error
@@ -171,15 +177,63 @@ async def search_project_index(
     )
 
 
+@nlp_router.post("/index/search/batch/{project_id}")
+async def search_project_index_batch(
+    request: Request,
+    project_id: str,
+    search_request: BatchSearchRequest,
+    app_settings: Settings = Depends(get_settings),
+    project_model: ProjectModel = Depends(get_project_model),
+    nlp_controller: NLPController = Depends(get_nlp_controller),
+):
+    if len(search_request.texts) > app_settings.SEARCH_BATCH_MAX_QUERIES:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"signal": ResponseSignal.SEARCH_BATCH_TOO_LARGE.value},
+        )
+
+    project = await project_model.get_project_or_create_one(project_id=project_id)
+
+    if not project:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"signal": ResponseSignal.PROJECT_NOT_FOUND_ERROR.value},
+        )
+
+    # One embedding call and one vector db round trip for all queries
+    results = await nlp_controller.search_many(
+        project=project,
+        texts=search_request.texts,
+        limit=search_request.limit,
+        search_mode=search_request.mode,
+    )
+
+    if results is None:
+        return JSONResponse(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            content={
+                "signal": ResponseSignal.VECTOR_SEARCH_ERROR.value,
+                "results": [],
+            },
+        )
+
+    return JSONResponse(
+        status_code=status.HTTP_200_OK,
+        content={
+            "signal": ResponseSignal.VECTOR_SEARCH_SUCCESS.value,
+            "results": jsonable_encoder(results),
+        },
+    )
+
+
 @nlp_router.post("/index/answer/{project_id}")
 async def answer_rag(
     request: Request,
     project_id: str,
     search_request: SearchRequest,
+    project_model: ProjectModel = Depends(get_project_model),
+    nlp_controller: NLPController = Depends(get_nlp_controller),
 ):
-    project_model = await ProjectModel.create_instance(
-        db_client=request.app.database_client
-    )
     project = await project_model.get_project_or_create_one(project_id=project_id)
 
     if not project:
@@ -188,16 +242,11 @@ async def answer_rag(
             content={"signal": ResponseSignal.PROJECT_NOT_FOUND_ERROR.value},
         )
 
-    nlp_controller = NLPController(
-        vectordb_client=request.app.vectordb_client,
-        generation_client=request.app.generation_client,
-        embedding_client=request.app.embedding_client,
-        template_parser=request.app.template_parser,
-    )
     answer, full_prompt, chat_history = await nlp_controller.answer_rag_question(
         project=project,
         query=search_request.text,
         limit=search_request.limit,
+        search_mode=search_request.mode,
     )
     if not answer:
         return JSONResponse(
@@ -215,3 +264,43 @@ async def answer_rag(
             "chat_history": chat_history,
         },
     )
+
+
+# Server-sent events variant of /index/answer: tokens are sent as soon as
+# the model produces them (and the guardrail has cleared them)
+@nlp_router.post("/index/answer/stream/{project_id}")
+async def answer_rag_stream(
+    request: Request,
+    project_id: str,
+    search_request: SearchRequest,
+    project_model: ProjectModel = Depends(get_project_model),
+    nlp_controller: NLPController = Depends(get_nlp_controller),
+):
+    project = await project_model.get_project_or_create_one(project_id=project_id)
+
+    if not project:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"signal": ResponseSignal.PROJECT_NOT_FOUND_ERROR.value},
+        )
+
+    async def event_stream():
+        async for event, data in nlp_controller.answer_rag_question_stream(
+            project=project,
+            query=search_request.text,
+            limit=search_request.limit,
+            search_mode=search_request.mode,
+        ):
+            signal = ResponseSignal.RAG_ANSWER_SUCCESS.value
+            if event == "error":
+                signal = ResponseSignal.RAG_ANSWER_ERROR.value
+            elif event == "blocked":
+                signal = ResponseSignal.RAG_ANSWER_BLOCKED.value
+            payload = json.dumps({"signal": signal, "data": data})
+            yield f"event: {event}\ndata: {payload}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, List
 
 
 class PushRequest(BaseModel):
@@ -13,5 +13,13 @@ class PushRequest(BaseModel):
 class SearchRequest(BaseModel):
     text: str
     limit: Optional[int] = 5
+    # "dense" or "hybrid" (dense + BM25), None -> SEARCH_DEFAULT_MODE
+    mode: Optional[str] = None
     # query: str
-    # top_k: Optional[int] = 5    
\ No newline at end of file
+    # top_k: Optional[int] = 5
+
+
+class BatchSearchRequest(BaseModel):
+    texts: List[str]
+    limit: Optional[int] = 5
+    mode: Optional[str] = None    
\ No newline at end of file
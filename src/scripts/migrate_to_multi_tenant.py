@@ -0,0 +1,113 @@
+# Copy every per-project collection ("collection_<project_id>") into the
+# shared multi-tenant collection of the configured embedding model, tagging
+# each record with its project_id. Vectors are copied, nothing is re-embedded.
+# Legacy integer record ids are remapped to per-project UUIDs.
+# Stop the app first, then set VECTOR_DB_MULTI_TENANT=True once it is done.
+# Run from the src folder:
+#   python -m scripts.migrate_to_multi_tenant [--delete-source] [--dry-run]
+import argparse
+from helpers.config import get_settings
+from controllers.BaseController import BaseController
+from controllers.NLPController import NLPController
+from models.db_schemas import Project
+from stores.lexical.BM25IndexStore import BM25IndexStore
+from stores.llm.LLMProviderFactory import LLMProviderFactory
+from stores.vectordb.VectorDBProviderFactory import VectorDBProviderFactory
+
+
+def run(args):
+    settings = get_settings()
+    llm_factory = LLMProviderFactory(settings)
+    vectordb_client = VectorDBProviderFactory(settings).create(
+        provider=settings.VECTORDB_BACKEND
+    )
+    vectordb_client.connect()
+
+    # Legacy record ids are remapped, the BM25 indexes follow
+    lexical_index_store = None
+    if settings.LEXICAL_INDEX_ENABLED:
+        lexical_index_store = BM25IndexStore(
+            db_path=BaseController().get_database_path(
+                db_name=settings.LEXICAL_INDEX_DB_NAME
+            )
+        )
+
+    nlp_controller = NLPController(
+        generation_client=llm_factory.create(provider=settings.GENERATION_BACKEND),
+        embedding_client=llm_factory.create(provider=settings.EMBEDDING_BACKEND),
+        vectordb_client=vectordb_client,
+        template_parser=None,
+        lexical_index_store=lexical_index_store,
+    )
+    shared_name = nlp_controller.create_shared_collection_name()
+    prefix = nlp_controller.create_collection_name(project_id="")
+
+    source_names = sorted(
+        name
+        for name in vectordb_client.list_all_collections()
+        if name.startswith(prefix)
+    )
+    print(f"{len(source_names)} project collections -> {shared_name}")
+
+    # 1. Copy every project before checking any: a record that overwrote
+    # another project's record would only show in the earlier tenant's count
+    copied, failed = {}, []
+    for source_name in source_names:
+        try:
+            project = Project(project_id=source_name[len(prefix) :])
+        except ValueError:
+            print(f"skipped {source_name}: not a project collection")
+            continue
+
+        if args.dry_run:
+            print(f"would migrate {source_name}")
+            continue
+
+        # Re-running is safe: ids are stable, so copies are upserts
+        no_records = nlp_controller.migrate_to_shared_collection(
+            project=project, batch_size=args.batch_size
+        )
+        if no_records is None:
+            failed.append(source_name)
+            print(f"FAILED {source_name}")
+            continue
+        copied[source_name] = (project, no_records)
+        print(f"copied {source_name}: {no_records} records")
+
+    # 2. Verify every tenant, now that all of them are in the shared collection
+    migrated = []
+    for source_name, (project, no_records) in copied.items():
+        no_tenant_records = vectordb_client.count_tenant_records(
+            collection_name=shared_name, tenant_id=project.project_id
+        )
+        if no_tenant_records < no_records:
+            failed.append(source_name)
+            print(
+                f"FAILED {source_name}: {no_records} records copied, "
+                f"{no_tenant_records} in {shared_name}"
+            )
+            continue
+        migrated.append(source_name)
+
+    # 3. Sources are only deleted once every project verified
+    if args.delete_source and failed:
+        print("--delete-source ignored: some collections failed")
+    elif args.delete_source:
+        for source_name in migrated:
+            vectordb_client.delete_collection(collection_name=source_name)
+            print(f"deleted {source_name}")
+
+    if nlp_controller.lexical_index_store:
+        nlp_controller.lexical_index_store.save_all()
+    vectordb_client.disconnect()
+    print(f"done: {len(migrated)} migrated, {len(failed)} failed")
+    if failed:
+        print("failed collections (kept): " + ", ".join(failed))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--delete-source", action="store_true")
+    parser.add_argument("--dry-run", action="store_true")
+    run(parser.parse_args())
@@ -0,0 +1,150 @@
+import gzip
+import json
+import math
+import os
+import re
+
+
+class BM25Index:
+
+    def __init__(self, file_path: str, k1: float = 1.5, b: float = 0.75):
+        self.file_path = file_path
+        self.k1 = k1
+        self.b = b
+
+        self.record_ids = []  # doc_idx -> vector db record id
+        self.doc_idx_by_record_id = {}
+        self.doc_lengths = []
+        self.doc_terms = []  # doc_idx -> {term: tf}, needed to update a doc
+        self.postings = {}  # term -> {doc_idx: tf}
+        self.total_length = 0
+        self.no_docs = 0
+        self.is_dirty = False
+
+        if os.path.exists(self.file_path):
+            self.load()
+
+    @staticmethod
+    def tokenize(text: str) -> list:
+        return re.findall(r"\w+", text.lower())
+
+    def remove_doc(self, doc_idx: int):
+        for term in self.doc_terms[doc_idx]:
+            term_postings = self.postings[term]
+            term_postings.pop(doc_idx, None)
+            if not term_postings:
+                del self.postings[term]
+        if self.doc_lengths[doc_idx]:
+            self.no_docs -= 1
+        self.total_length -= self.doc_lengths[doc_idx]
+        self.doc_lengths[doc_idx] = 0
+        self.doc_terms[doc_idx] = {}
+
+    # Add or replace documents, keyed by their vector db record id
+    def upsert(self, record_ids: list, texts: list):
+        for record_id, text in zip(record_ids, texts):
+            doc_idx = self.doc_idx_by_record_id.get(record_id)
+            if doc_idx is None:
+                doc_idx = len(self.record_ids)
+                self.record_ids.append(record_id)
+                self.doc_idx_by_record_id[record_id] = doc_idx
+                self.doc_lengths.append(0)
+                self.doc_terms.append({})
+            else:
+                self.remove_doc(doc_idx)
+
+            terms = {}
+            tokens = self.tokenize(text)
+            for token in tokens:
+                terms[token] = terms.get(token, 0) + 1
+            for term, tf in terms.items():
+                self.postings.setdefault(term, {})[doc_idx] = tf
+
+            self.doc_terms[doc_idx] = terms
+            self.doc_lengths[doc_idx] = len(tokens)
+            self.total_length += len(tokens)
+            if tokens:
+                self.no_docs += 1
+
+        self.is_dirty = True
+
+    # The doc slots stay, an upsert of the same record id reuses them
+    def remove(self, record_ids: list):
+        for record_id in record_ids:
+            doc_idx = self.doc_idx_by_record_id.get(record_id)
+            if doc_idx is not None:
+                self.remove_doc(doc_idx)
+        self.is_dirty = True
+
+    # False for unknown and removed record ids
+    def has_record(self, record_id: str) -> bool:
+        doc_idx = self.doc_idx_by_record_id.get(record_id)
+        return doc_idx is not None and bool(self.doc_terms[doc_idx])
+
+    # Returns [(record_id, score)] best first
+    def search(self, query: str, limit: int = 10) -> list:
+        if not self.no_docs:
+            return []
+
+        avg_length = self.total_length / self.no_docs
+        scores = {}
+        for term in set(self.tokenize(query)):
+            term_postings = self.postings.get(term)
+            if not term_postings:
+                continue
+
+            df = len(term_postings)
+            idf = math.log(1 + (self.no_docs - df + 0.5) / (df + 0.5))
+            for doc_idx, tf in term_postings.items():
+                length_norm = (
+                    1 - self.b + self.b * self.doc_lengths[doc_idx] / avg_length
+                )
+                scores[doc_idx] = scores.get(doc_idx, 0.0) + idf * (
+                    tf * (self.k1 + 1) / (tf + self.k1 * length_norm)
+                )
+
+        best = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+        return [(self.record_ids[doc_idx], score) for doc_idx, score in best]
+
+    # On disk: gzipped json, postings flattened to [doc_idx, tf, doc_idx, tf, ...]
+    def save(self):
+        if not self.is_dirty:
+            return
+
+        data = {
+            "record_ids": self.record_ids,
+            "doc_lengths": self.doc_lengths,
+            "postings": {
+                term: [value for item in term_postings.items() for value in item]
+                for term, term_postings in self.postings.items()
+            },
+        }
+        tmp_path = f"{self.file_path}.tmp"
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp_path, self.file_path)
+        self.is_dirty = False
+
+    def load(self):
+        with gzip.open(self.file_path, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+
+        self.record_ids = data["record_ids"]
+        self.doc_idx_by_record_id = {
+            record_id: doc_idx for doc_idx, record_id in enumerate(self.record_ids)
+        }
+        self.doc_lengths = data["doc_lengths"]
+        self.doc_terms = [{} for _ in self.record_ids]
+        self.postings = {}
+        for term, flat_postings in data["postings"].items():
+            term_postings = dict(zip(flat_postings[::2], flat_postings[1::2]))
+            self.postings[term] = term_postings
+            for doc_idx, tf in term_postings.items():
+                self.doc_terms[doc_idx][term] = tf
+
+        self.total_length = sum(self.doc_lengths)
+        self.no_docs = sum(1 for length in self.doc_lengths if length > 0)
+
+    def delete(self):
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
@@ -0,0 +1,29 @@
+from .BM25Index import BM25Index
+import os
+
+
+# One BM25Index per vector db collection, loaded lazily from db_path
+class BM25IndexStore:
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.indexes = {}
+
+    def get_index(self, collection_name: str) -> BM25Index:
+        if collection_name not in self.indexes:
+            self.indexes[collection_name] = BM25Index(
+                file_path=os.path.join(self.db_path, f"{collection_name}.bm25.json.gz")
+            )
+        return self.indexes[collection_name]
+
+    def delete_index(self, collection_name: str):
+        self.get_index(collection_name=collection_name).delete()
+        self.indexes.pop(collection_name, None)
+
+    def save_index(self, collection_name: str):
+        if collection_name in self.indexes:
+            self.indexes[collection_name].save()
+
+    def save_all(self):
+        for index in self.indexes.values():
+            index.save()
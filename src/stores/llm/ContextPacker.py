@@ -0,0 +1,110 @@
+from typing import List
+import math
+import re
+
+
+# Fills the prompt context with the best retrieved chunks that fit the
+# generation model's context window, after reserving the output budget and
+# the fixed prompt parts (system prompt, footer). Tokens are estimated from
+# characters, which is close enough for budgeting and needs no tokenizer.
+class ContextPacker:
+
+    sentence_end_pattern = re.compile(r"(?<=[.!?])\s+|\n+")
+
+    def __init__(
+        self,
+        context_window: int,
+        max_output_tokens: int,
+        chars_per_token: float = 4.0,
+        safety_margin_tokens: int = 64,
+        expected_chunk_tokens: int = 128,
+        min_trimmed_tokens: int = 32,
+        duplicate_threshold: float = 0.9,
+    ):
+        self.context_window = context_window
+        self.max_output_tokens = max_output_tokens or 0
+        self.chars_per_token = chars_per_token
+        self.safety_margin_tokens = safety_margin_tokens
+        self.expected_chunk_tokens = expected_chunk_tokens
+        self.min_trimmed_tokens = min_trimmed_tokens
+        self.duplicate_threshold = duplicate_threshold
+
+    def estimate_tokens(self, text: str) -> int:
+        if not text:
+            return 0
+        return math.ceil(len(text) / self.chars_per_token)
+
+    # Tokens left for the documents once the fixed prompt parts are counted
+    def get_context_budget(self, fixed_prompts: List[str]) -> int:
+        budget = (
+            self.context_window
+            - self.max_output_tokens
+            - self.safety_margin_tokens
+            - sum(self.estimate_tokens(prompt) for prompt in fixed_prompts)
+        )
+        return max(budget, 0)
+
+    # How many chunks are worth retrieving for this budget
+    def get_retrieval_limit(
+        self, budget: int, limit: int, document_overhead_tokens: int = 0
+    ) -> int:
+        per_document = self.expected_chunk_tokens + document_overhead_tokens
+        return max(1, min(limit, budget // max(per_document, 1)))
+
+    # Cut the text to max_tokens, at the last sentence (or word) boundary
+    def trim_text(self, text: str, max_tokens: int) -> str:
+        max_characters = int(max_tokens * self.chars_per_token)
+        if len(text) <= max_characters:
+            return text
+
+        text = text[:max_characters]
+        boundaries = [m.start() for m in self.sentence_end_pattern.finditer(text)]
+        if boundaries and boundaries[-1] > 0:
+            return text[: boundaries[-1]].strip()
+
+        return text.rsplit(" ", 1)[0].strip()
+
+    def is_duplicate(self, words: set, text: str, selected: list) -> bool:
+        for selected_words, selected_text in selected:
+            if text in selected_text:
+                return True
+            union = len(words | selected_words)
+            overlap = len(words & selected_words) / union if union else 0.0
+            if overlap >= self.duplicate_threshold:
+                return True
+        return False
+
+    # Returns the documents to put in the prompt, best score first, with
+    # near-duplicates removed and the last one trimmed to fit the budget
+    def pack(
+        self, documents: list, budget: int, document_overhead_tokens: int = 0
+    ) -> list:
+        packed = []
+        selected = []
+        remaining = budget
+
+        for document in sorted(documents, key=lambda doc: doc.score, reverse=True):
+            text = " ".join((document.text or "").split())
+            if not text:
+                continue
+
+            words = set(text.lower().split())
+            if self.is_duplicate(words, text.lower(), selected):
+                continue
+
+            available = remaining - document_overhead_tokens
+            if available < self.min_trimmed_tokens:
+                break
+
+            tokens = self.estimate_tokens(text)
+            if tokens > available:
+                text = self.trim_text(text, available)
+                if self.estimate_tokens(text) < self.min_trimmed_tokens:
+                    continue
+                tokens = self.estimate_tokens(text)
+
+            packed.append(document.model_copy(update={"text": text}))
+            selected.append((words, text.lower()))
+            remaining -= tokens + document_overhead_tokens
+
+        return packed
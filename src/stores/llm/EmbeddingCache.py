@@ -0,0 +1,190 @@
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+from array import array
+import asyncio
+import hashlib
+import logging
+import os
+import sqlite3
+import time
+
+
+# Content-addressed embedding cache: an in-memory LRU tier in front of an
+# on-disk (sqlite) tier. Keys include the model id and embedding size, so
+# switching EMBEDDING_MODEL_ID never returns stale vectors.
+# Vectors are kept as float32 arrays (a quarter of a list of floats), and
+# the disk tier keeps at most max_disk_items, least recently used go first.
+class EmbeddingCache:
+
+    # Evict down to this share of max_disk_items, not one row per insert
+    disk_eviction_ratio = 0.9
+
+    def __init__(
+        self,
+        db_path: str,
+        max_memory_items: int = 10000,
+        max_disk_items: int = 1000000,
+    ):
+        self.db_path = db_path
+        self.max_memory_items = max_memory_items
+        self.max_disk_items = max_disk_items
+        self.memory_cache = OrderedDict()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        # Every sqlite call runs on this one thread, never on the event loop
+        self.disk_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="embedding-cache"
+        )
+        self.connection = sqlite3.connect(
+            os.path.join(self.db_path, "embeddings.sqlite"), check_same_thread=False
+        )
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB)"
+        )
+        # Caches created before the disk bound have no last_used column
+        columns = [
+            row[1]
+            for row in self.connection.execute("PRAGMA table_info(embeddings)")
+        ]
+        if "last_used" not in columns:
+            self.connection.execute(
+                "ALTER TABLE embeddings ADD COLUMN last_used INTEGER NOT NULL DEFAULT 0"
+            )
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings (last_used)"
+        )
+        self.connection.commit()
+        # Upper bound of the rows on disk, recounted before evicting
+        self.disk_items = self.connection.execute(
+            "SELECT COUNT(*) FROM embeddings"
+        ).fetchone()[0]
+        self.logger = logging.getLogger(__name__)
+
+    def make_key(
+        self, model_id: str, embedding_size: int, document_type: str, text: str
+    ) -> str:
+        text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"{model_id}:{embedding_size}:{document_type}:{text_hash}"
+
+    def remember(self, key: str, vector: array):
+        self.memory_cache[key] = vector
+        self.memory_cache.move_to_end(key)
+        while len(self.memory_cache) > self.max_memory_items:
+            self.memory_cache.popitem(last=False)
+
+    async def run_on_disk_thread(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.disk_executor, func, *args)
+
+    # Returns one vector per key, None where the key is not cached
+    async def aget_many(self, keys: list) -> list:
+        vectors = [None] * len(keys)
+        disk_lookup = {}
+
+        # 1. Memory tier
+        for i, key in enumerate(keys):
+            vector = self.memory_cache.get(key)
+            if vector is not None:
+                self.memory_cache.move_to_end(key)
+                vectors[i] = vector.tolist()
+                self.memory_hits += 1
+            else:
+                disk_lookup.setdefault(key, []).append(i)
+
+        # 2. Disk tier
+        if disk_lookup:
+            disk_vectors = await self.run_on_disk_thread(
+                self.read_disk, list(disk_lookup.keys())
+            )
+            for key, vector in disk_vectors.items():
+                self.remember(key, vector)
+                for idx in disk_lookup[key]:
+                    vectors[idx] = vector.tolist()
+                    self.disk_hits += 1
+
+        self.misses += sum(1 for vector in vectors if vector is None)
+        return vectors
+
+    async def aset_many(self, keys: list, vectors: list):
+        rows = []
+        for key, vector in zip(keys, vectors):
+            vector = array("f", vector)
+            self.remember(key, vector)
+            rows.append((key, vector.tobytes()))
+
+        try:
+            await self.run_on_disk_thread(self.write_disk, rows)
+        except sqlite3.Error as e:
+            # The memory tier still holds the vectors, only persistence is lost
+            self.logger.error(f"Error while writing embeddings to disk cache: {e}")
+
+    # Disk thread: reads the cached keys and marks them as used
+    def read_disk(self, keys: list) -> dict:
+        vectors = {}
+        # sqlite limits the number of bound parameters per query
+        for i in range(0, len(keys), 500):
+            batch_keys = keys[i : i + 500]
+            placeholders = ",".join("?" * len(batch_keys))
+            rows = self.connection.execute(
+                f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                batch_keys,
+            ).fetchall()
+            for key, blob in rows:
+                vectors[key] = array("f", blob)
+
+        found_keys = list(vectors.keys())
+        for i in range(0, len(found_keys), 500):
+            batch_keys = found_keys[i : i + 500]
+            self.connection.execute(
+                "UPDATE embeddings SET last_used = ? WHERE key IN (%s)"
+                % ",".join("?" * len(batch_keys)),
+                [int(time.time())] + batch_keys,
+            )
+        if found_keys:
+            self.connection.commit()
+        return vectors
+
+    # Disk thread: writes the new vectors, then evicts beyond max_disk_items
+    def write_disk(self, rows: list):
+        last_used = int(time.time())
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO embeddings (key, vector, last_used) "
+            "VALUES (?, ?, ?)",
+            [(key, blob, last_used) for key, blob in rows],
+        )
+        self.disk_items += len(rows)
+        if self.disk_items > self.max_disk_items:
+            self.disk_items = self.connection.execute(
+                "SELECT COUNT(*) FROM embeddings"
+            ).fetchone()[0]
+            evict_count = self.disk_items - int(
+                self.max_disk_items * self.disk_eviction_ratio
+            )
+            if self.disk_items > self.max_disk_items and evict_count > 0:
+                self.connection.execute(
+                    "DELETE FROM embeddings WHERE key IN (SELECT key FROM "
+                    "embeddings ORDER BY last_used LIMIT ?)",
+                    (evict_count,),
+                )
+                self.disk_items -= evict_count
+        self.connection.commit()
+
+    def get_stats(self) -> dict:
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (hits / lookups) if lookups else 0.0,
+            "memory_items": len(self.memory_cache),
+            "disk_items": self.disk_items,
+        }
+
+    def close(self):
+        self.disk_executor.shutdown(wait=True)
+        self.connection.close()
@@ -0,0 +1,241 @@
+import asyncio
+import threading
+import httpx
+
+
+# Per-host slots of the concurrency cap, plus the counters of get_stats.
+# Waiters are tracked so a saturated host shows up before its latency does
+class HostSlots:
+
+    def __init__(self, max_concurrency: int = None):
+        self.max_concurrency = max_concurrency
+        self.async_semaphore = None
+        self.sync_semaphore = (
+            threading.BoundedSemaphore(max_concurrency) if max_concurrency else None
+        )
+        # The sync client runs in worker threads
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.waiting = 0
+        self.requests = 0
+
+    def add_waiting(self, count: int):
+        with self.lock:
+            self.waiting += count
+
+    def start_request(self):
+        with self.lock:
+            self.in_flight += 1
+            self.requests += 1
+
+    def finish_request(self):
+        with self.lock:
+            self.in_flight -= 1
+
+    # Created lazily, inside the event loop that uses it
+    def get_async_semaphore(self):
+        if self.max_concurrency and self.async_semaphore is None:
+            self.async_semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self.async_semaphore
+
+
+# The slot is held until the response body is closed, so a streamed answer
+# keeps its slot while tokens are coming in
+class SlotReleasingAsyncStream(httpx.AsyncByteStream):
+
+    def __init__(self, stream, release):
+        self.stream = stream
+        self.release = release
+
+    async def __aiter__(self):
+        async for chunk in self.stream:
+            yield chunk
+
+    async def aclose(self):
+        try:
+            await self.stream.aclose()
+        finally:
+            self.release()
+
+
+class SlotReleasingSyncStream(httpx.SyncByteStream):
+
+    def __init__(self, stream, release):
+        self.stream = stream
+        self.release = release
+
+    def __iter__(self):
+        for chunk in self.stream:
+            yield chunk
+
+    def close(self):
+        try:
+            self.stream.close()
+        finally:
+            self.release()
+
+
+class HostLimitedAsyncTransport(httpx.AsyncBaseTransport):
+
+    def __init__(self, pool: "HTTPClientPool", transport: httpx.AsyncHTTPTransport):
+        self.pool = pool
+        self.transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        slots = self.pool.get_host_slots(request.url.host)
+        semaphore = slots.get_async_semaphore()
+        if semaphore:
+            slots.add_waiting(1)
+            try:
+                await semaphore.acquire()
+            finally:
+                slots.add_waiting(-1)
+
+        released = False
+
+        def release():
+            nonlocal released
+            if not released:
+                released = True
+                slots.finish_request()
+                if semaphore:
+                    semaphore.release()
+
+        slots.start_request()
+        try:
+            response = await self.transport.handle_async_request(request)
+        except BaseException:
+            release()
+            raise
+
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=SlotReleasingAsyncStream(response.stream, release),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self):
+        await self.transport.aclose()
+
+
+class HostLimitedSyncTransport(httpx.BaseTransport):
+
+    def __init__(self, pool: "HTTPClientPool", transport: httpx.HTTPTransport):
+        self.pool = pool
+        self.transport = transport
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        slots = self.pool.get_host_slots(request.url.host)
+        semaphore = slots.sync_semaphore
+        if semaphore:
+            slots.add_waiting(1)
+            try:
+                semaphore.acquire()
+            finally:
+                slots.add_waiting(-1)
+
+        released = False
+
+        def release():
+            nonlocal released
+            if not released:
+                released = True
+                slots.finish_request()
+                if semaphore:
+                    semaphore.release()
+
+        slots.start_request()
+        try:
+            response = self.transport.handle_request(request)
+        except BaseException:
+            release()
+            raise
+
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=SlotReleasingSyncStream(response.stream, release),
+            extensions=response.extensions,
+        )
+
+    def close(self):
+        self.transport.close()
+
+
+# One pooled HTTP client pair (sync + async) shared by every LLM provider,
+# built once in main.lifespan and injected through LLMProviderFactory. The
+# generation and embedding providers reuse the same keep-alive connections
+# (and TLS sessions) when they talk to the same host, and each host gets at
+# most max_concurrency_per_host requests in flight (None -> no cap), the
+# others wait for a slot instead of opening new connections under bursts.
+class HTTPClientPool:
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        http2: bool = False,
+        max_concurrency_per_host: int = None,
+        timeout: float = 60.0,
+        connect_timeout: float = 5.0,
+    ):
+        self.max_concurrency_per_host = max_concurrency_per_host
+        self.host_slots = {}
+        self.host_slots_lock = threading.Lock()
+
+        limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        timeout = httpx.Timeout(timeout, connect=connect_timeout)
+
+        self.async_transport = httpx.AsyncHTTPTransport(limits=limits, http2=http2)
+        self.sync_transport = httpx.HTTPTransport(limits=limits, http2=http2)
+        self.async_client = httpx.AsyncClient(
+            transport=HostLimitedAsyncTransport(self, self.async_transport),
+            timeout=timeout,
+        )
+        self.client = httpx.Client(
+            transport=HostLimitedSyncTransport(self, self.sync_transport),
+            timeout=timeout,
+        )
+
+    def get_host_slots(self, host: str) -> HostSlots:
+        with self.host_slots_lock:
+            if host not in self.host_slots:
+                self.host_slots[host] = HostSlots(self.max_concurrency_per_host)
+            return self.host_slots[host]
+
+    # Open connections of an httpx transport, from its httpcore pool
+    def get_connections_stats(self, transport) -> dict:
+        connections = getattr(getattr(transport, "_pool", None), "connections", [])
+        return {
+            "connections": len(connections),
+            "idle_connections": sum(
+                connection.is_idle() for connection in connections
+            ),
+            "http2_connections": sum(
+                "HTTP/2" in connection.info() for connection in connections
+            ),
+        }
+
+    def get_stats(self) -> dict:
+        return {
+            "async": self.get_connections_stats(self.async_transport),
+            "sync": self.get_connections_stats(self.sync_transport),
+            "hosts": {
+                host: {
+                    "in_flight": slots.in_flight,
+                    "waiting": slots.waiting,
+                    "requests": slots.requests,
+                }
+                for host, slots in self.host_slots.items()
+            },
+        }
+
+    async def aclose(self):
+        await self.async_client.aclose()
+        self.client.close()
@@ -4,6 +4,9 @@ class LLMEnums(Enum):
 
     OPENAI = "OPENAI"
     COHERE = "COHERE"
+    # Offline backends for benchmarks and load tests
+    LOCAL_HASH = "LOCAL_HASH"
+    ECHO = "ECHO"
 
 
 class OpenAIEnums(Enum):
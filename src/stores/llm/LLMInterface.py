@@ -17,6 +17,7 @@ class LLMInterface(ABC):
         chat_history: list = [],
         max_output_tokens: int = None,
         temperature: float = None,
+        stream: bool = False,
     ):
         pass
 
@@ -24,6 +25,36 @@ class LLMInterface(ABC):
     def embed_text(self, text: str, document_type: str = None):
         pass
 
+    @abstractmethod
+    def embed_texts(
+        self, texts: list, document_type: str = None, batch_size: int = None
+    ):
+        pass
+
+    # Async variants, backed by the SDKs' async clients so the event loop is
+    # never blocked while waiting on the model server.
+    # With stream=True the generate methods return an iterator of text tokens
+    @abstractmethod
+    async def agenerate_text(
+        self,
+        prompt: str,
+        chat_history: list = [],
+        max_output_tokens: int = None,
+        temperature: float = None,
+        stream: bool = False,
+    ):
+        pass
+
+    @abstractmethod
+    async def aembed_text(self, text: str, document_type: str = None):
+        pass
+
+    @abstractmethod
+    async def aembed_texts(
+        self, texts: list, document_type: str = None, batch_size: int = None
+    ):
+        pass
+
     @abstractmethod
     def construct_prompt(self, prompt: str, role: str):
         pass
\ No newline at end of file
@@ -1,10 +1,25 @@
 from .LLMEnums import LLMEnums
-from .providers import OpenAIProvider, CoHereProvider
+from .providers import (
+    OpenAIProvider,
+    CoHereProvider,
+    LocalHashProvider,
+    EchoProvider,
+)
 
 
 class LLMProviderFactory:
-    def __init__(self, config: dict):
+    # http_client_pool: HTTPClientPool shared by the HTTP providers
+    def __init__(self, config: dict, http_client_pool=None):
         self.config = config
+        self.http_client_pool = http_client_pool
+
+    # Generation prompts only: a safety net, RAG prompts are packed to the
+    # context window upstream. Embedding inputs are truncated by the
+    # providers' process_text to INPUT_DEFAULT_MAX_CHARACTERS
+    def get_prompt_max_characters(self):
+        return int(
+            self.config.GENERATION_CONTEXT_WINDOW * self.config.CONTEXT_CHARS_PER_TOKEN
+        )
 
     def create(self, provider: str):
         if provider == LLMEnums.OPENAI.value:
@@ -14,6 +29,9 @@ class LLMProviderFactory:
                 default_input_max_characters=self.config.INPUT_DEFAULT_MAX_CHARACTERS,
                 default_generation_max_output_tokens=self.config.GENERATION_DEFAULT_MAX_TOKENS,
                 default_generation_temperature=self.config.GENERATION_DEFAULT_TEMPERATURE,
+                default_embedding_batch_size=self.config.EMBEDDING_DEFAULT_BATCH_SIZE,
+                default_prompt_max_characters=self.get_prompt_max_characters(),
+                http_client_pool=self.http_client_pool,
             )
         if provider == LLMEnums.COHERE.value:
             return CoHereProvider(
@@ -21,5 +39,22 @@ class LLMProviderFactory:
                 default_input_max_characters=self.config.INPUT_DEFAULT_MAX_CHARACTERS,
                 default_generation_max_output_tokens=self.config.GENERATION_DEFAULT_MAX_TOKENS,
                 default_generation_temperature=self.config.GENERATION_DEFAULT_TEMPERATURE,
+                default_embedding_batch_size=self.config.EMBEDDING_DEFAULT_BATCH_SIZE,
+                default_prompt_max_characters=self.get_prompt_max_characters(),
+                http_client_pool=self.http_client_pool,
+            )
+        if provider == LLMEnums.LOCAL_HASH.value:
+            return LocalHashProvider(
+                max_ngram=self.config.LOCAL_HASH_MAX_NGRAM,
+                latency_ms=self.config.LOCAL_HASH_LATENCY_MS,
+                jitter_ms=self.config.LOCAL_HASH_JITTER_MS,
+                default_embedding_batch_size=self.config.EMBEDDING_DEFAULT_BATCH_SIZE,
+            )
+        if provider == LLMEnums.ECHO.value:
+            return EchoProvider(
+                latency_ms=self.config.ECHO_LATENCY_MS,
+                jitter_ms=self.config.ECHO_JITTER_MS,
+                default_generation_max_output_tokens=self.config.GENERATION_DEFAULT_MAX_TOKENS,
+                default_prompt_max_characters=self.get_prompt_max_characters(),
             )
         return None
@@ -12,17 +12,30 @@ class CoHereProvider(LLMInterface):
         default_input_max_characters: int = 1000,
         default_generation_max_output_tokens: int = 1000,
         default_generation_temperature: float = 0.1,
+        default_embedding_batch_size: int = 64,
+        default_prompt_max_characters: int = None,
+        http_client_pool=None,
     ):
         self.api_key = api_key
         self.default_input_max_characters = default_input_max_characters
         self.default_generation_max_output_tokens = default_generation_max_output_tokens
         self.default_generation_temperature = default_generation_temperature
+        self.default_embedding_batch_size = default_embedding_batch_size
+        self.default_prompt_max_characters = default_prompt_max_characters
 
         self.generation_model_id = None
         self.embedding_model_id = None
         self.embedding_size = None
 
-        self.client = cohere.Client(api_key=self.api_key)
+        # Shared pooled connections (HTTPClientPool), SDK defaults without it
+        self.client = cohere.Client(
+            api_key=self.api_key,
+            httpx_client=http_client_pool.client if http_client_pool else None,
+        )
+        self.async_client = cohere.AsyncClient(
+            api_key=self.api_key,
+            httpx_client=http_client_pool.async_client if http_client_pool else None,
+        )
         self.enums = CoHereEnums
         self.logger = logging.getLogger(__name__)
 
@@ -35,8 +48,9 @@ class CoHereProvider(LLMInterface):
         self.embedding_size = embedding_size
         return self.embedding_model_id
 
-    def process_text(self, text: str):
-        return text[: self.default_input_max_characters].strip()
+    def process_text(self, text: str, max_characters: int = None):
+        max_characters = max_characters or self.default_input_max_characters
+        return text[:max_characters].strip()
 
     def generate_text(
         self,
@@ -44,6 +58,7 @@ class CoHereProvider(LLMInterface):
         chat_history: list = [],
         max_output_tokens: int = None,
         temperature: float = None,
+        stream: bool = False,
     ):
         if not self.client or not self.generation_model_id:
             return None
@@ -57,10 +72,24 @@ class CoHereProvider(LLMInterface):
             else self.default_generation_temperature
         )
 
+        if stream:
+            response = self.client.chat_stream(
+                model=self.generation_model_id,
+                chat_history=chat_history,
+                message=self.process_text(
+                    prompt, max_characters=self.default_prompt_max_characters
+                ),
+                temperature=temperature,
+                max_tokens=max_output_tokens,
+            )
+            return self.iter_stream_tokens(response)
+
         response = self.client.chat(
             model=self.generation_model_id,
             chat_history=chat_history,
-            message=self.process_text(prompt),
+            message=self.process_text(
+                prompt, max_characters=self.default_prompt_max_characters
+            ),
             temperature=temperature,
             max_tokens=max_output_tokens,
         )
@@ -82,6 +111,137 @@ class CoHereProvider(LLMInterface):
         )
         return response.embeddings.float[0] if response else None
 
+    def embed_texts(
+        self, texts: list, document_type: str = None, batch_size: int = None
+    ):
+        if not self.client or not self.embedding_model_id:
+            return None
+
+        input_type = CoHereEnums.DOCUMENT.value
+        if document_type == DocumentTypeEnum.QUERY.value:
+            input_type = CoHereEnums.QUERY.value
+
+        batch_size = batch_size or self.default_embedding_batch_size
+        vectors = []
+        for i in range(0, len(texts), batch_size):
+            batch_texts = [
+                self.process_text(text) for text in texts[i : i + batch_size]
+            ]
+            response = self.client.embed(
+                model=self.embedding_model_id,
+                texts=batch_texts,
+                input_type=input_type,
+                embedding_types=["float"],
+            )
+            if not response or len(response.embeddings.float) != len(batch_texts):
+                self.logger.error("Error while Embedding batch with CoHere")
+                return None
+            vectors.extend(response.embeddings.float)
+
+        return vectors
+
+    async def agenerate_text(
+        self,
+        prompt: str,
+        chat_history: list = [],
+        max_output_tokens: int = None,
+        temperature: float = None,
+        stream: bool = False,
+    ):
+        if not self.async_client or not self.generation_model_id:
+            return None
+
+        max_output_tokens = (
+            max_output_tokens or self.default_generation_max_output_tokens
+        )
+        temperature = (
+            temperature
+            if temperature is not None
+            else self.default_generation_temperature
+        )
+
+        if stream:
+            response = self.async_client.chat_stream(
+                model=self.generation_model_id,
+                chat_history=chat_history,
+                message=self.process_text(
+                    prompt, max_characters=self.default_prompt_max_characters
+                ),
+                temperature=temperature,
+                max_tokens=max_output_tokens,
+            )
+            return self.aiter_stream_tokens(response)
+
+        response = await self.async_client.chat(
+            model=self.generation_model_id,
+            chat_history=chat_history,
+            message=self.process_text(
+                prompt, max_characters=self.default_prompt_max_characters
+            ),
+            temperature=temperature,
+            max_tokens=max_output_tokens,
+        )
+        return response.text if response else None
+
+    async def aembed_text(self, text: str, document_type: str = None):
+        vectors = await self.aembed_texts(
+            texts=[text], document_type=document_type, batch_size=1
+        )
+        return vectors[0] if vectors else None
+
+    async def aembed_texts(
+        self, texts: list, document_type: str = None, batch_size: int = None
+    ):
+        if not self.async_client or not self.embedding_model_id:
+            return None
+
+        input_type = CoHereEnums.DOCUMENT.value
+        if document_type == DocumentTypeEnum.QUERY.value:
+            input_type = CoHereEnums.QUERY.value
+
+        batch_size = batch_size or self.default_embedding_batch_size
+        vectors = []
+        for i in range(0, len(texts), batch_size):
+            batch_texts = [
+                self.process_text(text) for text in texts[i : i + batch_size]
+            ]
+            response = await self.async_client.embed(
+                model=self.embedding_model_id,
+                texts=batch_texts,
+                input_type=input_type,
+                embedding_types=["float"],
+            )
+            if not response or len(response.embeddings.float) != len(batch_texts):
+                self.logger.error("Error while Embedding batch with CoHere")
+                return None
+            vectors.extend(response.embeddings.float)
+
+        return vectors
+
+    # Only "text-generation" events carry answer tokens. chat_stream returns
+    # a generator, closing it closes the HTTP response (and frees the host
+    # slot) when the consumer stops early
+    def iter_stream_tokens(self, response):
+        try:
+            for event in response:
+                if event.event_type == "text-generation":
+                    yield event.text
+        finally:
+            response.close()
+
+    async def aiter_stream_tokens(self, response):
+        try:
+            async for event in response:
+                if event.event_type == "text-generation":
+                    yield event.text
+        finally:
+            await response.aclose()
+
     # Required by LLMInterface
     def construct_prompt(self, prompt: str, role: str):
-        return {"role": role, "text": self.process_text(prompt)}
+        return {
+            "role": role,
+            "text": self.process_text(
+                prompt, max_characters=self.default_prompt_max_characters
+            ),
+        }
@@ -0,0 +1,129 @@
+from ..LLMInterface import LLMInterface
+from ..LLMEnums import OpenAIEnums
+import asyncio
+import logging
+import random
+import time
+
+
+# Offline generation backend: the answer is the first max_output_tokens
+# words of the prompt, after a simulated latency. Deterministic, no model
+# server, so /index/answer throughput can be measured without a provider.
+# Embedding is not supported (see LocalHashProvider).
+class EchoProvider(LLMInterface):
+
+    def __init__(
+        self,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        default_generation_max_output_tokens: int = 1000,
+        default_prompt_max_characters: int = None,
+    ):
+        # Simulated provider round trip: latency + uniform(0, jitter) per call
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.default_generation_max_output_tokens = default_generation_max_output_tokens
+        self.default_prompt_max_characters = default_prompt_max_characters
+
+        self.generation_model_id = None
+        self.embedding_model_id = None
+        self.embedding_size = None
+
+        self.random = random.Random(0)
+        self.enums = OpenAIEnums
+        self.logger = logging.getLogger(__name__)
+
+    def get_generation_model(self, model_id: str):
+        self.generation_model_id = model_id
+
+    def get_embedding_model(self, model_id: str, embedding_size: int):
+        self.embedding_model_id = model_id
+        self.embedding_size = embedding_size
+
+    def process_text(self, text: str, max_characters: int = None):
+        if text is None:
+            return ""
+        if not max_characters:
+            return text.strip()
+        return text[:max_characters].strip()
+
+    def get_delay(self) -> float:
+        return (self.latency_ms + self.random.uniform(0, self.jitter_ms)) / 1000
+
+    def echo_tokens(self, prompt: str, max_output_tokens: int = None) -> list:
+        max_output_tokens = (
+            max_output_tokens
+            if max_output_tokens
+            else self.default_generation_max_output_tokens
+        )
+        return [f"{word} " for word in prompt.split()[:max_output_tokens]]
+
+    def generate_text(
+        self,
+        prompt: str,
+        chat_history: list = [],
+        max_output_tokens: int = None,
+        temperature: float = None,
+        stream: bool = False,
+    ):
+        chat_history.append(
+            self.construct_prompt(prompt=prompt, role=OpenAIEnums.USER.value)
+        )
+        time.sleep(self.get_delay())
+        tokens = self.echo_tokens(
+            prompt=chat_history[-1]["content"], max_output_tokens=max_output_tokens
+        )
+        if stream:
+            return iter(tokens)
+        return "".join(tokens).strip()
+
+    def embed_text(self, text: str, document_type: str = None):
+        self.logger.error("ECHO is a generation backend only")
+        return None
+
+    def embed_texts(
+        self, texts: list, document_type: str = None, batch_size: int = None
+    ):
+        self.logger.error("ECHO is a generation backend only")
+        return None
+
+    async def agenerate_text(
+        self,
+        prompt: str,
+        chat_history: list = [],
+        max_output_tokens: int = None,
+        temperature: float = None,
+        stream: bool = False,
+    ):
+        chat_history.append(
+            self.construct_prompt(prompt=prompt, role=OpenAIEnums.USER.value)
+        )
+        await asyncio.sleep(self.get_delay())
+        tokens = self.echo_tokens(
+            prompt=chat_history[-1]["content"], max_output_tokens=max_output_tokens
+        )
+        if stream:
+            return self.aiter_tokens(tokens)
+        return "".join(tokens).strip()
+
+    async def aiter_tokens(self, tokens: list):
+        for token in tokens:
+            yield token
+
+    async def aembed_text(self, text: str, document_type: str = None):
+        self.logger.error("ECHO is a generation backend only")
+        return None
+
+    async def aembed_texts(
+        self, texts: list, document_type: str = None, batch_size: int = None
+    ):
+        self.logger.error("ECHO is a generation backend only")
+        return None
+
+    def construct_prompt(self, prompt: str, role: str):
+        return {
+            "role": role,
+            "content": self.process_text(
+                prompt, max_characters=self.default_prompt_max_characters
+            ),
+        }
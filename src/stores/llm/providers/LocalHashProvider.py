@@ -0,0 +1,135 @@
+from ..LLMInterface import LLMInterface
+from ..LLMEnums import OpenAIEnums
+from functools import lru_cache
+import asyncio
+import hashlib
+import logging
+import math
+import random
+import re
+import time
+
+
+# Stable across processes (the built-in hash() is salted per process):
+# a token -> (dimension, sign) pair
+@lru_cache(maxsize=100_000)
+def hash_feature(feature: str, embedding_size: int):
+    digest = int.from_bytes(
+        hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little"
+    )
+    return digest % embedding_size, 1.0 if digest >> 63 else -1.0
+
+
+# Offline embedding backend: signed feature hashing of the word n-grams of a
+# text, L2-normalized. Deterministic, no model server, so ingestion and
+# search can be load-tested without a provider. Texts sharing words get
+# similar vectors, which is enough for retrieval smoke tests.
+# Generation is not supported (see EchoProvider).
+class LocalHashProvider(LLMInterface):
+
+    token_pattern = re.compile(r"\w+")
+
+    def __init__(
+        self,
+        max_ngram: int = 2,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        default_embedding_batch_size: int = 64,
+    ):
+        self.max_ngram = max_ngram
+        # Simulated provider round trip: latency + uniform(0, jitter) per call
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.default_embedding_batch_size = default_embedding_batch_size
+
+        self.generation_model_id = None
+        self.embedding_model_id = None
+        self.embedding_size = None
+
+        self.random = random.Random(0)
+        self.enums = OpenAIEnums
+        self.logger = logging.getLogger(__name__)
+
+    def get_generation_model(self, model_id: str):
+        self.generation_model_id = model_id
+
+    def get_embedding_model(self, model_id: str, embedding_size: int):
+        self.embedding_model_id = model_id
+        self.embedding_size = embedding_size
+
+    def get_delay(self) -> float:
+        return (self.latency_ms + self.random.uniform(0, self.jitter_ms)) / 1000
+
+    def hash_text(self, text: str) -> list:
+        tokens = self.token_pattern.findall((text or "").lower())
+        vector = [0.0] * self.embedding_size
+        for n in range(1, self.max_ngram + 1):
+            for i in range(len(tokens) - n + 1):
+                dimension, sign = hash_feature(
+                    " ".join(tokens[i : i + n]), self.embedding_size
+                )
+                vector[dimension] += sign
+
+        norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+        return [value / norm for value in vector]
+
+    def generate_text(
+        self,
+        prompt: str,
+        chat_history: list = [],
+        max_output_tokens: int = None,
+        temperature: float = None,
+        stream: bool = False,
+    ):
+        self.logger.error("LOCAL_HASH is an embedding backend only")
+        return None
+
+    def embed_text(self, text: str, document_type: str = None):
+        vectors = self.embed_texts(texts=[text], document_type=document_type)
+        return vectors[0] if vectors else None
+
+    def embed_texts(
+        self, texts: list, document_type: str = None, batch_size: int = None
+    ):
+        if not self.embedding_size:
+            self.logger.error("Embedding size for LOCAL_HASH was not set")
+            return None
+
+        batch_size = batch_size or self.default_embedding_batch_size
+        vectors = []
+        for i in range(0, len(texts), batch_size):
+            time.sleep(self.get_delay())
+            vectors.extend(self.hash_text(text) for text in texts[i : i + batch_size])
+        return vectors
+
+    async def agenerate_text(
+        self,
+        prompt: str,
+        chat_history: list = [],
+        max_output_tokens: int = None,
+        temperature: float = None,
+        stream: bool = False,
+    ):
+        self.logger.error("LOCAL_HASH is an embedding backend only")
+        return None
+
+    async def aembed_text(self, text: str, document_type: str = None):
+        vectors = await self.aembed_texts(texts=[text], document_type=document_type)
+        return vectors[0] if vectors else None
+
+    async def aembed_texts(
+        self, texts: list, document_type: str = None, batch_size: int = None
+    ):
+        if not self.embedding_size:
+            self.logger.error("Embedding size for LOCAL_HASH was not set")
+            return None
+
+        batch_size = batch_size or self.default_embedding_batch_size
+        vectors = []
+        for i in range(0, len(texts), batch_size):
+            await asyncio.sleep(self.get_delay())
+            vectors.extend(self.hash_text(text) for text in texts[i : i + batch_size])
+        return vectors
+
+    def construct_prompt(self, prompt: str, role: str):
+        return {"role": role, "content": prompt}
@@ -1,7 +1,7 @@
 from sqlalchemy import text
 from ..LLMInterface import LLMInterface
 from ..LLMEnums import OpenAIEnums
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
 import logging
 
 
@@ -15,18 +15,33 @@ class OpenAIProvider(LLMInterface):
         default_input_max_characters: int = 1000,
         default_generation_max_output_tokens: int = 1000,
         default_generation_temperature: float = 0.1,
+        default_embedding_batch_size: int = 64,
+        default_prompt_max_characters: int = None,
+        http_client_pool=None,
     ):
         self.api_key = api_key
         self.api_url = api_url
         self.default_input_max_characters = default_input_max_characters
         self.default_generation_max_output_tokens = default_generation_max_output_tokens
         self.default_generation_temperature = default_generation_temperature
+        self.default_embedding_batch_size = default_embedding_batch_size
+        self.default_prompt_max_characters = default_prompt_max_characters
 
         self.generation_model_id = None
         self.embedding_model_id = None
         self.embedding_size = None
 
-        self.client = OpenAI(api_key=self.api_key, base_url=self.api_url)
+        # Shared pooled connections (HTTPClientPool), SDK defaults without it
+        self.client = OpenAI(
+            api_key=self.api_key,
+            base_url=self.api_url,
+            http_client=http_client_pool.client if http_client_pool else None,
+        )
+        self.async_client = AsyncOpenAI(
+            api_key=self.api_key,
+            base_url=self.api_url,
+            http_client=http_client_pool.async_client if http_client_pool else None,
+        )
         self.enums = OpenAIEnums
         self.logger = logging.getLogger(__name__)
 
@@ -40,10 +55,11 @@ class OpenAIProvider(LLMInterface):
         self.embedding_size = embedding_size
 
     # function to process text
-    def process_text(self, text: str):
+    def process_text(self, text: str, max_characters: int = None):
         if text is None:
             return ""
-        return text[: self.default_input_max_characters].strip()
+        max_characters = max_characters or self.default_input_max_characters
+        return text[:max_characters].strip()
 
     # function to Generate Text
     def generate_text(
@@ -52,6 +68,7 @@ class OpenAIProvider(LLMInterface):
         chat_history: list = [],
         max_output_tokens: int = None,
         temperature: float = None,
+        stream: bool = False,
     ):
         # Validations
         if not self.client:
@@ -78,7 +95,10 @@ class OpenAIProvider(LLMInterface):
             messages=chat_history,
             max_tokens=max_output_tokens,
             temperature=temperature,
+            stream=stream,
         )
+        if stream:
+            return self.iter_stream_tokens(response)
         # Validations
         if (
             not response
@@ -104,7 +124,7 @@ class OpenAIProvider(LLMInterface):
         # If all went good we send msg to be converted to vector embedding
         response = self.client.embeddings.create(
             model=self.embedding_model_id,
-            input=text,
+            input=self.process_text(text),
         )
         # Validations
         if (
@@ -118,6 +138,155 @@ class OpenAIProvider(LLMInterface):
         # If all went good return what expected
         return response.data[0].embedding
 
+    # function to Embed many texts (one request per batch instead of per text)
+    def embed_texts(
+        self, texts: list, document_type: str = None, batch_size: int = None
+    ):
+        # Validations
+        if not self.client:
+            self.logger.error("OpenAI client was not set")
+            return None
+
+        if not self.embedding_model_id:
+            self.logger.error("Embedding model for OpenAI was not set")
+            return None
+
+        batch_size = batch_size or self.default_embedding_batch_size
+        vectors = []
+        for i in range(0, len(texts), batch_size):
+            batch_texts = [
+                self.process_text(text) for text in texts[i : i + batch_size]
+            ]
+            response = self.client.embeddings.create(
+                model=self.embedding_model_id,
+                input=batch_texts,
+            )
+            # Validations
+            if not response or not response.data or len(response.data) != len(
+                batch_texts
+            ):
+                self.logger.error("Error while Embedding batch with OpenAI")
+                return None
+            # The API may return items out of order, "index" maps them back
+            batch_records = sorted(response.data, key=lambda record: record.index)
+            vectors.extend(record.embedding for record in batch_records)
+
+        return vectors
+
+    # Async function to Generate Text (does not block the event loop)
+    async def agenerate_text(
+        self,
+        prompt: str,
+        chat_history: list = [],
+        max_output_tokens: int = None,
+        temperature: float = None,
+        stream: bool = False,
+    ):
+        # Validations
+        if not self.async_client:
+            self.logger.error("OpenAI async client was not set")
+            return None
+
+        if not self.generation_model_id:
+            self.logger.error("Generation model for OpenAI was not set")
+            return None
+
+        max_output_tokens = (
+            max_output_tokens
+            if max_output_tokens
+            else self.default_generation_max_output_tokens
+        )
+        temperature = (
+            temperature if temperature else self.default_generation_temperature
+        )
+        chat_history.append(
+            self.construct_prompt(prompt=prompt, role=OpenAIEnums.USER.value)
+        )
+        response = await self.async_client.chat.completions.create(
+            model=self.generation_model_id,
+            messages=chat_history,
+            max_tokens=max_output_tokens,
+            temperature=temperature,
+            stream=stream,
+        )
+        if stream:
+            return self.aiter_stream_tokens(response)
+        # Validations
+        if (
+            not response
+            or not response.choices
+            or len(response.choices) == 0
+            or not response.choices[0].message
+        ):
+            self.logger.error("Error while generating text with OpenAI")
+            return None
+        return response.choices[0].message.content
+
+    # Async function to Embed text
+    async def aembed_text(self, text: str, document_type: str = None):
+        vectors = await self.aembed_texts(
+            texts=[text], document_type=document_type, batch_size=1
+        )
+        return vectors[0] if vectors else None
+
+    # Async function to Embed many texts
+    async def aembed_texts(
+        self, texts: list, document_type: str = None, batch_size: int = None
+    ):
+        # Validations
+        if not self.async_client:
+            self.logger.error("OpenAI async client was not set")
+            return None
+
+        if not self.embedding_model_id:
+            self.logger.error("Embedding model for OpenAI was not set")
+            return None
+
+        batch_size = batch_size or self.default_embedding_batch_size
+        vectors = []
+        for i in range(0, len(texts), batch_size):
+            batch_texts = [
+                self.process_text(text) for text in texts[i : i + batch_size]
+            ]
+            response = await self.async_client.embeddings.create(
+                model=self.embedding_model_id,
+                input=batch_texts,
+            )
+            # Validations
+            if not response or not response.data or len(response.data) != len(
+                batch_texts
+            ):
+                self.logger.error("Error while Embedding batch with OpenAI")
+                return None
+            batch_records = sorted(response.data, key=lambda record: record.index)
+            vectors.extend(record.embedding for record in batch_records)
+
+        return vectors
+
+    # function to turn a streamed completion into text tokens. The response
+    # is closed even when the consumer stops early (guardrail, client gone),
+    # that is what releases the connection and its HTTPClientPool host slot
+    def iter_stream_tokens(self, response):
+        try:
+            for chunk in response:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        finally:
+            response.close()
+
+    async def aiter_stream_tokens(self, response):
+        try:
+            async for chunk in response:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        finally:
+            await response.close()
+
     # function to Construct Prompt
     def construct_prompt(self, prompt: str, role: str):
-        return {"role": role, "content": self.process_text(prompt)}
+        return {
+            "role": role,
+            "content": self.process_text(
+                prompt, max_characters=self.default_prompt_max_characters
+            ),
+        }
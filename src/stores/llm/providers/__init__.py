@@ -1,2 +1,4 @@
 from .CoHereProvider import CoHereProvider
-from .OpenAIProvider import OpenAIProvider
\ No newline at end of file
+from .OpenAIProvider import OpenAIProvider
+from .LocalHashProvider import LocalHashProvider
+from .EchoProvider import EchoProvider
\ No newline at end of file
@@ -1,3 +1,5 @@
+from string import Template
+import importlib
 import os
 
 
@@ -8,49 +10,69 @@ class TemplateParser:
         self.default_language = default_language
         self.language = None
 
+        # {(language, group): {key: str | Template}}, filled once at startup
+        # so rendering never touches the filesystem
+        self.registry = {}
+        self.load_templates()
+
         self.set_language(language)
 
+    # Import and compile every locale group once
+    def load_templates(self):
+        locales_path = os.path.join(self.current_path, "locales")
+        for language in os.listdir(locales_path):
+            language_path = os.path.join(locales_path, language)
+            if not os.path.isdir(language_path) or language.startswith("__"):
+                continue
+
+            for file_name in os.listdir(language_path):
+                group, extension = os.path.splitext(file_name)
+                if extension != ".py" or group.startswith("__"):
+                    continue
+
+                module = importlib.import_module(
+                    f"stores.llm.templates.locales.{language}.{group}"
+                )
+                self.registry[(language, group)] = {
+                    key: value
+                    for key, value in vars(module).items()
+                    if not key.startswith("_")
+                    and isinstance(value, (str, Template))
+                }
+
     # Set language for template parser for Run-time use
     def set_language(self, language: str):
-        if not language:
-            self.language = self.default_language
-
-        language_path = os.path.join(self.current_path, "locales", language)
-        if os.path.exists(language_path):
+        if language and any(lang == language for lang, _ in self.registry):
             self.language = language
         else:
             self.language = self.default_language
 
+    # Template lookup with fallback to the default language
+    def get_template(self, group: str, key: str):
+        for language in (self.language, self.default_language):
+            template = self.registry.get((language, group), {}).get(key)
+            if template is not None:
+                return template
+        return None
+
     # Get template by group and key
     def get_local_template(self, group: str, key: str, vars: dict = {}):
         if not group or not key:
             return None
 
-        group_path = os.path.join(
-            self.current_path, "locales", self.language, f"{group}.py"
-        )
-        targeted_language = self.language
-        if not os.path.exists(group_path):
-            group_path = os.path.join(
-                self.current_path, "locales", self.default_language, f"{group}.py"
-            )
-            targeted_language = self.default_language
-
-        if not os.path.exists(group_path):
-            return None
+        template = self.get_template(group=group, key=key)
+        if isinstance(template, Template):
+            return template.substitute(vars)
+        return template
 
-        # Import Group Module on runtime
-        module = __import__(
-            f"stores.llm.templates.locales.{targeted_language}.{group}",
-            fromlist=[group],
-        )
-        if not module:
-            module = __import__(
-                f"stores.llm.templates.locales.{self.default_language}.{group}",
-                fromlist=[group],
-            )
-            if not module:
-                return None
-
-            key_attribute = getattr(module, key, None)
-            return key_attribute.substitute(vars) if key_attribute else None
+    # Render the same template for many vars in one pass (e.g. one block per
+    # retrieved document)
+    def get_local_templates(
+        self, group: str, key: str, vars_list: list, separator: str = "\n"
+    ):
+        template = self.get_template(group=group, key=key)
+        if template is None:
+            return None
+        if not isinstance(template, Template):
+            return separator.join(template for _ in vars_list)
+        return separator.join(template.substitute(vars) for vars in vars_list)
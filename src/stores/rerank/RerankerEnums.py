@@ -0,0 +1,6 @@
+from enum import Enum
+
+
+class RerankerEnums(Enum):
+    NONE = "NONE"
+    LEXICAL = "LEXICAL"
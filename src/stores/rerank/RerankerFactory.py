@@ -0,0 +1,12 @@
+from .providers import LexicalReranker
+from .RerankerEnums import RerankerEnums
+
+
+class RerankerFactory:
+    def __init__(self, config):
+        self.config = config
+
+    def create(self, provider: str):
+        if provider == RerankerEnums.LEXICAL.value:
+            return LexicalReranker()
+        return None
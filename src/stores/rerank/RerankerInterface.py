@@ -0,0 +1,19 @@
+from abc import ABC, abstractmethod
+from typing import List
+from models.db_schemas import RetrievedDocument
+
+
+class RerankerInterface(ABC):
+
+    # Returns the best top_k documents for the query. When time_budget (in
+    # seconds) runs out, the documents not scored yet keep their original
+    # (vector search) order behind the scored ones.
+    @abstractmethod
+    def rerank(
+        self,
+        query: str,
+        documents: List[RetrievedDocument],
+        top_k: int,
+        time_budget: float = None,
+    ) -> List[RetrievedDocument]:
+        pass
@@ -0,0 +1,143 @@
+from ..RerankerInterface import RerankerInterface
+from stores.lexical.BM25Index import BM25Index
+from models.db_schemas import RetrievedDocument
+from typing import List
+import math
+import time
+
+
+# CPU-only reranker: a weighted sum of cheap lexical features computed over
+# the candidate set, plus the (normalized) vector search score
+class LexicalReranker(RerankerInterface):
+
+    def __init__(
+        self,
+        bm25_weight: float = 0.35,
+        coverage_weight: float = 0.25,
+        bigram_weight: float = 0.15,
+        retrieval_weight: float = 0.25,
+        k1: float = 1.5,
+        b: float = 0.75,
+    ):
+        self.bm25_weight = bm25_weight
+        self.coverage_weight = coverage_weight
+        self.bigram_weight = bigram_weight
+        self.retrieval_weight = retrieval_weight
+        self.k1 = k1
+        self.b = b
+
+    @staticmethod
+    def normalize(values: list) -> list:
+        low, high = min(values), max(values)
+        if high == low:
+            return [1.0 if high > 0 else 0.0 for _ in values]
+        return [(value - low) / (high - low) for value in values]
+
+    def rerank(
+        self,
+        query: str,
+        documents: List[RetrievedDocument],
+        top_k: int,
+        time_budget: float = None,
+    ) -> List[RetrievedDocument]:
+        query_terms = set(BM25Index.tokenize(query))
+        if not documents or not query_terms:
+            return documents[:top_k]
+
+        query_tokens = BM25Index.tokenize(query)
+        query_bigrams = set(zip(query_tokens, query_tokens[1:]))
+        deadline = time.perf_counter() + time_budget if time_budget else None
+
+        # 1. Tokenize the candidates and count their query terms, until the
+        # time budget runs out
+        docs_tokens = []
+        docs_tf = []
+        docs_bigrams = []
+        doc_freqs = {}
+        for document in documents:
+            if deadline and time.perf_counter() > deadline:
+                break
+            tokens = BM25Index.tokenize(document.text)
+            tf = {}
+            # Only the query bigrams, found from the query term positions
+            doc_bigrams = set()
+            for position, token in enumerate(tokens):
+                if token in query_terms:
+                    tf[token] = tf.get(token, 0) + 1
+                    bigram = tuple(tokens[position : position + 2])
+                    if bigram in query_bigrams:
+                        doc_bigrams.add(bigram)
+            docs_tokens.append(tokens)
+            docs_tf.append(tf)
+            docs_bigrams.append(doc_bigrams)
+            for term in tf:
+                doc_freqs[term] = doc_freqs.get(term, 0) + 1
+
+        tokenized_count = len(docs_tokens)
+        if not tokenized_count:
+            return documents[:top_k]
+
+        # 2. Features, also within the budget: the candidates scored before it
+        # runs out are reranked, the rest goes to the tail
+        avg_length = (
+            sum(len(tokens) for tokens in docs_tokens) / tokenized_count or 1.0
+        )
+        bm25_scores, coverage_scores, bigram_scores = [], [], []
+        for tokens, tf, doc_bigrams in zip(docs_tokens, docs_tf, docs_bigrams):
+            if deadline and time.perf_counter() > deadline:
+                break
+            bm25 = 0.0
+            for term, freq in tf.items():
+                idf = math.log(
+                    1
+                    + (tokenized_count - doc_freqs[term] + 0.5)
+                    / (doc_freqs[term] + 0.5)
+                )
+                norm = self.k1 * (1 - self.b + self.b * len(tokens) / avg_length)
+                bm25 += idf * freq * (self.k1 + 1) / (freq + norm)
+            bm25_scores.append(bm25)
+            coverage_scores.append(len(tf) / len(query_terms))
+
+            if query_bigrams:
+                bigram_scores.append(len(doc_bigrams) / len(query_bigrams))
+            else:
+                bigram_scores.append(0.0)
+
+        scored_count = len(bm25_scores)
+        if not scored_count:
+            return documents[:top_k]
+
+        # Scaled by the best score only: vector scores of a candidate set are
+        # close together, min-max would exaggerate their differences
+        retrieval_scores = [document.score for document in documents[:scored_count]]
+        best_score = max(retrieval_scores)
+        if best_score > 0:
+            retrieval_scores = [score / best_score for score in retrieval_scores]
+        bm25_scores = self.normalize(bm25_scores)
+
+        # 3. Combine
+        scores = [
+            self.bm25_weight * bm25_scores[i]
+            + self.coverage_weight * coverage_scores[i]
+            + self.bigram_weight * bigram_scores[i]
+            + self.retrieval_weight * retrieval_scores[i]
+            for i in range(scored_count)
+        ]
+        order = sorted(range(scored_count), key=lambda i: scores[i], reverse=True)
+
+        reranked = [
+            documents[i].model_copy(update={"score": scores[i]}) for i in order
+        ]
+
+        # 4. The unscored tail gets decreasing scores below the lowest rerank
+        # score, its retrieval scores are on another scale and the context
+        # packer sorts by score again
+        tail = documents[scored_count:top_k]
+        lowest_score = min(scores)
+        reranked.extend(
+            document.model_copy(
+                update={"score": lowest_score * (len(tail) - j) / (len(tail) + 1)}
+            )
+            for j, document in enumerate(tail)
+        )
+        return reranked[:top_k]
@@ -0,0 +1 @@
+from .LexicalReranker import LexicalReranker
@@ -3,8 +3,20 @@ from enum import Enum
 
 class VectorDBEnums(Enum):
     QDRANT = "QDRANT"
+    NUMPY = "NUMPY"
 
 
 class DistanceMethodEnums(Enum):
     COSINE = "cosine"
     DOT = "dot"
+
+
+class QuantizationEnums(Enum):
+    NONE = "none"
+    SCALAR = "scalar"  # int8, 4x smaller than float32
+    BINARY = "binary"  # 1 bit per dimension, 32x smaller
+
+
+class SearchModeEnum(Enum):
+    DENSE = "dense"
+    HYBRID = "hybrid"
@@ -1,10 +1,14 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Iterator
 from models.db_schemas import RetrievedDocument
 
 
 class VectorDBInterface(ABC):
 
+    # Multi-tenant collections: every record carries its project under this
+    # payload key, tenant_id=None means the collection belongs to one project
+    tenant_key = "project_id"
+
     @abstractmethod
     def connect(self):
         pass
@@ -13,6 +17,12 @@ class VectorDBInterface(ABC):
     def disconnect(self):
         pass
 
+    # Persists what the provider keeps in memory during a push (called once a
+    # push is done, not per batch)
+    @abstractmethod
+    def flush_collection(self, collection_name: str):
+        pass
+
     @abstractmethod
     def is_collection_existed(self, collection_name: str) -> bool:
         pass
@@ -31,10 +41,31 @@ class VectorDBInterface(ABC):
 
     @abstractmethod
     def create_collection(
-        self, collection_name: str, embedding_size: int, do_reset: bool = False
+        self,
+        collection_name: str,
+        embedding_size: int,
+        do_reset: bool = False,
+        is_multi_tenant: bool = False,
     ):
         pass
 
+    # Removes every record of one tenant from a shared collection
+    @abstractmethod
+    def delete_tenant(self, collection_name: str, tenant_id: str):
+        pass
+
+    @abstractmethod
+    def count_tenant_records(self, collection_name: str, tenant_id: str) -> int:
+        pass
+
+    # Yields batches of {"record_id", "text", "metadata", "content_hash",
+    # "tenant_id", "vector"} dicts, used to migrate between layouts
+    @abstractmethod
+    def iterate_records(
+        self, collection_name: str, batch_size: int = 256
+    ) -> Iterator[List[dict]]:
+        pass
+
     @abstractmethod
     def insert_one(
         self,
@@ -43,6 +74,7 @@ class VectorDBInterface(ABC):
         vector: list,
         metadata: dict = None,
         record_id: str = None,
+        tenant_id: str = None,
     ):
         pass
 
@@ -55,11 +87,48 @@ class VectorDBInterface(ABC):
         metadata: list = None,
         record_ids: list = None,
         batch_size: int = 50,
+        content_hashes: list = None,
+        tenant_id: str = None,
+    ):
+        pass
+
+    # Yields batches of the record ids in the collection (of one tenant, if
+    # set), used to find records whose source chunk is gone
+    @abstractmethod
+    def iterate_record_ids(
+        self, collection_name: str, tenant_id: str = None, batch_size: int = 1024
+    ) -> Iterator[List[str]]:
+        pass
+
+    @abstractmethod
+    def delete_records(
+        self, collection_name: str, record_ids: list, tenant_id: str = None
     ):
         pass
 
+    # Returns {record_id: content_hash} for the ids that are already indexed
+    @abstractmethod
+    def get_content_hashes(
+        self, collection_name: str, record_ids: list, tenant_id: str = None
+    ) -> dict:
+        pass
+
+    # Both searches return [] (per query) when nothing matches, never None
     @abstractmethod
     def search_by_vector(
-        self, collection_name: str, vector: list, limit: int
+        self, collection_name: str, vector: list, limit: int, tenant_id: str = None
+    ) -> List[RetrievedDocument]:
+        pass
+
+    # Batched search, one result list per query vector (in the same order)
+    @abstractmethod
+    def search_by_vectors(
+        self, collection_name: str, vectors: list, limit: int, tenant_id: str = None
+    ) -> List[List[RetrievedDocument]]:
+        pass
+
+    @abstractmethod
+    def get_records_by_ids(
+        self, collection_name: str, record_ids: list, tenant_id: str = None
     ) -> List[RetrievedDocument]:
         pass
@@ -1,4 +1,4 @@
-from .providers import QdrantDBProvider
+from .providers import QdrantDBProvider, NumpyDBProvider
 from .VectorDBEnums import VectorDBEnums
 from controllers.BaseController import BaseController
 
@@ -14,6 +14,28 @@ class VectorDBProviderFactory:
                 db_name=self.config.VECTOR_DB_PATH
             )
             return QdrantDBProvider(
-                db_path=db_path, distance_method=self.config.VECTOR_DB_DISTANCE_METHOD
+                db_path=db_path,
+                distance_method=self.config.VECTOR_DB_DISTANCE_METHOD,
+                quantization=self.config.VECTOR_DB_QUANTIZATION,
+                quantization_always_ram=self.config.VECTOR_DB_QUANTIZATION_ALWAYS_RAM,
+                search_oversampling=self.config.VECTOR_DB_SEARCH_OVERSAMPLING,
+                search_rescore=self.config.VECTOR_DB_SEARCH_RESCORE,
+                vectors_on_disk=self.config.VECTOR_DB_VECTORS_ON_DISK,
+                hnsw_m=self.config.VECTOR_DB_HNSW_M,
+                hnsw_ef_construct=self.config.VECTOR_DB_HNSW_EF_CONSTRUCT,
+                hnsw_ef=self.config.VECTOR_DB_HNSW_EF,
+                hnsw_on_disk=self.config.VECTOR_DB_HNSW_ON_DISK,
+            )
+        if provider == VectorDBEnums.NUMPY.value:
+            db_path = self.base_controller.get_database_path(
+                db_name=self.config.VECTOR_DB_PATH
+            )
+            return NumpyDBProvider(
+                db_path=db_path,
+                distance_method=self.config.VECTOR_DB_DISTANCE_METHOD,
+                use_memmap=self.config.VECTOR_DB_NUMPY_MEMMAP,
+                ivf_min_vectors=self.config.VECTOR_DB_IVF_MIN_VECTORS,
+                ivf_lists=self.config.VECTOR_DB_IVF_LISTS,
+                ivf_probes=self.config.VECTOR_DB_IVF_PROBES,
             )
         return None
@@ -0,0 +1,789 @@
+from ..VectorDBInterface import VectorDBInterface
+from ..VectorDBEnums import DistanceMethodEnums
+from models.db_schemas.data_chunk import RetrievedDocument
+from typing import List
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import logging
+import json
+import os
+import shutil
+
+
+# One collection on disk: meta.json, vectors.f32 (a raw row-major float32
+# matrix, upserts overwrite their row in place, new rows are appended) and
+# records.jsonl (an append-only log of row payloads, the last entry wins,
+# deleted rows are logged as {"row", "deleted": true} and never reused).
+# Once the log holds too many dead entries, compact() rewrites both files
+# with the live rows only, under a new generation named in meta.json, so
+# the switch to the new files is one atomic rename.
+class NumpyCollection:
+
+    # Compact when the dead log entries exceed this share of the live rows
+    # (and compaction_min_entries)
+    compaction_ratio = 0.5
+    compaction_min_entries = 1000
+
+    def __init__(self, path: str, use_memmap: bool = False):
+        self.path = path
+        self.use_memmap = use_memmap
+        self.meta_path = os.path.join(path, "meta.json")
+        self.ivf_path = os.path.join(path, "ivf.npz")
+        self.generation = 0
+        self.set_data_paths()
+
+        self.embedding_size = None
+        self.size = 0  # number of rows in use
+        self.vectors = None  # rows [0, size) are valid
+        # row -> {"id", "text", "metadata", "content_hash", "tenant_id"}
+        self.records = []
+        self.row_by_id = {}
+        self.rows_by_tenant = {}
+        # row -> False once deleted, searches mask the deleted rows out
+        # (grown by doubling like the vectors, rows [0, size) are valid)
+        self.live = np.zeros(0, dtype=bool)
+        self.log_entries = 0  # lines in records.jsonl
+
+        # IVF coarse quantizer: centroids, the list of every row, and the
+        # rows of each list (rebuilt from the assignments when needed).
+        # Upserts only update it in memory, flush() persists it
+        self.centroids = None
+        self.assignments = None  # grown like live, rows [0, size) are valid
+        self.ivf_lists = None
+        self.ivf_size = 0  # collection size when the IVF was built
+        self.is_ivf_dirty = False
+
+        # (Re)build running in the background (see NumpyDBProvider.update_ivf):
+        # a Future of (centroids, assignments) over the first ivf_build_size
+        # rows of generation ivf_build_generation, and the rows upserted
+        # since, which are assigned again once it is installed
+        self.ivf_build = None
+        self.ivf_build_size = 0
+        self.ivf_build_generation = 0
+        self.ivf_build_rows = set()
+
+    # Generation 0 keeps the original file names
+    def set_data_paths(self):
+        suffix = f".{self.generation}" if self.generation else ""
+        self.vectors_path = os.path.join(self.path, f"vectors{suffix}.f32")
+        self.records_path = os.path.join(self.path, f"records{suffix}.jsonl")
+
+    def write_meta(self):
+        tmp_path = f"{self.meta_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(
+                {"embedding_size": self.embedding_size, "generation": self.generation},
+                f,
+            )
+        os.replace(tmp_path, self.meta_path)
+
+    def create(self, embedding_size: int):
+        os.makedirs(self.path, exist_ok=True)
+        self.embedding_size = embedding_size
+        self.write_meta()
+        open(self.vectors_path, "wb").close()
+        open(self.records_path, "w").close()
+        self.vectors = np.zeros((0, embedding_size), dtype=np.float32)
+
+    def load(self):
+        with open(self.meta_path) as f:
+            meta = json.load(f)
+        self.embedding_size = meta["embedding_size"]
+        self.generation = meta.get("generation", 0)
+        self.set_data_paths()
+
+        with open(self.records_path) as f:
+            for line in f:
+                record = json.loads(line)
+                row = record.pop("row")
+                if row >= len(self.records):
+                    self.records.extend([None] * (row + 1 - len(self.records)))
+                self.set_record(row, None if record.get("deleted") else record)
+                self.log_entries += 1
+        self.size = len(self.records)
+        self.live = np.fromiter(
+            (record is not None for record in self.records),
+            dtype=bool,
+            count=self.size,
+        )
+        self.load_vectors()
+
+        if os.path.exists(self.ivf_path):
+            ivf = np.load(self.ivf_path)
+            self.centroids = ivf["centroids"]
+            self.ivf_size = int(ivf["size"])
+            self.assignments = ivf["assignments"]
+            # Rows upserted after the last flush (e.g. the server stopped
+            # mid-push) join their nearest list again
+            if len(self.assignments) < self.size:
+                rows = np.arange(len(self.assignments), self.size)
+                self.assign_to_lists(rows, self.get_matrix()[rows])
+
+    def load_vectors(self):
+        if self.use_memmap and self.size:
+            self.vectors = np.memmap(
+                self.vectors_path,
+                dtype=np.float32,
+                mode="r",
+                shape=(self.size, self.embedding_size),
+            )
+        else:
+            self.vectors = np.fromfile(self.vectors_path, dtype=np.float32).reshape(
+                -1, self.embedding_size
+            )[: self.size]
+
+    # Keeps the id, tenant and live lookups in sync, record None -> deleted row
+    def set_record(self, row: int, record: dict = None):
+        previous = self.records[row]
+        if previous is not None:
+            self.row_by_id.pop(previous["id"], None)
+            self.rows_by_tenant.get(previous.get("tenant_id"), set()).discard(row)
+
+        self.records[row] = record
+        if record is not None:
+            self.row_by_id[record["id"]] = row
+            if record.get("tenant_id") is not None:
+                self.rows_by_tenant.setdefault(record["tenant_id"], set()).add(row)
+        if row < len(self.live):
+            self.live[row] = record is not None
+
+    def get_tenant_rows(self, tenant_id: str) -> np.ndarray:
+        rows = self.rows_by_tenant.get(tenant_id, ())
+        return np.sort(np.fromiter(rows, dtype=np.int64, count=len(rows)))
+
+    # Deleted rows keep their vector until the next compaction
+    def delete_rows(self, rows: list):
+        with open(self.records_path, "a") as f:
+            for row in rows:
+                f.write(json.dumps({"row": int(row), "deleted": True}) + "\n")
+        self.log_entries += len(rows)
+        for row in rows:
+            self.set_record(int(row), None)
+        self.compact_if_needed()
+
+    def upsert(self, ids: list, vectors: np.ndarray, payloads: list):
+        rows = []
+        new_rows = 0
+        for record_id in ids:
+            row = self.row_by_id.get(record_id)
+            if row is None:
+                row = self.size + new_rows
+                self.row_by_id[record_id] = row
+                new_rows += 1
+            rows.append(row)
+        rows = np.asarray(rows, dtype=np.int64)
+
+        # 1. Disk: overwrite existing rows in place, append the new ones
+        row_bytes = self.embedding_size * 4
+        with open(self.vectors_path, "r+b") as f:
+            for row, vector in zip(rows, vectors):
+                f.seek(int(row) * row_bytes)
+                f.write(vector.tobytes())
+        with open(self.records_path, "a") as f:
+            for row, payload in zip(rows, payloads):
+                f.write(json.dumps({"row": int(row), **payload}) + "\n")
+        self.log_entries += len(rows)
+
+        # 2. Memory
+        self.records.extend([None] * new_rows)
+        self.live = self.grow(self.live, self.size + new_rows)
+        for row, payload in zip(rows, payloads):
+            self.set_record(int(row), payload)
+        self.size += new_rows
+
+        if self.use_memmap:
+            self.load_vectors()
+        else:
+            self.vectors = self.grow(self.vectors, self.size)
+            self.vectors[rows] = vectors
+
+        # Upserted rows join their nearest IVF list until the IVF is rebuilt
+        if self.centroids is not None:
+            self.assign_to_lists(rows, vectors)
+        if self.ivf_build is not None:
+            self.ivf_build_rows.update(rows.tolist())
+        self.compact_if_needed()
+
+    # Grows a per-row array by doubling, so appends are amortized O(batch)
+    @staticmethod
+    def grow(values: np.ndarray, size: int) -> np.ndarray:
+        if size <= len(values):
+            return values
+        grown = np.zeros(
+            (max(size, 2 * len(values)),) + values.shape[1:], dtype=values.dtype
+        )
+        grown[: len(values)] = values
+        return grown
+
+    def get_matrix(self) -> np.ndarray:
+        return self.vectors[: self.size]
+
+    def get_live_mask(self) -> np.ndarray:
+        return self.live[: self.size]
+
+    def get_live_count(self) -> int:
+        return len(self.row_by_id)
+
+    def compact_if_needed(self):
+        dead_entries = self.log_entries - self.get_live_count()
+        if dead_entries > max(
+            self.compaction_min_entries,
+            self.compaction_ratio * self.get_live_count(),
+        ):
+            self.compact()
+
+    # Rewrites the vectors and the records log with the live rows only, in
+    # their current order. The IVF keeps its centroids and the assignments
+    # of the kept rows
+    def compact(self):
+        live_rows = np.flatnonzero(self.get_live_mask())
+        matrix = np.ascontiguousarray(self.get_matrix()[live_rows])
+        records = [self.records[row] for row in live_rows]
+
+        previous_paths = [self.vectors_path, self.records_path]
+        self.generation += 1
+        self.set_data_paths()
+        matrix.tofile(self.vectors_path)
+        with open(self.records_path, "w") as f:
+            for row, record in enumerate(records):
+                f.write(json.dumps({"row": row, **record}) + "\n")
+        # The new files are only used once meta.json names their generation
+        self.write_meta()
+        for path in previous_paths:
+            os.remove(path)
+
+        self.records = [None] * len(records)
+        self.row_by_id = {}
+        self.rows_by_tenant = {}
+        self.live = np.ones(len(records), dtype=bool)
+        for row, record in enumerate(records):
+            self.set_record(row, record)
+        self.size = len(records)
+        self.log_entries = len(records)
+        if self.use_memmap:
+            self.load_vectors()
+        else:
+            self.vectors = matrix
+
+        # live_rows index the rows before compaction
+        if self.centroids is not None:
+            self.assignments = self.assignments[live_rows]
+            self.ivf_lists = None
+            self.save_ivf()
+
+    def get_ivf_lists(self) -> list:
+        if self.ivf_lists is None:
+            assignments = self.assignments[: self.size]
+            order = np.argsort(assignments, kind="stable")
+            bounds = np.searchsorted(
+                assignments[order], np.arange(len(self.centroids) + 1)
+            )
+            self.ivf_lists = [
+                order[bounds[i] : bounds[i + 1]] for i in range(len(self.centroids))
+            ]
+        return self.ivf_lists
+
+    def assign_to_lists(self, rows: np.ndarray, vectors: np.ndarray):
+        self.assignments = self.grow(self.assignments, self.size)
+        self.assignments[rows] = np.argmax(vectors @ self.centroids.T, axis=1)
+        self.ivf_lists = None
+        self.is_ivf_dirty = True
+
+    def save_ivf(self):
+        np.savez(
+            self.ivf_path,
+            centroids=self.centroids,
+            assignments=self.assignments[: self.size],
+            size=self.ivf_size,
+        )
+        self.is_ivf_dirty = False
+
+    # Persists the IVF assignments of the upserts since the last flush
+    def flush(self):
+        if self.is_ivf_dirty:
+            self.save_ivf()
+
+    # Spherical k-means on a sample, then every row goes to its nearest list.
+    # Only reads matrix, so it can run off the event loop
+    @staticmethod
+    def build_ivf(
+        matrix: np.ndarray, no_lists: int, iterations: int = 10, seed: int = 0
+    ):
+        rng = np.random.default_rng(seed)
+        sample_size = min(len(matrix), no_lists * 256)
+        sample = matrix[rng.choice(len(matrix), sample_size, replace=False)]
+        centroids = sample[rng.choice(sample_size, no_lists, replace=False)].copy()
+
+        for _ in range(iterations):
+            assignments = np.argmax(sample @ centroids.T, axis=1)
+            for list_idx in range(no_lists):
+                members = sample[assignments == list_idx]
+                if len(members):
+                    centroid = members.mean(axis=0)
+                    centroids[list_idx] = centroid / (np.linalg.norm(centroid) or 1.0)
+
+        assignments = np.concatenate(
+            [
+                np.argmax(matrix[i : i + 65536] @ centroids.T, axis=1)
+                for i in range(0, len(matrix), 65536)
+            ]
+        )
+        return centroids, assignments
+
+    def start_ivf_build(self, executor: ThreadPoolExecutor, no_lists: int):
+        self.ivf_build_size = self.size
+        self.ivf_build_generation = self.generation
+        self.ivf_build_rows = set()
+        self.ivf_build = executor.submit(self.build_ivf, self.get_matrix(), no_lists)
+
+    # Swaps in a finished build, False while it runs or if a compaction moved
+    # the rows it was built on (build errors are raised)
+    def finish_ivf_build(self) -> bool:
+        if self.ivf_build is None or not self.ivf_build.done():
+            return False
+        ivf_build, self.ivf_build = self.ivf_build, None
+        centroids, assignments = ivf_build.result()
+        if self.ivf_build_generation != self.generation:
+            return False
+
+        self.centroids = centroids
+        self.assignments = assignments
+        self.ivf_size = self.ivf_build_size
+        rows = np.union1d(
+            np.fromiter(self.ivf_build_rows, dtype=np.int64),
+            np.arange(self.ivf_build_size, self.size),
+        )
+        if len(rows):
+            self.assign_to_lists(rows, self.get_matrix()[rows])
+        self.ivf_lists = None
+        self.save_ivf()
+        return True
+
+
+class NumpyDBProvider(VectorDBInterface):
+
+    def __init__(
+        self,
+        db_path: str,
+        distance_method: str,
+        use_memmap: bool = False,
+        ivf_min_vectors: int = 50000,
+        ivf_lists: int = None,
+        ivf_probes: int = 8,
+    ):
+        self.db_path = db_path
+        self.distance_method = distance_method
+        self.use_memmap = use_memmap
+        # Collections smaller than ivf_min_vectors use exact search
+        # (0 -> always exact), ivf_lists None -> sqrt(collection size)
+        self.ivf_min_vectors = ivf_min_vectors
+        self.ivf_lists = ivf_lists
+        self.ivf_probes = ivf_probes
+
+        self.collections = {}
+        # IVF builds take seconds on large collections, they run on this
+        # thread and never inside a search
+        self.ivf_executor = None
+        self.logger = logging.getLogger(__name__)
+
+    def connect(self):
+        os.makedirs(self.db_path, exist_ok=True)
+        self.ivf_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="numpy-ivf"
+        )
+
+    # A build still running is dropped, it starts again when next needed
+    def disconnect(self):
+        for collection in self.collections.values():
+            collection.flush()
+        self.collections = {}
+        if self.ivf_executor:
+            self.ivf_executor.shutdown(wait=False, cancel_futures=True)
+            self.ivf_executor = None
+
+    # Once a push is done: persist the IVF assignments and start the IVF
+    # (re)build if it is due, so searches rarely have to
+    def flush_collection(self, collection_name: str):
+        if collection_name in self.collections:
+            collection = self.collections[collection_name]
+            self.update_ivf(collection)
+            collection.flush()
+
+    # Waits for the running IVF build of a collection and installs it (for
+    # benchmarks and scripts that need the IVF right away)
+    def wait_for_ivf(self, collection_name: str, timeout: float = None):
+        collection = self.get_collection(collection_name)
+        if collection.ivf_build is not None:
+            collection.ivf_build.exception(timeout=timeout)
+            self.update_ivf(collection)
+        return collection.centroids is not None
+
+    def get_collection_path(self, collection_name: str) -> str:
+        return os.path.join(self.db_path, collection_name)
+
+    def get_collection(self, collection_name: str) -> NumpyCollection:
+        if collection_name not in self.collections:
+            collection = NumpyCollection(
+                path=self.get_collection_path(collection_name),
+                use_memmap=self.use_memmap,
+            )
+            collection.load()
+            self.collections[collection_name] = collection
+        return self.collections[collection_name]
+
+    def is_collection_existed(self, collection_name: str) -> bool:
+        return os.path.exists(
+            os.path.join(self.get_collection_path(collection_name), "meta.json")
+        )
+
+    def list_all_collections(self) -> List:
+        return [
+            name
+            for name in os.listdir(self.db_path)
+            if self.is_collection_existed(name)
+        ]
+
+    def get_collection_info(self, collection_name: str) -> dict:
+        if not self.is_collection_existed(collection_name):
+            return None
+        collection = self.get_collection(collection_name)
+        return {
+            "points_count": len(collection.row_by_id),
+            "embedding_size": collection.embedding_size,
+            "distance": self.distance_method,
+            "memmap": self.use_memmap,
+            "ivf_lists": (
+                len(collection.centroids) if collection.centroids is not None else 0
+            ),
+        }
+
+    def delete_collection(self, collection_name: str):
+        self.collections.pop(collection_name, None)
+        if self.is_collection_existed(collection_name):
+            shutil.rmtree(self.get_collection_path(collection_name))
+            return True
+
+    # Tenant rows are tracked for every collection, is_multi_tenant is
+    # accepted for the interface only
+    def create_collection(
+        self,
+        collection_name: str,
+        embedding_size: int,
+        do_reset: bool = False,
+        is_multi_tenant: bool = False,
+    ):
+        if do_reset:
+            _ = self.delete_collection(collection_name=collection_name)
+        if not self.is_collection_existed(collection_name):
+            collection = NumpyCollection(
+                path=self.get_collection_path(collection_name),
+                use_memmap=self.use_memmap,
+            )
+            collection.create(embedding_size=embedding_size)
+            self.collections[collection_name] = collection
+            return True
+        return False
+
+    def delete_tenant(self, collection_name: str, tenant_id: str):
+        if not self.is_collection_existed(collection_name):
+            return False
+        collection = self.get_collection(collection_name)
+        collection.delete_rows(collection.get_tenant_rows(tenant_id))
+        return True
+
+    def count_tenant_records(self, collection_name: str, tenant_id: str) -> int:
+        if not self.is_collection_existed(collection_name):
+            return 0
+        collection = self.get_collection(collection_name)
+        return len(collection.rows_by_tenant.get(tenant_id, ()))
+
+    def iterate_records(self, collection_name: str, batch_size: int = 256):
+        collection = self.get_collection(collection_name)
+        rows = [row for row, record in enumerate(collection.records) if record]
+        for i in range(0, len(rows), batch_size):
+            batch_rows = rows[i : i + batch_size]
+            vectors = collection.get_matrix()[batch_rows]
+            yield [
+                {
+                    "record_id": collection.records[row]["id"],
+                    "text": collection.records[row]["text"],
+                    "metadata": collection.records[row]["metadata"],
+                    "content_hash": collection.records[row]["content_hash"],
+                    "tenant_id": collection.records[row].get("tenant_id"),
+                    "vector": vector.tolist(),
+                }
+                for row, vector in zip(batch_rows, vectors)
+            ]
+
+    def iterate_record_ids(
+        self, collection_name: str, tenant_id: str = None, batch_size: int = 1024
+    ):
+        if not self.is_collection_existed(collection_name):
+            return
+        collection = self.get_collection(collection_name)
+        if tenant_id is not None:
+            rows = collection.get_tenant_rows(tenant_id).tolist()
+        else:
+            rows = [row for row, record in enumerate(collection.records) if record]
+        for i in range(0, len(rows), batch_size):
+            yield [collection.records[row]["id"] for row in rows[i : i + batch_size]]
+
+    def delete_records(
+        self, collection_name: str, record_ids: list, tenant_id: str = None
+    ):
+        if not record_ids or not self.is_collection_existed(collection_name):
+            return False
+        collection = self.get_collection(collection_name)
+        collection.delete_rows(
+            self.get_rows_by_ids(collection, record_ids, tenant_id)
+        )
+        return True
+
+    # Cosine is stored and searched as the dot product of unit vectors
+    def prepare_vectors(self, vectors) -> np.ndarray:
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        if vectors.ndim == 1:
+            vectors = vectors[None, :]
+        if self.distance_method == DistanceMethodEnums.COSINE.value:
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            vectors = vectors / np.where(norms == 0, 1.0, norms)
+        return vectors
+
+    def insert_one(
+        self,
+        collection_name: str,
+        text: str,
+        vector: list,
+        metadata: dict = None,
+        record_id: str = None,
+        tenant_id: str = None,
+    ):
+        return self.insert_many(
+            collection_name=collection_name,
+            texts=[text],
+            vectors=[vector],
+            metadata=[metadata],
+            record_ids=[record_id] if record_id is not None else None,
+            tenant_id=tenant_id,
+        )
+
+    def insert_many(
+        self,
+        collection_name: str,
+        texts: list,
+        vectors: list,
+        metadata: list = None,
+        record_ids: list = None,
+        batch_size: int = 50,
+        content_hashes: list = None,
+        tenant_id: str = None,
+    ):
+        if not self.is_collection_existed(collection_name):
+            self.logger.error(
+                f"Can't insert new records to non-existed Collection {collection_name}"
+            )
+            return False
+
+        if metadata is None:
+            metadata = [None] * len(texts)
+        if content_hashes is None:
+            content_hashes = [None] * len(texts)
+
+        collection = self.get_collection(collection_name)
+        if record_ids is None:
+            record_ids = list(range(collection.size, collection.size + len(texts)))
+
+        try:
+            collection.upsert(
+                ids=[str(record_id) for record_id in record_ids],
+                vectors=self.prepare_vectors(vectors),
+                payloads=[
+                    {
+                        "id": str(record_id),
+                        "text": text,
+                        "metadata": meta,
+                        "content_hash": content_hash,
+                        "tenant_id": tenant_id,
+                    }
+                    for record_id, text, meta, content_hash in zip(
+                        record_ids, texts, metadata, content_hashes
+                    )
+                ],
+            )
+        except Exception as e:
+            self.logger.error(f"Error while inserting batch: {e}")
+            return False
+
+        return True
+
+    # Rows of the given ids that exist (and belong to tenant_id, if set)
+    def get_rows_by_ids(
+        self, collection: NumpyCollection, record_ids: list, tenant_id: str = None
+    ) -> list:
+        rows = [collection.row_by_id.get(str(record_id)) for record_id in record_ids]
+        return [
+            row
+            for row in rows
+            if row is not None
+            and (
+                tenant_id is None
+                or collection.records[row].get("tenant_id") == tenant_id
+            )
+        ]
+
+    def get_content_hashes(
+        self, collection_name: str, record_ids: list, tenant_id: str = None
+    ) -> dict:
+        if not record_ids or not self.is_collection_existed(collection_name):
+            return {}
+
+        collection = self.get_collection(collection_name)
+        return {
+            collection.records[row]["id"]: collection.records[row]["content_hash"]
+            for row in self.get_rows_by_ids(collection, record_ids, tenant_id)
+        }
+
+    # Installs a finished IVF build, then starts one if the collection reached
+    # ivf_min_vectors or doubled since the last build. Never waits for it
+    def update_ivf(self, collection: NumpyCollection):
+        if collection.ivf_build is not None:
+            try:
+                collection.finish_ivf_build()
+            except Exception as e:
+                self.logger.error(f"Error while building the IVF: {e}")
+            if collection.ivf_build is not None:
+                return
+
+        if not self.ivf_min_vectors or collection.size < self.ivf_min_vectors:
+            return
+        if collection.centroids is None or collection.size > 2 * collection.ivf_size:
+            no_lists = self.ivf_lists or int(np.sqrt(collection.size))
+            collection.start_ivf_build(self.ivf_executor, no_lists=no_lists)
+
+    # Searches use the current IVF, exact search until the first one is built
+    def get_ivf(self, collection: NumpyCollection):
+        if not self.ivf_min_vectors or collection.size < self.ivf_min_vectors:
+            return None
+        self.update_ivf(collection)
+        if collection.centroids is None:
+            return None
+        return collection
+
+    # Exact top-k for a block of queries: one matrix product + argpartition.
+    # Rows outside live_mask (deleted) score -inf, they only come back when
+    # fewer than limit rows are live and are dropped by the caller
+    def exact_top_k(
+        self,
+        matrix: np.ndarray,
+        queries: np.ndarray,
+        limit: int,
+        live_mask: np.ndarray = None,
+    ):
+        scores = queries @ matrix.T
+        if live_mask is not None and not live_mask.all():
+            scores[:, ~live_mask] = -np.inf
+        limit = min(limit, scores.shape[1])
+        top = np.argpartition(-scores, limit - 1, axis=1)[:, :limit]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        return (
+            np.take_along_axis(top, order, axis=1),
+            np.take_along_axis(top_scores, order, axis=1),
+        )
+
+    def ivf_top_k(self, collection: NumpyCollection, query: np.ndarray, limit: int):
+        probes = min(self.ivf_probes, len(collection.centroids))
+        centroid_scores = collection.centroids @ query
+        lists = np.argpartition(-centroid_scores, probes - 1)[:probes]
+        ivf_lists = collection.get_ivf_lists()
+        candidates = np.concatenate([ivf_lists[i] for i in lists])
+        candidates = candidates[collection.get_live_mask()[candidates]]
+        if not len(candidates):
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+
+        rows, scores = self.exact_top_k(
+            collection.get_matrix()[candidates], query[None, :], limit
+        )
+        return candidates[rows[0]], scores[0]
+
+    # Batched search: one result list per query vector
+    def search_by_vectors(
+        self, collection_name: str, vectors: list, limit: int = 5, tenant_id: str = None
+    ) -> List[List[RetrievedDocument]]:
+        if not self.is_collection_existed(collection_name):
+            return [[] for _ in vectors]
+
+        collection = self.get_collection(collection_name)
+        if not collection.size:
+            return [[] for _ in vectors]
+
+        queries = self.prepare_vectors(vectors)
+
+        results = []
+        if tenant_id is not None:
+            # A tenant is a small slice of the shared collection: exact search
+            # over its own rows only
+            tenant_rows = collection.get_tenant_rows(tenant_id)
+            if not len(tenant_rows):
+                return [[] for _ in vectors]
+            tenant_matrix = collection.get_matrix()[tenant_rows]
+            for i in range(0, len(queries), 64):
+                rows, scores = self.exact_top_k(
+                    tenant_matrix, queries[i : i + 64], limit
+                )
+                results.extend(zip(tenant_rows[rows], scores))
+        elif self.get_ivf(collection) is None:
+            # Query blocks bound the (queries x rows) score matrix
+            for i in range(0, len(queries), 64):
+                rows, scores = self.exact_top_k(
+                    collection.get_matrix(),
+                    queries[i : i + 64],
+                    limit,
+                    live_mask=collection.get_live_mask(),
+                )
+                results.extend(zip(rows, scores))
+        else:
+            results = [
+                self.ivf_top_k(collection, query, limit) for query in queries
+            ]
+
+        return [
+            [
+                RetrievedDocument(
+                    text=collection.records[row]["text"],
+                    score=float(score),
+                    record_id=collection.records[row]["id"],
+                    metadata=collection.records[row]["metadata"],
+                )
+                for row, score in zip(rows, scores)
+                if np.isfinite(score) and collection.records[row] is not None
+            ]
+            for rows, scores in results
+        ]
+
+    def search_by_vector(
+        self, collection_name: str, vector: list, limit: int = 5, tenant_id: str = None
+    ):
+        return self.search_by_vectors(
+            collection_name=collection_name,
+            vectors=[vector],
+            limit=limit,
+            tenant_id=tenant_id,
+        )[0]
+
+    def get_records_by_ids(
+        self, collection_name: str, record_ids: list, tenant_id: str = None
+    ):
+        if not record_ids or not self.is_collection_existed(collection_name):
+            return []
+
+        collection = self.get_collection(collection_name)
+        return [
+            RetrievedDocument(
+                text=collection.records[row]["text"],
+                score=0.0,
+                record_id=collection.records[row]["id"],
+                metadata=collection.records[row]["metadata"],
+            )
+            for row in self.get_rows_by_ids(collection, record_ids, tenant_id)
+        ]
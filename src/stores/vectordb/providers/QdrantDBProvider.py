@@ -1,6 +1,6 @@
 from qdrant_client import models, QdrantClient
 from ..VectorDBInterface import VectorDBInterface
-from ..VectorDBEnums import DistanceMethodEnums
+from ..VectorDBEnums import DistanceMethodEnums, QuantizationEnums
 import logging
 from typing import List
 from models.db_schemas.data_chunk import RetrievedDocument
@@ -8,12 +8,36 @@ from models.db_schemas.data_chunk import RetrievedDocument
 
 class QdrantDBProvider(VectorDBInterface):
 
-    def __init__(self, db_path: str, distance_method: str):
+    def __init__(
+        self,
+        db_path: str,
+        distance_method: str,
+        quantization: str = None,
+        quantization_always_ram: bool = True,
+        search_oversampling: float = None,
+        search_rescore: bool = True,
+        vectors_on_disk: bool = False,
+        hnsw_m: int = None,
+        hnsw_ef_construct: int = None,
+        hnsw_ef: int = None,
+        hnsw_on_disk: bool = False,
+    ):
 
         self.client = None
         self.db_path = db_path
         self.distance_method = None
 
+        # Collection-level storage and index options (see create_collection)
+        self.quantization = quantization or QuantizationEnums.NONE.value
+        self.quantization_always_ram = quantization_always_ram
+        self.search_oversampling = search_oversampling
+        self.search_rescore = search_rescore
+        self.vectors_on_disk = vectors_on_disk
+        self.hnsw_m = hnsw_m
+        self.hnsw_ef_construct = hnsw_ef_construct
+        self.hnsw_ef = hnsw_ef
+        self.hnsw_on_disk = hnsw_on_disk
+
         if distance_method == DistanceMethodEnums.COSINE.value:
             self.distance_method = models.Distance.COSINE
         elif distance_method == DistanceMethodEnums.DOT.value:
@@ -28,11 +52,17 @@ class QdrantDBProvider(VectorDBInterface):
         # raise NotImplementedError
         self.client = None
 
+    # Qdrant persists every upsert itself
+    def flush_collection(self, collection_name: str):
+        pass
+
     def is_collection_existed(self, collection_name: str) -> bool:
         return self.client.collection_exists(collection_name=collection_name)
 
     def list_all_collections(self) -> List:
-        return self.client.get_collection()
+        return [
+            collection.name for collection in self.client.get_collections().collections
+        ]
 
     def get_collection_info(self, collection_name: str) -> dict:
         return self.client.get_collection(collection_name=collection_name)
@@ -42,20 +72,174 @@ class QdrantDBProvider(VectorDBInterface):
             return self.client.delete_collection(collection_name=collection_name)
 
     def create_collection(
-        self, collection_name: str, embedding_size: int, do_reset: bool = False
+        self,
+        collection_name: str,
+        embedding_size: int,
+        do_reset: bool = False,
+        is_multi_tenant: bool = False,
     ):
         if do_reset:
             _ = self.delete_collection(collection_name=collection_name)
         if not self.is_collection_existed(collection_name):
+            # Shared collections skip the global HNSW graph (m=0) and build
+            # one graph per tenant instead (payload_m), as searches are always
+            # filtered by the tenant key
+            hnsw_m = self.hnsw_m
+            payload_m = None
+            if is_multi_tenant:
+                hnsw_m = 0
+                payload_m = self.hnsw_m or 16
+
             _ = self.client.create_collection(
                 collection_name=collection_name,
                 vectors_config=models.VectorParams(
-                    size=embedding_size, distance=self.distance_method
+                    size=embedding_size,
+                    distance=self.distance_method,
+                    on_disk=self.vectors_on_disk,
                 ),
+                hnsw_config=models.HnswConfigDiff(
+                    m=hnsw_m,
+                    payload_m=payload_m,
+                    ef_construct=self.hnsw_ef_construct,
+                    on_disk=self.hnsw_on_disk,
+                ),
+                quantization_config=self.get_quantization_config(),
             )
+            if is_multi_tenant:
+                _ = self.client.create_payload_index(
+                    collection_name=collection_name,
+                    field_name=self.tenant_key,
+                    field_schema=models.PayloadSchemaType.KEYWORD,
+                )
             return True
         return False
 
+    def get_tenant_filter(self, tenant_id: str = None):
+        if tenant_id is None:
+            return None
+        return models.Filter(
+            must=[
+                models.FieldCondition(
+                    key=self.tenant_key, match=models.MatchValue(value=tenant_id)
+                )
+            ]
+        )
+
+    def delete_tenant(self, collection_name: str, tenant_id: str):
+        if not self.is_collection_existed(collection_name):
+            return False
+        _ = self.client.delete(
+            collection_name=collection_name,
+            points_selector=models.FilterSelector(
+                filter=self.get_tenant_filter(tenant_id)
+            ),
+        )
+        return True
+
+    def count_tenant_records(self, collection_name: str, tenant_id: str) -> int:
+        if not self.is_collection_existed(collection_name):
+            return 0
+        return self.client.count(
+            collection_name=collection_name,
+            count_filter=self.get_tenant_filter(tenant_id),
+            exact=True,
+        ).count
+
+    def iterate_records(self, collection_name: str, batch_size: int = 256):
+        offset = None
+        while True:
+            records, offset = self.client.scroll(
+                collection_name=collection_name,
+                limit=batch_size,
+                offset=offset,
+                with_payload=True,
+                with_vectors=True,
+            )
+            if records:
+                yield [
+                    {
+                        "record_id": str(record.id),
+                        "text": record.payload["text"],
+                        "metadata": record.payload.get("metadata"),
+                        "content_hash": record.payload.get("content_hash"),
+                        "tenant_id": record.payload.get(self.tenant_key),
+                        "vector": record.vector,
+                    }
+                    for record in records
+                ]
+            if offset is None:
+                break
+
+    def iterate_record_ids(
+        self, collection_name: str, tenant_id: str = None, batch_size: int = 1024
+    ):
+        if not self.is_collection_existed(collection_name):
+            return
+        offset = None
+        while True:
+            records, offset = self.client.scroll(
+                collection_name=collection_name,
+                scroll_filter=self.get_tenant_filter(tenant_id),
+                limit=batch_size,
+                offset=offset,
+                with_payload=False,
+                with_vectors=False,
+            )
+            if records:
+                yield [str(record.id) for record in records]
+            if offset is None:
+                break
+
+    def delete_records(
+        self, collection_name: str, record_ids: list, tenant_id: str = None
+    ):
+        if not record_ids or not self.is_collection_existed(collection_name):
+            return False
+        conditions = [models.HasIdCondition(has_id=record_ids)]
+        if tenant_id is not None:
+            conditions.extend(self.get_tenant_filter(tenant_id).must)
+        _ = self.client.delete(
+            collection_name=collection_name,
+            points_selector=models.FilterSelector(
+                filter=models.Filter(must=conditions)
+            ),
+        )
+        return True
+
+    # The quantized vectors stay in RAM for the HNSW search, the float32
+    # originals can go to disk (vectors_on_disk) and are only read to rescore
+    def get_quantization_config(self):
+        if self.quantization == QuantizationEnums.SCALAR.value:
+            return models.ScalarQuantization(
+                scalar=models.ScalarQuantizationConfig(
+                    type=models.ScalarType.INT8,
+                    quantile=0.99,
+                    always_ram=self.quantization_always_ram,
+                )
+            )
+        if self.quantization == QuantizationEnums.BINARY.value:
+            return models.BinaryQuantization(
+                binary=models.BinaryQuantizationConfig(
+                    always_ram=self.quantization_always_ram,
+                )
+            )
+        return None
+
+    def get_search_params(self):
+        quantization_params = None
+        if self.quantization != QuantizationEnums.NONE.value:
+            # Over-fetch with the quantized vectors, then rescore the
+            # candidates with the originals
+            quantization_params = models.QuantizationSearchParams(
+                rescore=self.search_rescore,
+                oversampling=self.search_oversampling,
+            )
+        if self.hnsw_ef is None and quantization_params is None:
+            return None
+        return models.SearchParams(
+            hnsw_ef=self.hnsw_ef, quantization=quantization_params
+        )
+
     def insert_one(
         self,
         collection_name: str,
@@ -63,22 +247,20 @@ class QdrantDBProvider(VectorDBInterface):
         vector: list,
         metadata: dict = None,
         record_id: str = None,
+        tenant_id: str = None,
     ):
         if not self.is_collection_existed(collection_name):
             self.logger.error(
                 f"Can't insert new crecord to non-existed Collection {collection_name}"
             )
             return False
+        payload = {"text": text, "metadata": metadata}
+        if tenant_id is not None:
+            payload[self.tenant_key] = tenant_id
         try:
             _ = self.client.upload_records(
                 collection_name=collection_name,
-                records=[
-                    models.Record(
-                        id=record_id,
-                        vector=vector,
-                        payload={"text": text, "metadata": metadata},
-                    )
-                ],
+                records=[models.Record(id=record_id, vector=vector, payload=payload)],
             )
         except Exception as e:
             self.logger.error(f"Error while inserting batch: {e}")
@@ -94,25 +276,41 @@ class QdrantDBProvider(VectorDBInterface):
         metadata: list = None,
         record_ids: list = None,
         batch_size: int = 50,
+        content_hashes: list = None,
+        tenant_id: str = None,
     ):
         if metadata is None:
             metadata = [None] * len(texts)
 
+        if content_hashes is None:
+            content_hashes = [None] * len(texts)
+
         if record_ids is None:
             record_ids = list(range(0, len(texts)))
 
+        tenant_payload = {}
+        if tenant_id is not None:
+            tenant_payload = {self.tenant_key: tenant_id}
+
         for i in range(0, len(texts), batch_size):
             batch_end = i + batch_size
             batch_texts = texts[i:batch_end]
             batch_vectors = vectors[i:batch_end]
             batch_metadata = metadata[i:batch_end]
             batch_record_ids = record_ids[i:batch_end]
+            batch_content_hashes = content_hashes[i:batch_end]
 
+            # Records with an existing id are overwritten (upsert)
             batch_records = [
                 models.Record(
                     id=batch_record_ids[x],
                     vector=batch_vectors[x],
-                    payload={"text": batch_texts[x], "metadata": batch_metadata[x]},
+                    payload={
+                        "text": batch_texts[x],
+                        "metadata": batch_metadata[x],
+                        "content_hash": batch_content_hashes[x],
+                        **tenant_payload,
+                    },
                 )
                 for x in range(len(batch_texts))
             ]
@@ -127,17 +325,107 @@ class QdrantDBProvider(VectorDBInterface):
 
         return True
 
-    def search_by_vector(self, collection_name: str, vector: list, limit: int = 5):
+    # retrieve() takes no filter, so records of other tenants are dropped here
+    def is_tenant_record(self, record, tenant_id: str = None) -> bool:
+        return tenant_id is None or (record.payload or {}).get(
+            self.tenant_key
+        ) == tenant_id
 
-        results = self.client.search(
-            collection_name=collection_name, query_vector=vector, limit=limit
+    def get_content_hashes(
+        self, collection_name: str, record_ids: list, tenant_id: str = None
+    ) -> dict:
+        if not record_ids or not self.is_collection_existed(collection_name):
+            return {}
+
+        records = self.client.retrieve(
+            collection_name=collection_name,
+            ids=record_ids,
+            with_payload=["content_hash", self.tenant_key],
+            with_vectors=False,
         )
-        if not results or len(results) == 0:
-            return None
+        return {
+            str(record.id): (record.payload or {}).get("content_hash")
+            for record in records
+            if self.is_tenant_record(record, tenant_id)
+        }
+
+    def search_by_vector(
+        self, collection_name: str, vector: list, limit: int = 5, tenant_id: str = None
+    ):
 
+        results = self.client.search(
+            collection_name=collection_name,
+            query_vector=vector,
+            query_filter=self.get_tenant_filter(tenant_id),
+            limit=limit,
+            search_params=self.get_search_params(),
+        )
         return [
-            RetrievedDocument(**{"text": record.payload["text"], "score": record.score})
+            RetrievedDocument(
+                text=record.payload["text"],
+                score=record.score,
+                record_id=str(record.id),
+                metadata=record.payload.get("metadata"),
+            )
             for record in results
         ]
 
+    # All queries go to Qdrant in one search_batch round trip
+    def search_by_vectors(
+        self, collection_name: str, vectors: list, limit: int = 5, tenant_id: str = None
+    ):
+        if not vectors:
+            return []
+
+        search_params = self.get_search_params()
+        tenant_filter = self.get_tenant_filter(tenant_id)
+        batch_results = self.client.search_batch(
+            collection_name=collection_name,
+            requests=[
+                models.SearchRequest(
+                    vector=vector,
+                    filter=tenant_filter,
+                    limit=limit,
+                    with_payload=True,
+                    params=search_params,
+                )
+                for vector in vectors
+            ],
+        )
+        return [
+            [
+                RetrievedDocument(
+                    text=record.payload["text"],
+                    score=record.score,
+                    record_id=str(record.id),
+                    metadata=record.payload.get("metadata"),
+                )
+                for record in results
+            ]
+            for results in batch_results
+        ]
+
+    def get_records_by_ids(
+        self, collection_name: str, record_ids: list, tenant_id: str = None
+    ):
+        if not record_ids or not self.is_collection_existed(collection_name):
+            return []
+
+        records = self.client.retrieve(
+            collection_name=collection_name,
+            ids=record_ids,
+            with_payload=True,
+            with_vectors=False,
+        )
+        return [
+            RetrievedDocument(
+                text=record.payload["text"],
+                score=0.0,
+                record_id=str(record.id),
+                metadata=record.payload.get("metadata"),
+            )
+            for record in records
+            if self.is_tenant_record(record, tenant_id)
+        ]
+
     
\ No newline at end of file